@@ -1,7 +1,13 @@
 # backtracking.py
+from __future__ import annotations
 import time
-import networkx as nx
-from typing import Tuple, Dict, Any, Optional
+from typing import TYPE_CHECKING, Tuple, Dict, Any, Optional
+from .cancellation import CancelToken, is_cancelled
+from .graph_utils import GraphLike, as_csr
+from .profiling import phase
+
+if TYPE_CHECKING:
+    import networkx as nx  # annotations only
 
 def valid_color(G: nx.Graph, node: Any, color: int, assigned: Dict[Any, int]) -> bool:
     """Check if color is valid for node given current assignments"""
@@ -38,18 +44,48 @@ def restore_domains(domains: Dict[Any, set], removed: list):
     for n, c in removed:
         domains[n].add(c)
 
-def backtrack_search(G: nx.Graph, max_colors: int, use_mrv: bool = True, 
-                    time_limit: Optional[float] = None) -> Tuple[bool, Dict[Any, int], float]:
-    """Backtracking search with MRV and forward checking"""
+def backtrack_search(G: GraphLike, max_colors: int, use_mrv: bool = True, 
+                    time_limit: Optional[float] = None,
+                    snapshot_callback: Optional[callable] = None,
+                    snapshot_every: int = 256,
+                    cancel_token: Optional[CancelToken] = None,
+                    check_every: int = 64,
+                    stats: Optional[Dict[str, int]] = None) -> Tuple[bool, Dict[Any, int], float]:
+    """Backtracking search with MRV and forward checking
+
+    ``snapshot_callback(labels, assigned)`` receives the partial assignment
+    (vertex index -> color) every ``snapshot_every`` search nodes.
+    ``cancel_token`` is checked every ``check_every`` search nodes. A search
+    that is cancelled or runs out of time returns the largest conflict-free
+    partial coloring it reached. The number of search nodes visited is added
+    to ``stats['search_nodes']`` when a ``stats`` dict is given.
+    """
+    start = time.time()
+    csr = as_csr(G)
+    G = csr  # search runs on vertex indices; results are mapped back to labels
     nodes = list(G.nodes())
     domains = {n: set(range(max_colors)) for n in nodes}
     assigned = {}
-    start = time.time()
 
     degree_ordered = order_by_degree(G, nodes)
+    visited = 0
+    stopped = False
+    best = {}  # largest partial assignment left behind by backtracking
 
     def backtrack():
+        nonlocal visited, stopped, best
+        if stopped:
+            return False
+        visited += 1
+        if snapshot_callback is not None and visited % snapshot_every == 0:
+            snapshot_callback(csr.labels, assigned)
+        if visited % check_every == 0 and is_cancelled(cancel_token):
+            stopped = True
         if time_limit is not None and (time.time() - start) > time_limit:
+            stopped = True
+        if stopped:
+            if len(assigned) > len(best):
+                best = dict(assigned)
             return False
 
         if len(assigned) == len(nodes):
@@ -72,29 +108,47 @@ def backtrack_search(G: nx.Graph, max_colors: int, use_mrv: bool = True,
                 if use_mrv:
                     removed = forward_checking_update(domains, var, color, G, assigned)
 
-                wipeout = any(len(domains[n]) == 0 for n in G.nodes() if n not in assigned)
+                # Only the neighbours' domains changed, so only they can be wiped out
+                wipeout = any(len(domains[n]) == 0 for n in G.neighbors(var) if n not in assigned)
                 if not wipeout:
                     if backtrack():
                         return True
 
                 if use_mrv:
                     restore_domains(domains, removed)
+                if len(assigned) > len(best):
+                    best = dict(assigned)
                 del assigned[var]
         return False
 
     ok = backtrack()
     elapsed = time.time() - start
-    return ok, assigned, elapsed
-
-def try_min_colors(G: nx.Graph, max_try: int = 10, **kwargs) -> Tuple[Optional[int], Dict[Any, int], float]:
-    """Try increasing numbers of colors until valid coloring found"""
+    if stats is not None:
+        stats['search_nodes'] = stats.get('search_nodes', 0) + visited
+    if ok:
+        return ok, csr.map_coloring(assigned), elapsed
+    return ok, csr.map_coloring(best) if stopped else {}, elapsed
+
+def try_min_colors(G: GraphLike, max_try: int = 10,
+                   cancel_token: Optional[CancelToken] = None,
+                   **kwargs) -> Tuple[Optional[int], Dict[Any, int], float]:
+    """Try increasing numbers of colors until valid coloring found
+
+    When ``cancel_token`` is set the sweep stops and returns ``None`` with
+    the partial coloring of the k that was being searched.
+    """
     total_start = time.time()  # حساب الوقت الكلي
+    with phase('preprocess', algorithm='backtracking'):
+        G = as_csr(G)  # convert once for the whole k sweep
     
     for k in range(1, max_try + 1):
-        ok, colors, t = backtrack_search(G, k, **kwargs)
+        with phase('search', algorithm='backtracking', k=k):
+            ok, colors, t = backtrack_search(G, k, cancel_token=cancel_token, **kwargs)
         if ok:
             total_time = time.time() - total_start  # الوقت الكلي المستغرق
             return k, colors, total_time  # إرجاع الوقت الكلي بدلاً من الوقت الجزئي
+        if is_cancelled(cancel_token):
+            return None, colors, time.time() - total_start
     
     total_time = time.time() - total_start
     return None, {}, total_time
\ No newline at end of file
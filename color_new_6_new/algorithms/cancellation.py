@@ -0,0 +1,14 @@
+# cancellation.py
+from typing import Optional, Protocol
+
+class CancelToken(Protocol):
+    """Anything with ``is_set()``: threading.Event, a multiprocessing Event, ...
+
+    Solvers poll the token between units of work and, once it is set, stop
+    and return the best (partial) coloring found so far.
+    """
+    def is_set(self) -> bool: ...
+
+def is_cancelled(token: Optional[CancelToken]) -> bool:
+    """True once ``token`` has been set; a missing token never cancels"""
+    return token is not None and token.is_set()
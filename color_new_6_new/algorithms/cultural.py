@@ -1,47 +1,81 @@
 # cultural.py
-import random
+from __future__ import annotations
+import logging
 import time
-from typing import List, Dict, Tuple, Any, Optional
-import networkx as nx
+from typing import TYPE_CHECKING, List, Dict, Tuple, Any, Optional
+import numpy as np
+from .cancellation import CancelToken, is_cancelled
+from .rng import make_rng, SeedLike
+from .graph_utils import CSRGraph, GraphLike, as_csr, batch_conflicts
+from .profiling import phase
 
-def fitness(coloring: List[int], G: nx.Graph) -> int:
+if TYPE_CHECKING:
+    import networkx as nx  # annotations only
+
+logger = logging.getLogger(__name__)
+
+def fitness(coloring: List[int], G: GraphLike) -> int:
     """Calculate fitness: negative of conflicts"""
+    if isinstance(G, CSRGraph):
+        return -G.count_conflicts(coloring)
     conflicts = 0
     for u, v in G.edges():
         if coloring[u] == coloring[v]:
             conflicts += 1
     return -conflicts
 
-def create_individual(num_vertices: int, k: int) -> List[int]:
+def create_individual(num_vertices: int, k: int, rng: Optional[np.random.Generator] = None) -> List[int]:
     """Create random coloring"""
-    return [random.randint(0, k-1) for _ in range(num_vertices)]
+    rng = make_rng(rng)
+    return rng.integers(0, k, size=num_vertices).tolist()
 
-def smart_mutate(individual: List[int], k: int, G: nx.Graph) -> List[int]:
+def smart_mutate(individual: List[int], k: int, G: nx.Graph,
+                 rng: Optional[np.random.Generator] = None) -> List[int]:
     """Smart mutation - try different colors for each vertex"""
+    rng = make_rng(rng)
     coloring = individual[:]
-    for _ in range(50):  # Try up to 50 smart mutations
-        v = random.randint(0, len(coloring) - 1)
+    base_fitness = fitness(individual, G)
+    # Draw all 50 attempts up front: vertices and a random color order per attempt
+    vertices = rng.integers(0, len(coloring), size=50).tolist()
+    color_orders = np.argsort(rng.random((50, k)), axis=1).tolist()
+    for v, order in zip(vertices, color_orders):  # Try up to 50 smart mutations
         old_color = coloring[v]
         
         # Try all possible colors in random order
-        for new_color in random.sample(range(k), k):
+        for new_color in order:
             if new_color == old_color:
                 continue
             coloring[v] = new_color
-            if fitness(coloring, G) > fitness(individual, G):
+            if fitness(coloring, G) > base_fitness:
                 return coloring  # Return if improvement found
         coloring[v] = old_color  # Revert if no improvement
     return coloring
 
-def cultural_algorithm_for_k(G: nx.Graph, k: int, pop_size: int = 50, 
+def cultural_algorithm_for_k(G: GraphLike, k: int, pop_size: int = 50, 
                            max_gen: int = 10, mutation_rate: float = 0.1,  # Changed default from 100 to 10
-                           progress_callback: callable = None) -> Tuple[bool, List[int], int, int, List[Dict]]:
-    """Cultural Algorithm for specific k - similar to old version"""
+                           progress_callback: callable = None,
+                           seed: SeedLike = None,
+                           snapshot_callback: callable = None,
+                           snapshot_every: int = 1,
+                           cancel_token: Optional[CancelToken] = None,
+                           stats: Optional[Dict[str, int]] = None) -> Tuple[bool, List[int], int, int, List[Dict]]:
+    """Cultural Algorithm for specific k - similar to old version
+
+    ``seed`` may be an int (reproducible run) or a numpy Generator shared
+    with the caller; the global ``random`` state is never touched.
+    ``snapshot_callback(labels, coloring)`` receives the generation's best
+    coloring every ``snapshot_every`` generations (for live display).
+    ``cancel_token`` is checked once per generation; a cancelled run returns
+    like one that ran out of generations. The generations run are added to
+    ``stats['generations']`` when a ``stats`` dict is given.
+    """
     
+    G = as_csr(G)  # coloring lists are indexed by CSR vertex index
     num_vertices = G.number_of_nodes()
+    rng = make_rng(seed)
     
     # Initialize population
-    population = [create_individual(num_vertices, k) for _ in range(pop_size)]
+    population = [create_individual(num_vertices, k, rng) for _ in range(pop_size)]
     
     # Initialize belief space
     belief_space = {
@@ -56,26 +90,33 @@ def cultural_algorithm_for_k(G: nx.Graph, k: int, pop_size: int = 50,
     
     start_time = time.time()
     
-    print(f"Trying to color with {k} colors...")
+    logger.info(f"Trying to color with {k} colors...")
     
     for generation in range(1, max_gen + 1):
+        if is_cancelled(cancel_token):
+            logger.info(f"Stopped before generation {generation}")
+            break
         last_generation = generation  # تحديث الجيل الأخير
         
         # Create new population with cultural influence
-        new_population = [belief_space["best_ever"].copy()]  # Always keep best
-        
-        while len(new_population) < pop_size:
-            if random.random() < 0.15:  # 15% chance for random individual
-                child = create_individual(num_vertices, k)
-            else:  # 85% chance for smart mutation of best solution
-                child = smart_mutate(belief_space["best_ever"], k, G)
-            new_population.append(child)
+        with phase('mutation', k=k, generation=generation):
+            new_population = [belief_space["best_ever"].copy()]  # Always keep best
+            
+            while len(new_population) < pop_size:
+                if rng.random() < 0.15:  # 15% chance for random individual
+                    child = create_individual(num_vertices, k, rng)
+                else:  # 85% chance for smart mutation of best solution
+                    child = smart_mutate(belief_space["best_ever"], k, G, rng)
+                new_population.append(child)
         
         population = new_population
         
-        # Find current best
-        current_best = max(population, key=lambda ind: fitness(ind, G))
-        current_best_fitness = fitness(current_best, G)
+        # Find current best: score the whole population in one vectorised pass
+        with phase('evaluation', k=k, generation=generation):
+            population_fitness = -batch_conflicts(np.array(population), *G.edge_arrays())
+        best_index = int(np.argmax(population_fitness))
+        current_best = population[best_index]
+        current_best_fitness = int(population_fitness[best_index])
         
         # Update belief space if improved
         if current_best_fitness > fitness(belief_space["best_ever"], G):
@@ -100,75 +141,107 @@ def cultural_algorithm_for_k(G: nx.Graph, k: int, pop_size: int = 50,
         # Progress callback - عرض كل جيل بدلاً من كل 10 أجيال فقط
         if progress_callback:
             progress_callback(generation, conflicts, colors_used)
+        if snapshot_callback and generation % snapshot_every == 0:
+            snapshot_callback(G.labels, current_best)
         
         # Print progress (like old version)
         if generation % 10 == 0 or conflicts == 0 or generation == max_gen:  # Added generation == max_gen
-            print(f"Gen {generation:3d} | Conflicts: {conflicts:3d} | Colors used: {colors_used}")
+            logger.debug(f"Gen {generation:3d} | Conflicts: {conflicts:3d} | Colors used: {colors_used}")
         
         # Check for solution
         if conflicts == 0:
             elapsed = time.time() - start_time
-            print(f"Valid coloring found with {k} colors in {generation} generations!")
+            logger.info(f"Valid coloring found with {k} colors in {generation} generations!")
+            if stats is not None:
+                stats['generations'] = stats.get('generations', 0) + generation
             return True, current_best, colors_used, 0, history
     
     # If no solution found within max generations
     elapsed = time.time() - start_time
+    if best_solution is None:  # cancelled before the first generation
+        best_solution = belief_space["best_ever"]
+        best_fitness = fitness(best_solution, G)
     conflicts = -best_fitness
     colors_used = len(set(best_solution)) if best_solution else k
     
     # عرض الجيل الأخير دائماً
-    print(f"Final Generation {last_generation:3d} | Conflicts: {conflicts:3d} | Colors used: {colors_used}")
-    print(f"Failed with {k} colors (best conflicts: {conflicts})")
+    logger.info(f"Final Generation {last_generation:3d} | Conflicts: {conflicts:3d} | Colors used: {colors_used}")
+    logger.info(f"Failed with {k} colors (best conflicts: {conflicts})")
+    if stats is not None:
+        stats['generations'] = stats.get('generations', 0) + len(history)
     
     return False, best_solution, colors_used, conflicts, history
 
 # باقي الدوال تبقى كما هي بدون تغيير...
-def find_chromatic_number(G: nx.Graph, pop_size: int = 50, max_gen: int = 10,  # Changed default from 100 to 10
+def find_chromatic_number(G: GraphLike, pop_size: int = 50, max_gen: int = 10,  # Changed default from 100 to 10
                          mutation_rate: float = 0.1, max_k: int = 20,
-                         progress_callback: callable = None) -> Tuple[Optional[int], Dict, float]:
-    """Find chromatic number by trying increasing k values - like old version"""
+                         progress_callback: callable = None,
+                         seed: SeedLike = None,
+                         snapshot_callback: callable = None,
+                         snapshot_every: int = 1,
+                         cancel_token: Optional[CancelToken] = None,
+                         stats: Optional[Dict[str, int]] = None) -> Tuple[Optional[int], Dict, float]:
+    """Find chromatic number by trying increasing k values - like old version
+
+    When ``cancel_token`` is set the sweep stops and returns ``None`` with
+    the best (conflicting) coloring of the k that was being tried.
+    ``stats['generations']`` counts the generations of the whole sweep.
+    """
     
-    print("Searching for the smallest number of colors...")
+    logger.info("Searching for the smallest number of colors...")
     total_start = time.time()
+    rng = make_rng(seed)  # one stream for the whole k sweep
+    with phase('preprocess', algorithm='cultural'):
+        G = as_csr(G)
     
     for k in range(1, max_k + 1):
-        success, coloring, colors_used, conflicts, history = cultural_algorithm_for_k(
-            G, k, pop_size, max_gen, mutation_rate, progress_callback
-        )
+        with phase('search', algorithm='cultural', k=k):
+            success, coloring, colors_used, conflicts, history = cultural_algorithm_for_k(
+                G, k, pop_size, max_gen, mutation_rate, progress_callback, seed=rng,
+                snapshot_callback=snapshot_callback, snapshot_every=snapshot_every,
+                cancel_token=cancel_token, stats=stats
+            )
         
         if success:
             total_time = time.time() - total_start
-            coloring_dict = {i: coloring[i] for i in range(len(coloring))}
+            coloring_dict = G.map_coloring(coloring)
             
-            print("=" * 50)
-            print(f"SUCCESS! Graph is {k}-colorable")
-            print(f"Chromatic number = {k}")
-            print(f"Colors used: {colors_used}")
-            print(f"Total time: {total_time:.2f} seconds")
-            print("=" * 50)
+            logger.info("=" * 50)
+            logger.info(f"SUCCESS! Graph is {k}-colorable")
+            logger.info(f"Chromatic number = {k}")
+            logger.info(f"Colors used: {colors_used}")
+            logger.info(f"Total time: {total_time:.2f} seconds")
+            logger.info("=" * 50)
             
             return k, coloring_dict, total_time
+        
+        if is_cancelled(cancel_token):
+            logger.info(f"Search stopped while trying {k} colors ({conflicts} conflicts left)")
+            return None, G.map_coloring(coloring), time.time() - total_start
     
-    print("No solution found with reasonable k.")
+    logger.info("No solution found with reasonable k.")
     return None, {}, time.time() - total_start
 
 # Keep the original cultural_algorithm function for backward compatibility
 def cultural_algorithm(G: nx.Graph, pop_size: int = 50, max_gen: int = 10,  # Changed default from 100 to 10
                       mutation_rate: float = 0.1, k: int = None,
-                      progress_callback: callable = None) -> Tuple[bool, List[int], int, int, List[Dict]]:
+                      progress_callback: callable = None,
+                      seed: SeedLike = None) -> Tuple[bool, List[int], int, int, List[Dict]]:
     """Main cultural algorithm function that tries to find solution with given or optimal k"""
     
     if k is not None:
         # Use specified k
-        return cultural_algorithm_for_k(G, k, pop_size, max_gen, mutation_rate, progress_callback)
+        return cultural_algorithm_for_k(G, k, pop_size, max_gen, mutation_rate, progress_callback,
+                                        seed=seed)
     else:
         # Find optimal k
         result = find_chromatic_number(G, pop_size, max_gen, mutation_rate, 
-                                     max_k=20, progress_callback=progress_callback)
+                                     max_k=20, progress_callback=progress_callback, seed=seed)
         k_found, coloring_dict, total_time = result
         
         if k_found is not None:
-            coloring_list = [coloring_dict[i] for i in range(len(coloring_dict))] if k_found else []
+            # coloring_dict is keyed by label; the list follows the CSR vertex order
+            coloring_list = [coloring_dict[label] for label in as_csr(G).labels]
             return True, coloring_list, k_found, 0, [] if k_found else []
         else:
             return False, [], 0, 0, []
\ No newline at end of file
@@ -0,0 +1,128 @@
+# dataset_registry.py
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+from .graph_cache import GraphCache, default_cache, DEFAULT_CACHE_DIR
+from .graph_utils import (DATASETS_DIR, get_available_datasets, greedy_clique_size,
+                          read_header_comments)
+
+REGISTRY_VERSION = 1
+_CHROMATIC_RE = re.compile(r'chromatic number\s*(?:is|=|:)?\s*(\d+)', re.IGNORECASE)
+_CLIQUE_RE = re.compile(r'clique number\s*(?:is|=|:)?\s*(\d+)', re.IGNORECASE)
+
+def header_facts(path: Union[str, Path]) -> Dict[str, Optional[int]]:
+    """Known chromatic / clique numbers stated in a file's header comments"""
+    text = "\n".join(read_header_comments(path))
+    chromatic = _CHROMATIC_RE.search(text)
+    clique = _CLIQUE_RE.search(text)
+    return {
+        "known_chromatic": int(chromatic.group(1)) if chromatic else None,
+        "known_clique": int(clique.group(1)) if clique else None,
+    }
+
+class DatasetRegistry:
+    """Persistent index of the graph files in a datasets directory.
+
+    Each entry records n, m, density, max degree, a clique lower bound, any
+    chromatic/clique number stated in the header comments and the GraphCache
+    key of the parsed graph. ``refresh`` only re-reads files whose size or
+    mtime changed, so listing a large collection stays cheap.
+    """
+
+    def __init__(self, datasets_dir: Optional[Union[str, Path]] = None,
+                 index_path: Optional[Union[str, Path]] = None,
+                 cache: Optional[GraphCache] = None):
+        self.datasets_dir = Path(datasets_dir) if datasets_dir is not None else DATASETS_DIR
+        if index_path is None:
+            tag = hashlib.blake2b(str(self.datasets_dir.resolve()).encode(), digest_size=8).hexdigest()
+            index_path = DEFAULT_CACHE_DIR.parent / "registry" / f"{tag}.json"
+        self.index_path = Path(index_path)
+        self.cache = cache
+        self._entries: Dict[str, dict] = self._read()
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != REGISTRY_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def _write(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.index_path.parent, suffix=".json")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"version": REGISTRY_VERSION, "entries": self._entries}, f, indent=1)
+        os.replace(tmp, self.index_path)
+
+    def _describe(self, path: Path, st: os.stat_result) -> dict:
+        cache = self.cache or default_cache()
+        key = cache.key_for(path)
+        G = cache.load(path)
+        n, m = G.number_of_nodes(), G.number_of_edges()
+        entry = {
+            "path": str(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "n": n,
+            "m": m,
+            "density": (2.0 * m / (n * (n - 1))) if n > 1 else 0.0,
+            "max_degree": int(G.degrees.max()) if n else 0,
+            "clique_bound": greedy_clique_size(G),
+            "cache_key": key,
+        }
+        entry.update(header_facts(path))
+        if entry["known_clique"] is not None:
+            entry["clique_bound"] = max(entry["clique_bound"], entry["known_clique"])
+        return entry
+
+    def refresh(self) -> List[str]:
+        """Bring the index up to date; returns the names that were (re)indexed"""
+        seen = set()
+        updated = []
+        for path in sorted(get_available_datasets(self.datasets_dir)):
+            name = path.name
+            seen.add(name)
+            st = path.stat()
+            old = self._entries.get(name)
+            if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                continue
+            self._entries[name] = self._describe(path, st)
+            updated.append(name)
+        removed = [name for name in self._entries if name not in seen]
+        for name in removed:
+            del self._entries[name]
+        if updated or removed:
+            self._write()
+        return updated
+
+    def get(self, name: str) -> Optional[dict]:
+        return self._entries.get(name)
+
+    def entries(self) -> List[dict]:
+        return [dict(self._entries[name], name=name) for name in sorted(self._entries)]
+
+    def select(self, min_nodes: int = 0, max_nodes: Optional[int] = None,
+               max_edges: Optional[int] = None, known_chromatic: Optional[bool] = None,
+               where: Optional[Callable[[dict], bool]] = None) -> List[dict]:
+        """Entries matching simple size filters and an optional predicate"""
+        chosen = []
+        for entry in self.entries():
+            if entry["n"] < min_nodes:
+                continue
+            if max_nodes is not None and entry["n"] > max_nodes:
+                continue
+            if max_edges is not None and entry["m"] > max_edges:
+                continue
+            if known_chromatic is not None and (entry["known_chromatic"] is not None) != known_chromatic:
+                continue
+            if where is not None and not where(entry):
+                continue
+            chosen.append(entry)
+        return chosen
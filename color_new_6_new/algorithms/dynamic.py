@@ -0,0 +1,165 @@
+# dynamic.py
+from __future__ import annotations
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+from .rng import make_rng, SeedLike
+
+if TYPE_CHECKING:
+    import networkx as nx  # annotations only
+
+Edge = Tuple[Any, Any]
+
+class RecolorResult(NamedTuple):
+    coloring: Dict[Any, int]
+    k: int
+    changed: Set[Any]       # vertices whose color was (re)assigned
+    full_solve: bool        # True when the fallback solver had to run
+
+def apply_edge_delta(G: nx.Graph, added: Iterable[Edge] = (), removed: Iterable[Edge] = ()):
+    """Apply an edge delta to G in place"""
+    G.remove_edges_from(removed)
+    G.add_edges_from(added)
+
+def edge_delta(old: nx.Graph, new: nx.Graph) -> Tuple[list, list]:
+    """Edges added and removed going from ``old`` to ``new``"""
+    old_edges = {frozenset(e) for e in old.edges()}
+    new_edges = {frozenset(e) for e in new.edges()}
+    as_tuple = lambda e: tuple(e) if len(e) == 2 else (next(iter(e)),) * 2
+    return ([as_tuple(e) for e in new_edges - old_edges],
+            [as_tuple(e) for e in old_edges - new_edges])
+
+def _kempe_chain(G: nx.Graph, coloring: Dict[Any, int], start: Any, a: int, b: int,
+                 limit: int) -> Optional[Set[Any]]:
+    """Component of the (a, b)-subgraph containing ``start``; None if larger than ``limit``"""
+    chain = {start}
+    stack = [start]
+    while stack:
+        x = stack.pop()
+        for y in G.adj[x]:
+            if y not in chain and coloring.get(y) in (a, b):
+                chain.add(y)
+                if len(chain) > limit:
+                    return None
+                stack.append(y)
+    return chain
+
+def _try_kempe(G: nx.Graph, coloring: Dict[Any, int], x: Any, k: int, limit: int) -> Optional[Set[Any]]:
+    """Free a color for x by one Kempe swap; returns the recolored vertices or None"""
+    by_color: Dict[int, list] = {}
+    for y in G.adj[x]:
+        c = coloring.get(y)
+        if c is not None:
+            by_color.setdefault(c, []).append(y)
+    for a, blockers in by_color.items():
+        if len(blockers) != 1:
+            continue
+        for b in range(k):
+            if b == a:
+                continue
+            chain = _kempe_chain(G, coloring, blockers[0], a, b, limit)
+            if chain is None or any(y in chain for y in by_color.get(b, ())):
+                continue
+            for y in chain:
+                coloring[y] = b if coloring[y] == a else a
+            coloring[x] = a
+            return chain | {x}
+    return None
+
+def repair_coloring(G: nx.Graph, coloring: Dict[Any, int], added: Iterable[Edge] = (),
+                    k: Optional[int] = None, max_steps: Optional[int] = None,
+                    kempe_limit: int = 64, seed: SeedLike = None,
+                    full_solve: Optional[Callable[[nx.Graph], Tuple[Optional[int], Dict[Any, int], float]]] = None,
+                    uncolored: Iterable[Any] = ()) -> RecolorResult:
+    """Repair ``coloring`` in place for an already-edited G using at most k colors.
+
+    Only endpoints of conflicting or uncolored ``added`` edges and the
+    ``uncolored`` vertices are touched, so the cost follows the size of the
+    delta (pass ``k`` to also skip the scan for the current color count).
+    Each takes a free color, else a single Kempe-chain swap, else a
+    min-conflicts move that evicts its clashing neighbours. Vertices still
+    uncolored when the step budget runs out get a free color below k if
+    they have one; when the color count must grow, ``full_solve(G)`` is
+    called if given, otherwise they get the smallest free colors above k.
+    """
+    if k is None:
+        k = max(coloring.values(), default=-1) + 1
+    k = max(k, 1)
+    rng = make_rng(seed)
+
+    queue = deque(v for v in uncolored if v not in coloring)
+    for u, v in added:
+        if u not in coloring or v not in coloring:
+            queue.extend(x for x in (u, v) if x not in coloring)
+        elif coloring[u] == coloring[v]:
+            loser = v if G.degree(v) <= G.degree(u) else u
+            del coloring[loser]
+            queue.append(loser)
+    if max_steps is None:
+        max_steps = 20 * len(queue) + 100
+
+    changed: Set[Any] = set()
+    steps = 0
+    while queue and steps < max_steps:
+        steps += 1
+        x = queue.popleft()
+        if x in coloring:
+            continue
+        used = {coloring[y] for y in G.adj[x] if y in coloring}
+        free = next((c for c in range(k) if c not in used), None)
+        if free is not None:
+            coloring[x] = free
+            changed.add(x)
+            continue
+        swapped = _try_kempe(G, coloring, x, k, kempe_limit)
+        if swapped is not None:
+            changed |= swapped
+            continue
+        # Min-conflicts move: take the color held by the fewest neighbours
+        clash = [0] * k
+        for y in G.adj[x]:
+            if y in coloring:
+                clash[coloring[y]] += 1
+        fewest = min(clash)
+        choices = [c for c in range(k) if clash[c] == fewest]
+        c = choices[int(rng.integers(len(choices)))]
+        coloring[x] = c
+        changed.add(x)
+        for y in G.adj[x]:
+            if y != x and coloring.get(y) == c:
+                del coloring[y]
+                queue.append(y)
+
+    blocked = []
+    for x in queue:
+        if x in coloring:
+            continue
+        used = {coloring[y] for y in G.adj[x] if y in coloring}
+        free = next((c for c in range(k) if c not in used), None)
+        if free is None:
+            blocked.append(x)
+        else:
+            coloring[x] = free
+            changed.add(x)
+    if not blocked:
+        return RecolorResult(coloring, k, changed, False)
+    # The color count must grow
+    if full_solve is not None:
+        new_k, new_coloring, _ = full_solve(G)
+        if new_k is not None:
+            coloring.clear()
+            coloring.update(new_coloring)
+            return RecolorResult(coloring, new_k, set(G.nodes()), True)
+    for x in blocked:
+        used = {coloring[y] for y in G.adj[x] if y in coloring}
+        c = next(c for c in range(len(used) + 1) if c not in used)
+        coloring[x] = c
+        changed.add(x)
+        k = max(k, c + 1)
+    return RecolorResult(coloring, k, changed, False)
+
+def update_coloring(G: nx.Graph, coloring: Dict[Any, int], added: Iterable[Edge] = (),
+                    removed: Iterable[Edge] = (), **kwargs) -> RecolorResult:
+    """Apply an edge delta to G in place and repair the coloring locally"""
+    added = list(added)
+    apply_edge_delta(G, added, removed)
+    return repair_coloring(G, coloring, added, **kwargs)
@@ -0,0 +1,163 @@
+# generators.py
+from math import gcd
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+import numpy as np
+from .graph_utils import CSRGraph
+from .rng import make_rng, SeedLike
+
+class GeneratedGraph(NamedTuple):
+    graph: CSRGraph
+    name: str
+    chromatic_number: Optional[int]  # None when not known by construction
+
+def _pairs_within(groups: np.ndarray, starts: np.ndarray, sizes: np.ndarray):
+    """All pairs inside each group of a sorted member array (vectorised per group size)"""
+    us, vs = [], []
+    for s in np.unique(sizes[sizes > 1]).tolist():
+        first = starts[sizes == s]
+        a, b = np.triu_indices(s, k=1)
+        us.append(groups[(first[:, None] + a[None, :]).ravel()])
+        vs.append(groups[(first[:, None] + b[None, :]).ravel()])
+    if not us:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(us), np.concatenate(vs)
+
+def mycielski(order: int) -> GeneratedGraph:
+    """DIMACS-numbered Mycielski graph: myciel3 has 11 vertices and chromatic number 4"""
+    if order < 1:
+        raise ValueError("order must be at least 1")
+    n = 2
+    u = np.array([0], dtype=np.int64)
+    v = np.array([1], dtype=np.int64)
+    for _ in range(order - 1):
+        # Edge a-b gains a-b' and b-a'; every shadow vertex x' joins the hub
+        shadow = np.arange(n, 2 * n, dtype=np.int64)
+        hub = np.full(n, 2 * n, dtype=np.int64)
+        u, v = np.concatenate((u, u, v, shadow)), np.concatenate((v, v + n, u + n, hub))
+        n = 2 * n + 1
+    return GeneratedGraph(CSRGraph.from_edges(u, v, n), f"myciel{order}", order + 1)
+
+def queen(size: int) -> GeneratedGraph:
+    """Queen graph on a size x size board (squares attacking each other are adjacent)"""
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    n = size * size
+    cells = np.arange(n, dtype=np.int64)
+    row, col = np.divmod(cells, size)
+    us, vs = [], []
+    for line in (row, col, row + col, row - col + size):
+        order = np.argsort(line, kind='stable')
+        keys, starts, sizes = np.unique(line[order], return_index=True, return_counts=True)
+        u, v = _pairs_within(cells[order], starts, sizes)
+        us.append(u)
+        vs.append(v)
+    # chi = size exactly when size is coprime to 6; other sizes are only bounded
+    chromatic = size if gcd(size, 6) == 1 else None
+    return GeneratedGraph(CSRGraph.from_edges(np.concatenate(us), np.concatenate(vs), n),
+                          f"queen{size}_{size}", chromatic)
+
+def gnp(n: int, p: float, seed: SeedLike = None) -> GeneratedGraph:
+    """Erdos-Renyi G(n, p): the edge count is drawn first, then that many distinct pairs"""
+    rng = make_rng(seed)
+    total = n * (n - 1) // 2
+    m = int(rng.binomial(total, p)) if total else 0
+    u, v = _distinct_pairs(rng, n, m)
+    return GeneratedGraph(CSRGraph.from_edges(u, v, n), f"gnp_{n}_{p:g}", None)
+
+def _distinct_pairs(rng: np.random.Generator, n: int, m: int):
+    """m distinct unordered vertex pairs drawn uniformly without replacement"""
+    keys = np.empty(0, dtype=np.int64)
+    while keys.size < m:
+        need = m - keys.size
+        a = rng.integers(0, n, size=need + need // 8 + 16)
+        b = rng.integers(0, n, size=a.size)
+        keep = a != b
+        lo, hi = np.minimum(a[keep], b[keep]), np.maximum(a[keep], b[keep])
+        merged = np.unique(np.concatenate((keys, lo * n + hi)))
+        if merged.size > m:
+            # Drop a random surplus so the result stays uniform
+            merged = rng.choice(merged, size=m, replace=False)
+        keys = merged
+    return np.divmod(keys, n)
+
+def leighton(n: int, k: int, m: int, seed: SeedLike = None) -> GeneratedGraph:
+    """Leighton-style graph with planted chromatic number k.
+
+    Vertices are split into k balanced colour classes; random cliques of 2..k
+    vertices, one per distinct class, are added until about m edges exist, and
+    one k-clique is planted so the planted colouring is optimal.
+    """
+    if not 2 <= k <= n:
+        raise ValueError("need 2 <= k <= n")
+    rng = make_rng(seed)
+    class_of = np.arange(n, dtype=np.int64) % k
+    members = np.argsort(class_of, kind='stable')
+    class_start = np.searchsorted(class_of[members], np.arange(k))
+    class_size = np.bincount(class_of, minlength=k)
+
+    def clique_edges(count: int, s: int):
+        classes = np.argsort(rng.random((count, k)), axis=1)[:, :s]
+        picks = members[class_start[classes] + rng.integers(0, class_size[classes])]
+        a, b = np.triu_indices(s, k=1)
+        return picks[:, a].ravel(), picks[:, b].ravel()
+
+    u, v = clique_edges(1, k)  # planted k-clique
+    us, vs = [u], [v]
+    have = u.size
+    while have < m:
+        s = int(rng.integers(2, k + 1))
+        count = max(1, (m - have) // (s * (s - 1) // 2) // 4)
+        u, v = clique_edges(count, s)
+        us.append(u)
+        vs.append(v)
+        have += u.size
+    G = CSRGraph.from_edges(np.concatenate(us), np.concatenate(vs), n)
+    return GeneratedGraph(G, f"le{n}_{k}", k)
+
+def geometric(n: int, radius: float, seed: SeedLike = None) -> GeneratedGraph:
+    """Random geometric graph: n points in the unit square, edges closer than radius"""
+    rng = make_rng(seed)
+    pts = rng.random((n, 2))
+    cells_per_side = max(1, int(1.0 / radius)) if radius > 0 else 1
+    cell_xy = np.minimum((pts * cells_per_side).astype(np.int64), cells_per_side - 1)
+    cell = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+    order = np.argsort(cell, kind='stable')
+    sorted_cell = cell[order]
+    num_cells = cells_per_side * cells_per_side
+    start = np.searchsorted(sorted_cell, np.arange(num_cells), side='left')
+    end = np.searchsorted(sorted_cell, np.arange(num_cells), side='right')
+    us, vs = [], []
+    # Half of the 3x3 neighbourhood, so every cell pair is visited once
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        nx_, ny_ = cell_xy[order, 0] + dx, cell_xy[order, 1] + dy
+        ok = (nx_ >= 0) & (nx_ < cells_per_side) & (ny_ >= 0) & (ny_ < cells_per_side)
+        src = np.flatnonzero(ok)
+        other = nx_[ok] * cells_per_side + ny_[ok]
+        lo, hi = start[other], end[other]
+        if dx == 0 and dy == 0:
+            lo = src + 1  # same cell: only later points
+        counts = np.maximum(hi - lo, 0)
+        a = np.repeat(src, counts)
+        b = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts) + np.arange(counts.sum())
+        i, j = order[a], order[b]
+        close = ((pts[i] - pts[j]) ** 2).sum(axis=1) < radius * radius
+        us.append(i[close])
+        vs.append(j[close])
+    G = CSRGraph.from_edges(np.concatenate(us), np.concatenate(vs), n)
+    return GeneratedGraph(G, f"geo_{n}_{radius:g}", None)
+
+def write_dimacs(generated: GeneratedGraph, path: Union[str, Path]) -> Path:
+    """Write a generated graph as a DIMACS .col file (header records the known chromatic number)"""
+    path = Path(path)
+    G = generated.graph
+    u, v = G.edge_arrays()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"c FILE: {path.name}\n")
+        f.write(f"c Generated {generated.name}\n")
+        if generated.chromatic_number is not None:
+            f.write(f"c chromatic number {generated.chromatic_number}\n")
+        f.write(f"p edge {G.n} {len(u)}\n")
+        if len(u):
+            np.savetxt(f, np.column_stack((u, v)).astype(np.int64) + 1, fmt="e %d %d")
+    return path
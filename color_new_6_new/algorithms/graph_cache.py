@@ -0,0 +1,168 @@
+# graph_cache.py
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+from .graph_utils import CSRGraph
+from .graph_store import STORE_FORMAT, build_csr, open_csr
+
+CACHE_VERSION = 3
+DEFAULT_CACHE_DIR = Path(os.environ.get("GRAPH_CACHE_DIR",
+                                        Path.home() / ".cache" / "graph_coloring" / "graphs"))
+DEFAULT_MAX_BYTES = 2 << 30
+
+def file_digest(path: Union[str, Path], chunk_bytes: int = 8 << 20) -> str:
+    """Content hash of a graph file (blake2b, streamed)"""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_bytes), b''):
+            h.update(block)
+    return h.hexdigest()
+
+class GraphCache:
+    """On-disk cache of parsed graphs stored as memory-mappable arrays.
+
+    Each entry is a directory named after the source file's content hash and
+    holds the graph_store CSR files (offsets, neighbors, edge arrays, labels).
+    A stat index (path, size, mtime) avoids re-hashing unchanged files, and
+    the least recently used entries are evicted once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.cache_dir / "index.json"
+
+    # ---- stat index: path -> (size, mtime, digest) ----
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: dict):
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".json")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp, self._index_path)
+
+    def key_for(self, path: Union[str, Path]) -> str:
+        """Content hash of ``path``, reused from the index while size and mtime match"""
+        p = Path(path).resolve()
+        st = p.stat()
+        index = self._read_index()
+        entry = index.get(str(p))
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["digest"]
+        digest = file_digest(p)
+        index[str(p)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest}
+        self._write_index(index)
+        return digest
+
+    def entry_dir(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.v{CACHE_VERSION}.{STORE_FORMAT}"
+
+    # ---- load / store ----
+    def load(self, path: Union[str, Path], mmap: bool = True) -> CSRGraph:
+        """Return the CSR graph for ``path``, parsing and caching it on a miss.
+
+        With ``mmap`` the returned graph reads straight from the cached files.
+        """
+        p = Path(path)
+        if not p.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        key = self.key_for(p)
+        entry = self.entry_dir(key)
+        if (entry / "meta.json").exists():
+            try:
+                graph = open_csr(entry, mmap)
+                os.utime(entry / "meta.json")  # LRU touch
+                return graph
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(entry, ignore_errors=True)
+        self._write_entry(entry, p)
+        self.evict()
+        return open_csr(entry, mmap)
+
+    def _write_entry(self, entry: Path, source: Path):
+        tmp = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-"))
+        try:
+            build_csr(source, tmp)
+            with open(tmp / "source.json", 'w', encoding='utf-8') as f:
+                json.dump({"source": str(source.resolve()), "created": time.time()}, f)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process may have written the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    # ---- maintenance ----
+    def entries(self) -> list:
+        """Cached entry directories, least recently used first"""
+        found = [d for d in self.cache_dir.iterdir()
+                 if d.is_dir() and not d.name.startswith(".") and (d / "meta.json").exists()]
+        return sorted(found, key=lambda d: (d / "meta.json").stat().st_mtime)
+
+    def size_bytes(self) -> int:
+        return sum(f.stat().st_size for d in self.entries() for f in d.iterdir())
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits ``max_bytes``"""
+        entries = self.entries()
+        sizes = {d: sum(f.stat().st_size for f in d.iterdir()) for d in entries}
+        total = sum(sizes.values())
+        evicted = set()
+        for d in entries[:-1]:  # never evict the entry just written
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(d, ignore_errors=True)
+            total -= sizes[d]
+            evicted.add(d.name)
+        if evicted:
+            self._forget(evicted)
+
+    def _forget(self, entry_names: set):
+        """Drop stat index records that point at the given entry directories"""
+        index = self._read_index()
+        kept = {path: entry for path, entry in index.items()
+                if self.entry_dir(entry["digest"]).name not in entry_names}
+        if len(kept) != len(index):
+            self._write_index(kept)
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None):
+        """Forget the cached parse of ``path``, or everything when no path is given"""
+        if path is None:
+            for d in self.cache_dir.iterdir():
+                if d.is_dir():
+                    shutil.rmtree(d, ignore_errors=True)
+            self._write_index({})
+            return
+        p = str(Path(path).resolve())
+        index = self._read_index()
+        entry = index.pop(p, None)
+        if entry:
+            shutil.rmtree(self.entry_dir(entry["digest"]), ignore_errors=True)
+            self._write_index(index)
+
+_default_cache = None
+
+def default_cache() -> GraphCache:
+    """Process-wide cache in ``GRAPH_CACHE_DIR`` (or ~/.cache/graph_coloring)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GraphCache()
+    return _default_cache
+
+def load_cached_csr(path: Union[str, Path]) -> CSRGraph:
+    """Load a graph file through the default cache"""
+    return default_cache().load(path)
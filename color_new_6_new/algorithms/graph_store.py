@@ -0,0 +1,192 @@
+# graph_store.py
+import json
+import os
+from pathlib import Path
+from typing import Union
+import numpy as np
+from .graph_utils import CSRGraph, _iter_line_chunks, _parse_edge_chunk, open_graph_source
+
+STORE_FORMAT = 1
+_BLOCK_EDGES = 1 << 18
+
+def _index_dtype(n: int):
+    return np.int32 if n < 2**31 else np.int64
+
+def _open_array(path: Path, dtype, length: int, mmap: bool) -> np.ndarray:
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode='r', shape=(length,))
+    return np.fromfile(path, dtype=dtype, count=length)
+
+def _write_meta(directory: Path, n: int, m: int, nnz: int, index_dtype, identity: bool) -> dict:
+    meta = {"format": STORE_FORMAT, "n": n, "m": m, "nnz": nnz,
+            "index_dtype": np.dtype(index_dtype).name, "identity_labels": identity}
+    with open(directory / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return meta
+
+def open_csr(directory: Union[str, Path], mmap: bool = True) -> CSRGraph:
+    """Open a stored graph; with ``mmap`` every array stays on disk"""
+    directory = Path(directory)
+    with open(directory / "meta.json", 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get("format") != STORE_FORMAT:
+        raise ValueError(f"Unsupported graph store format in {directory}")
+    n, m, nnz = meta["n"], meta["m"], meta["nnz"]
+    idx = np.dtype(meta["index_dtype"])
+    offsets = _open_array(directory / "offsets.bin", np.int64, n + 1, mmap)
+    if n == 0:
+        offsets = np.zeros(1, dtype=np.int64)
+    neighbors = _open_array(directory / "neighbors.bin", idx, nnz, mmap)
+    edge_u = _open_array(directory / "edge_u.bin", idx, m, mmap)
+    edge_v = _open_array(directory / "edge_v.bin", idx, m, mmap)
+    labels = None if meta["identity_labels"] else np.fromfile(directory / "labels.bin", dtype=np.int64)
+    graph = CSRGraph(offsets, neighbors, labels, edge_arrays=(edge_u, edge_v), lazy=mmap)
+    graph.store = str(directory)
+    return graph
+
+def _mark(present: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Set ``present[ids]``, growing the array (at least doubling) when needed"""
+    if ids.size == 0:
+        return present
+    top = int(ids.max()) + 1
+    if top > present.size:
+        grown = np.zeros(max(top, 2 * present.size), dtype=bool)
+        grown[:present.size] = present
+        present = grown
+    present[ids] = True
+    return present
+
+def write_csr(graph: CSRGraph, directory: Union[str, Path]) -> dict:
+    """Store an in-memory CSRGraph (integer labels only)"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    idx = _index_dtype(graph.n)
+    identity = isinstance(graph.labels, range)
+    u, v = graph.edge_arrays()
+    np.asarray(graph.offsets, dtype=np.int64).tofile(directory / "offsets.bin")
+    np.asarray(graph.neighbors_array, dtype=idx).tofile(directory / "neighbors.bin")
+    np.asarray(u, dtype=idx).tofile(directory / "edge_u.bin")
+    np.asarray(v, dtype=idx).tofile(directory / "edge_v.bin")
+    if not identity:
+        np.asarray(graph.labels, dtype=np.int64).tofile(directory / "labels.bin")
+    return _write_meta(directory, graph.n, len(u), len(graph.neighbors_array), idx, identity)
+
+def build_csr(source: Union[str, Path], directory: Union[str, Path],
+              block_edges: int = _BLOCK_EDGES) -> dict:
+    """Parse a graph file (plain, compressed or ``'-'`` for stdin) straight into
+    the on-disk CSR format.
+
+    Peak memory is one parse chunk / edge block plus O(n) bookkeeping:
+    raw edges are spilled to disk, scattered into rows through a mapped
+    scratch file, then each block of rows is sorted, de-duplicated and
+    appended to the final arrays.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    raw_path = directory / "raw_edges.tmp"
+    scratch_path = directory / "scatter.tmp"
+
+    # Pass 1: parse, spill (u, v) pairs, note which vertex ids occur
+    declared = -1
+    raw_count = 0
+    present = np.zeros(0, dtype=bool)
+    negative = np.zeros(0, dtype=bool)  # negative[i]: id -1 - i occurs
+    with open_graph_source(source) as f, open(raw_path, 'wb') as raw:
+        for chunk in _iter_line_chunks(f):
+            u, v, nodes = _parse_edge_chunk(chunk)
+            declared = max(declared, nodes)
+            if u.size == 0:
+                continue
+            for ids in (u, v):
+                if ids.min() < 0:
+                    negative = _mark(negative, -1 - ids[ids < 0])
+                    ids = ids[ids >= 0]
+                present = _mark(present, ids)
+            np.column_stack((u, v)).tofile(raw)
+            raw_count += u.size
+    top = int(np.flatnonzero(present)[-1]) + 1 if present.any() else 0
+    size = max(top, declared, 0)
+    if present.size < size:
+        grown = np.zeros(size, dtype=bool)
+        grown[:present.size] = present
+        present = grown
+    present = present[:size]
+    present[:max(declared, 0)] = True
+    labels = np.concatenate((-1 - np.flatnonzero(negative)[::-1], np.flatnonzero(present)))
+    base = int(labels[0]) if labels.size and labels[0] < 0 else 0
+    n = int(labels.size)
+    identity = n == size and base == 0
+    remap = None
+    if not identity:
+        remap = np.full(size - base, -1, dtype=np.int64)
+        remap[labels - base] = np.arange(n)
+    del present, negative
+    idx = _index_dtype(n)
+
+    raw_map = (np.memmap(raw_path, dtype=np.int64, mode='r', shape=(raw_count, 2))
+               if raw_count else np.empty((0, 2), dtype=np.int64))
+
+    def directed_blocks():
+        for a in range(0, raw_count, block_edges):
+            pair = np.asarray(raw_map[a:a + block_edges])
+            u, v = pair[:, 0], pair[:, 1]
+            if remap is not None:
+                u, v = remap[u - base], remap[v - base]
+            lo, hi = np.minimum(u, v), np.maximum(u, v)
+            nonloop = lo != hi
+            yield np.concatenate((lo, hi[nonloop])), np.concatenate((hi, lo[nonloop]))
+
+    # Pass 2: row sizes including duplicates
+    counts = np.zeros(n, dtype=np.int64)
+    for src, _ in directed_blocks():
+        counts += np.bincount(src, minlength=n)
+    starts = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    total = int(starts[-1])
+
+    # Pass 3: scatter every directed edge into its row of the scratch file
+    scratch = (np.memmap(scratch_path, dtype=idx, mode='w+', shape=(total,))
+               if total else np.empty(0, dtype=idx))
+    fill = starts[:-1].copy()
+    for src, dst in directed_blocks():
+        order = np.argsort(src, kind='stable')
+        src, dst = src[order], dst[order]
+        rank = np.arange(src.size) - np.searchsorted(src, src, side='left')
+        scratch[fill[src] + rank] = dst
+        fill += np.bincount(src, minlength=n)
+    del fill
+
+    # Pass 4: sort and de-duplicate each block of rows into the final arrays
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    written = 0
+    m = 0
+    with open(directory / "neighbors.bin", 'wb') as f_nbr, \
+            open(directory / "edge_u.bin", 'wb') as f_u, \
+            open(directory / "edge_v.bin", 'wb') as f_v:
+        r0 = 0
+        while r0 < n:
+            r1 = int(np.searchsorted(starts, starts[r0] + block_edges, side='right')) - 1
+            r1 = min(max(r1, r0 + 1), n)
+            seg = np.asarray(scratch[starts[r0]:starts[r1]], dtype=np.int64)
+            rows = np.repeat(np.arange(r0, r1, dtype=np.int64), counts[r0:r1])
+            key = np.unique(rows * n + seg)
+            krow, kcol = np.divmod(key, n)
+            kcol.astype(idx).tofile(f_nbr)
+            offsets[r0 + 1:r1 + 1] = written + np.cumsum(np.bincount(krow - r0, minlength=r1 - r0))
+            written += key.size
+            upper = kcol >= krow
+            krow[upper].astype(idx).tofile(f_u)
+            kcol[upper].astype(idx).tofile(f_v)
+            m += int(np.count_nonzero(upper))
+            r0 = r1
+    offsets.tofile(directory / "offsets.bin")
+    if not identity:
+        labels.astype(np.int64).tofile(directory / "labels.bin")
+
+    del scratch, raw_map
+    for tmp in (raw_path, scratch_path):
+        if tmp.exists():
+            os.remove(tmp)
+    return _write_meta(directory, n, m, written, idx, identity)
@@ -1,78 +1,471 @@
-import networkx as nx
-import matplotlib.pyplot as plt
+from __future__ import annotations
 from pathlib import Path
-import json
-from typing import Optional
+import bz2
+import contextlib
+import gzip
+import lzma
+import sys
+from typing import TYPE_CHECKING, Optional, Any, Dict, List, NamedTuple, Sequence, Tuple, Union
+import numpy as np
 
-def load_edgelist(path: str) -> nx.Graph:
-    """Load graph from various file formats"""
+if TYPE_CHECKING:
+    import networkx as nx  # annotations only; imported where a graph is built
+
+_CHUNK_BYTES = 1 << 18
+_VECTOR_MIN_EDGES = 2048
+_CONFLICT_BLOCK = 1 << 20
+_MAX_DIGITS = 18  # longest digit run that fits int64 without overflow
+_IS_SPACE = np.zeros(256, dtype=bool)
+_IS_SPACE[[ord(' '), ord('\t'), ord('\r'), ord('\n'), 11, 12]] = True
+_IS_DIGIT = np.zeros(256, dtype=bool)
+_IS_DIGIT[ord('0'):ord('9') + 1] = True
+
+def _split_tokens(buf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised ``str.split()`` of a byte buffer: (start, end) offsets of every field"""
+    space = _IS_SPACE[buf]
+    step = np.diff(np.concatenate(([True], space, [True])).astype(np.int8))
+    return np.flatnonzero(step == -1), np.flatnonzero(step == 1)
+
+def _int_tokens(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(values, valid) of fields; valid where ``int()`` would accept the field.
+
+    Fields are optionally signed runs of up to 18 ASCII digits; anything else
+    (``1.5``, ``x1``, empty sign) is invalid and its value is 0.
+    """
+    values = np.zeros(starts.size, dtype=np.int64)
+    if starts.size == 0:
+        return values, np.zeros(0, dtype=bool)
+    lead = buf[starts]
+    signed = (lead == ord('+')) | (lead == ord('-'))
+    first = starts + signed
+    ndigits = ends - first
+    valid = (ndigits > 0) & (ndigits <= _MAX_DIGITS)
+    # Horner's rule, one digit position per pass over the (short) fields
+    for d in range(int(ndigits[valid].max()) if valid.any() else 0):
+        active = np.flatnonzero(valid & (ndigits > d))
+        byte = buf[first[active] + d]
+        valid[active] &= _IS_DIGIT[byte]
+        values[active] = values[active] * 10 + (byte.astype(np.int64) - 48)
+    values[~valid] = 0
+    negative = (lead == ord('-')) & valid
+    values[negative] = -values[negative]
+    return values, valid
+
+def _parse_edge_chunk(chunk: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Parse whole lines of DIMACS ('p'/'e') or plain 'u v' records.
+
+    Same rules as the original line-by-line loader, decided by a line's
+    whitespace-separated fields: lines starting with 'c' or '#' are comments;
+    'p' with three or more fields declares its third field as node count; 'e'
+    with three or more fields is an edge shifted to 0-based (0 and negative
+    ids stay); any other line whose first two fields are integers (signed
+    allowed) is an edge, and lines like ``1.5 2.5`` are skipped. A 'p'/'e'
+    record with non-integer fields raises ValueError, as ``int()`` did.
+    Returns (u, v, nodes declared by a 'p' line or -1).
+    """
+    empty = np.empty(0, dtype=np.int64)
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    starts, ends = _split_tokens(buf)
+    if starts.size == 0:
+        return empty, empty, -1
+    line = np.searchsorted(np.flatnonzero(buf == 10), starts)
+    head = np.flatnonzero(np.concatenate(([True], line[1:] != line[:-1])))
+    fields = np.diff(np.append(head, starts.size))
+    first_byte = buf[starts[head]]
+    single = ends[head] - starts[head] == 1
+    comment = (first_byte == ord('c')) | (first_byte == ord('#'))
+    header = single & (first_byte == ord('p')) & (fields >= 3)
+    dimacs = single & (first_byte == ord('e')) & (fields >= 3)
+    edge_line = dimacs | (~comment & ~header & (fields >= 2))
+
+    num_nodes = -1
+    if header.any():
+        at = head[header] + 2
+        declared, ok = _int_tokens(buf, starts[at], ends[at])
+        if not ok.all():
+            raise ValueError("Malformed DIMACS 'p' line: node count is not an integer")
+        num_nodes = max(int(declared.max()), -1)
+
+    a = head[edge_line] + dimacs[edge_line]
+    at = np.concatenate((a, a + 1))
+    values, ok = _int_tokens(buf, starts[at], ends[at])
+    u, v = values[:a.size], values[a.size:]
+    ok = ok[:a.size] & ok[a.size:]
+    shift = dimacs[edge_line]
+    if not ok[shift].all():
+        raise ValueError("Malformed DIMACS 'e' line: endpoints are not integers")
+    u = u - (shift & (u > 0))
+    v = v - (shift & (v > 0))
+    return u[ok], v[ok], num_nodes
+
+def _iter_line_chunks(f, chunk_bytes: int = _CHUNK_BYTES):
+    """Yield blocks of whole lines from a binary file object"""
+    tail = b''
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b'\n') + 1
+        if cut == 0:
+            tail = block
+            continue
+        tail = block[cut:]
+        yield block[:cut]
+    if tail:
+        yield tail
+
+DATASETS_DIR = Path(__file__).resolve().parent.parent / "datasets"
+GRAPH_SUFFIXES = ('.col', '.edgelist')
+COMPRESSED_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open, '.lzma': lzma.open}
+STDIN = '-'
+# File dialog filter for every graph file is_graph_file accepts
+GRAPH_FILETYPES = [("Graph files", " ".join(f"*{suffix}" for suffix in (*GRAPH_SUFFIXES, *COMPRESSED_OPENERS))),
+                   ("All files", "*.*")]
+
+def is_graph_file(path: Union[str, Path]) -> bool:
+    """True for .col/.edgelist files, optionally compressed"""
+    suffixes = Path(path).suffixes
+    if suffixes and suffixes[-1] in COMPRESSED_OPENERS:
+        suffixes = suffixes[:-1]
+    return bool(suffixes) and suffixes[-1] in GRAPH_SUFFIXES
+
+def open_graph_source(path: Union[str, Path]):
+    """Open a graph source as a binary stream.
+
+    ``'-'`` reads stdin; .gz/.bz2/.xz files are decompressed on the fly, so
+    nothing is extracted to disk.
+    """
+    if str(path) == STDIN:
+        return contextlib.nullcontext(sys.stdin.buffer)
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"File not found: {path}")
+    opener = COMPRESSED_OPENERS.get(p.suffix, open)
+    return opener(p, 'rb')
 
-    G = nx.Graph()
-    edges = []
-    
-    with open(p, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('c') or line.startswith('#'):
-                continue
-            
-            parts = line.split()
-            
-            # DIMACS format
-            if parts[0] == 'p' and len(parts) >= 3:
-                num_nodes = int(parts[2])
-                G.add_nodes_from(range(num_nodes))
-                continue
-            elif parts[0] == 'e' and len(parts) >= 3:
-                u, v = int(parts[1]), int(parts[2])
-                # Convert to 0-based indexing if needed
-                u = u - 1 if u > 0 else u
-                v = v - 1 if v > 0 else v
-                edges.append((u, v))
-            # Simple edge list format
-            elif len(parts) >= 2:
-                try:
-                    u, v = int(parts[0]), int(parts[1])
-                    edges.append((u, v))
-                except ValueError:
-                    continue
-    
-    if edges:
-        G.add_edges_from(edges)
-    
-    # Ensure all nodes are present
-    all_nodes = set()
-    for u, v in edges:
-        all_nodes.add(u)
-        all_nodes.add(v)
-    
-    for node in all_nodes:
-        if node not in G:
-            G.add_node(node)
-    
-    return G
+def read_header_comments(path: Union[str, Path], max_bytes: int = 64 << 10) -> List[str]:
+    """Comment lines ('c ...' / '# ...') from the start of a graph file"""
+    with open_graph_source(path) as f:
+        head = f.read(max_bytes)
+    comments = []
+    for raw in head.decode('utf-8', errors='replace').splitlines():
+        line = raw.strip()
+        if line.startswith('#'):
+            comments.append(line[1:].strip())
+        elif line == 'c' or line.startswith('c '):
+            comments.append(line[1:].strip())
+        elif line and line[0] in 'pe':
+            break
+    return comments
+
+def read_edge_arrays(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bulk-parse a graph file into (u, v, labels) NumPy arrays.
+
+    ``u``/``v`` are vertex indices into the sorted ``labels`` array, which holds
+    the file's own vertex ids (0..n-1 for DIMACS files). Compressed files and
+    stdin (``'-'``) are parsed chunk by chunk as the data is decoded.
+    """
+    us, vs = [], []
+    num_nodes = -1
+    with open_graph_source(path) as f:
+        for chunk in _iter_line_chunks(f):
+            u, v, declared = _parse_edge_chunk(chunk)
+            us.append(u)
+            vs.append(v)
+            num_nodes = max(num_nodes, declared)
+    u = np.concatenate(us) if us else np.empty(0, dtype=np.int64)
+    v = np.concatenate(vs) if vs else np.empty(0, dtype=np.int64)
+    return _relabel(u, v, num_nodes)
+
+def _relabel(u: np.ndarray, v: np.ndarray, num_nodes: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Map raw vertex ids (negative ones too) to 0..n-1 over range(num_nodes) plus every endpoint"""
+    top = max(num_nodes, int(u.max()) + 1 if u.size else 0, int(v.max()) + 1 if v.size else 0)
+    lo = min(0, int(u.min()) if u.size else 0, int(v.min()) if v.size else 0)
+    if num_nodes >= top and lo == 0:
+        return u, v, np.arange(num_nodes, dtype=np.int64)
+    present = np.zeros(top - lo, dtype=bool)
+    present[-lo:max(num_nodes, 0) - lo] = True
+    present[u - lo] = True
+    present[v - lo] = True
+    labels = np.flatnonzero(present) + lo
+    if labels.size == top and lo == 0:
+        return u, v, labels
+    return np.searchsorted(labels, u), np.searchsorted(labels, v), labels
+
+def load_csr(path: str) -> "CSRGraph":
+    """Load a graph file straight into a CSRGraph (no networkx objects)"""
+    u, v, labels = read_edge_arrays(path)
+    return CSRGraph.from_edges(u, v, labels.size, labels)
+
+def load_edgelist(path: str) -> nx.Graph:
+    """Load graph from various file formats"""
+    return load_csr(path).to_networkx()
+
+class CSRGraph:
+    """Compact read-only adjacency in CSR form.
+
+    Vertices are relabelled to 0..n-1; ``labels[i]`` is the original label of
+    vertex ``i``. The neighbours of ``i`` are ``neighbors[offsets[i]:offsets[i+1]]``.
+    A small networkx-like subset (``nodes``, ``neighbors``, ``degree``, ``edges``,
+    ``number_of_nodes``, ``number_of_edges``) lets the solvers take either type.
+
+    With ``lazy=True`` (memory-mapped graphs) no per-edge Python objects are
+    built: ``neighbors`` slices the buffer on each call and conflict counting
+    streams over the edge arrays in blocks.
+    """
+
+    def __init__(self, offsets: np.ndarray, neighbors: np.ndarray, labels: Optional[list] = None,
+                 edge_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None, lazy: bool = False):
+        self.offsets = np.asarray(offsets, dtype=np.int64)  # no copy for mapped int64 buffers
+        self.neighbors_array = np.asarray(neighbors)
+        self.lazy = lazy
+        self.store: Optional[str] = None  # graph_store directory a mapped graph was opened from
+        self.n = len(self.offsets) - 1
+        if labels is None or (isinstance(labels, np.ndarray) and
+                               np.array_equal(labels, np.arange(self.n))):
+            self.labels = range(self.n)
+        else:
+            self.labels = labels.tolist() if isinstance(labels, np.ndarray) else list(labels)
+        self._adj = None
+        self._edges = None
+        self._edge_arrays = edge_arrays
+        self._index = None
+
+    # ---- construction ----
+    @classmethod
+    def from_edges(cls, u: Sequence[int], v: Sequence[int], num_nodes: int,
+                   labels: Optional[list] = None) -> "CSRGraph":
+        """Build from parallel endpoint arrays of 0-based indices (duplicates dropped)"""
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        num_nodes = int(num_nodes)
+        lo, hi = np.minimum(u, v), np.maximum(u, v)
+        key = np.unique(lo * num_nodes + hi)
+        lo, hi = np.divmod(key, num_nodes)
+        # Both directions as sorted (src, dst) keys; self-loops are stored once
+        both = np.concatenate([key, (hi * num_nodes + lo)[lo != hi]])
+        both.sort()
+        src, dst = np.divmod(both, num_nodes)
+        idx_dtype = np.int32 if num_nodes < 2**31 else np.int64
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_nodes), out=offsets[1:])
+        return cls(offsets, dst.astype(idx_dtype), labels)
+
+    @classmethod
+    def from_networkx(cls, G: nx.Graph) -> "CSRGraph":
+        """Build from a networkx graph; integer labels keep their sorted order"""
+        try:
+            labels = sorted(G.nodes())
+        except TypeError:
+            labels = list(G.nodes())
+        index = {label: i for i, label in enumerate(labels)}
+        m = G.number_of_edges()
+        u = np.fromiter((index[a] for a, _ in G.edges()), dtype=np.int64, count=m)
+        v = np.fromiter((index[b] for _, b in G.edges()), dtype=np.int64, count=m)
+        return cls.from_edges(u, v, len(labels), labels)
+
+    @classmethod
+    def from_file(cls, path: str) -> "CSRGraph":
+        """Build straight from a graph file"""
+        return load_csr(path)
+
+    # ---- networkx-like read API (vertex indices) ----
+    def nodes(self) -> range:
+        return range(self.n)
+
+    def number_of_nodes(self) -> int:
+        return self.n
+
+    def number_of_edges(self) -> int:
+        return len(self.edge_arrays()[0])
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __contains__(self, node) -> bool:
+        return isinstance(node, (int, np.integer)) and 0 <= node < self.n
+
+    @property
+    def adjacency(self) -> List[List[int]]:
+        """Per-vertex neighbour lists as Python ints (built once, used by hot loops)"""
+        if self._adj is None:
+            flat = self.neighbors_array.tolist()
+            offs = self.offsets.tolist()
+            self._adj = [flat[offs[i]:offs[i + 1]] for i in range(self.n)]
+        return self._adj
+
+    def neighbors(self, node: int) -> List[int]:
+        if self.lazy and self._adj is None:
+            return self.neighbors_array[self.offsets[node]:self.offsets[node + 1]].tolist()
+        return self.adjacency[node]
+
+    @property
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def degree(self, node: int) -> int:
+        return int(self.offsets[node + 1] - self.offsets[node])
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Each undirected edge once as (u, v) index arrays with u <= v"""
+        if self._edge_arrays is None:
+            rows = np.repeat(np.arange(self.n, dtype=self.neighbors_array.dtype), self.degrees)
+            keep = self.neighbors_array >= rows
+            self._edge_arrays = (rows[keep], self.neighbors_array[keep])
+        return self._edge_arrays
+
+    def count_conflicts(self, coloring: Union[Sequence[int], np.ndarray]) -> int:
+        """Monochromatic edges under an index-space coloring"""
+        u, v = self.edge_arrays()
+        if not self.lazy and len(u) <= _VECTOR_MIN_EDGES:
+            return sum(1 for a, b in self.edges() if coloring[a] == coloring[b])
+        c = np.asarray(coloring)
+        conflicts = 0
+        for start in range(0, len(u), _CONFLICT_BLOCK):
+            stop = start + _CONFLICT_BLOCK
+            conflicts += int(np.count_nonzero(c[u[start:stop]] == c[v[start:stop]]))
+        return conflicts
+
+    def edges(self) -> List[Tuple[int, int]]:
+        if self._edges is None:
+            u, v = self.edge_arrays()
+            self._edges = list(zip(u.tolist(), v.tolist()))
+        return self._edges
+
+    # ---- label mapping ----
+    def index_of(self, label: Any) -> int:
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index[label]
+
+    def map_coloring(self, coloring: Union[Sequence[int], Dict[int, int]]) -> Dict[Any, int]:
+        """Translate an index-space coloring (list or dict) back to original labels"""
+        items = coloring.items() if isinstance(coloring, dict) else enumerate(coloring)
+        return {self.labels[i]: int(c) for i, c in items}
+
+    def to_networkx(self) -> nx.Graph:
+        """Materialise an nx.Graph with the original labels (for drawing)"""
+        import networkx as nx
+        G = nx.Graph()
+        G.add_nodes_from(self.labels)
+        u, v = self.edge_arrays()
+        labels = self.labels
+        G.add_edges_from((labels[a], labels[b]) for a, b in zip(u.tolist(), v.tolist()))
+        return G
+
+GraphLike = Union["nx.Graph", CSRGraph]
+
+def as_csr(G: GraphLike) -> CSRGraph:
+    """Return G as a CSRGraph, converting an nx.Graph if needed"""
+    return G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
 
 def create_custom_graph(edges: list, num_vertices: int) -> nx.Graph:
     """Create graph from custom edges"""
+    import networkx as nx
     G = nx.Graph()
     G.add_nodes_from(range(num_vertices))
     G.add_edges_from(edges)
     return G
 
-def calculate_conflicts(G: nx.Graph, coloring: dict) -> int:
+def calculate_conflicts(G: GraphLike, coloring: dict) -> int:
     """Calculate number of coloring conflicts"""
+    if isinstance(G, CSRGraph):
+        # Uncolored vertices share the -1 sentinel, matching the None == None rule below
+        colors = np.fromiter((coloring.get(label, -1) for label in G.labels), dtype=np.int64, count=G.n)
+        return G.count_conflicts(colors)
     conflicts = 0
     for u, v in G.edges():
         if coloring.get(u) == coloring.get(v):
             conflicts += 1
     return conflicts
 
-def get_available_datasets() -> list:
-    """Get list of available dataset files"""
-    datasets_dir = Path("datasets")
+def edge_index(G: GraphLike) -> Tuple[list, np.ndarray, np.ndarray]:
+    """Vertex labels plus (u, v) index arrays, one entry per edge in ``G.edges()`` order"""
+    if isinstance(G, CSRGraph):
+        u, v = G.edge_arrays()
+        return list(G.labels), u, v
+    labels = list(G.nodes())
+    index = {label: i for i, label in enumerate(labels)}
+    m = G.number_of_edges()
+    u = np.fromiter((index[a] for a, _ in G.edges()), dtype=np.int64, count=m)
+    v = np.fromiter((index[b] for _, b in G.edges()), dtype=np.int64, count=m)
+    return labels, u, v
+
+def batch_conflicts(colorings: np.ndarray, u: np.ndarray, v: np.ndarray,
+                    per_vertex: bool = False, num_nodes: Optional[int] = None):
+    """Score many index-space colorings at once.
+
+    ``colorings`` is a (batch, n) array. Returns the (batch,) conflict totals,
+    and with ``per_vertex`` also a (batch, n) array counting each vertex's
+    conflicting edges. Edges are taken in blocks of about _CONFLICT_BLOCK
+    (batch x edge) cells, so temporaries stay small and memory-mapped edge
+    arrays are streamed.
+    """
+    C = np.atleast_2d(np.asarray(colorings))
+    batch = C.shape[0]
+    n = C.shape[1] if num_nodes is None else num_nodes
+    totals = np.zeros(batch, dtype=np.int64)
+    counts = np.zeros(batch * n, dtype=np.int64) if per_vertex else None
+    step = max(_CONFLICT_BLOCK // max(batch, 1), 1)
+    for start in range(0, len(u), step):
+        bu = np.asarray(u[start:start + step])
+        bv = np.asarray(v[start:start + step])
+        mono = C[:, bu] == C[:, bv]
+        totals += np.count_nonzero(mono, axis=1)
+        if per_vertex:
+            rows, cols = np.nonzero(mono)
+            a, b = bu[cols], bv[cols]
+            ends = np.concatenate((rows * n + a, (rows * n + b)[a != b]))
+            counts += np.bincount(ends, minlength=batch * n)
+    if not per_vertex:
+        return totals
+    return totals, counts.reshape(batch, n)
+
+class ConflictReport(NamedTuple):
+    total: int
+    per_vertex: Dict[Any, int]
+    edges: List[Tuple[Any, Any]]
+    edge_mask: np.ndarray  # aligned with G.edges() order
+
+def conflict_report(G: GraphLike, coloring: dict) -> ConflictReport:
+    """Total, per-vertex counts and the conflicting edges of one labelled coloring"""
+    labels, u, v = edge_index(G)
+    colors = np.fromiter((coloring.get(label, -1) for label in labels), dtype=np.int64,
+                         count=len(labels))
+    totals, counts = batch_conflicts(colors, u, v, per_vertex=True, num_nodes=len(labels))
+    mask = colors[u] == colors[v]
+    bad_u, bad_v = u[mask].tolist(), v[mask].tolist()
+    return ConflictReport(
+        total=int(totals[0]),
+        per_vertex={labels[i]: int(c) for i, c in zip(np.flatnonzero(counts[0]).tolist(),
+                                                       counts[0][counts[0] > 0].tolist())},
+        edges=[(labels[a], labels[b]) for a, b in zip(bad_u, bad_v)],
+        edge_mask=mask,
+    )
+
+def greedy_clique_size(G: CSRGraph, seeds: int = 16) -> int:
+    """Size of a clique grown greedily from the highest-degree vertices (a lower bound on the chromatic number)"""
+    if G.n == 0:
+        return 0
+    degrees = G.degrees
+    best = 1
+    for s in np.argsort(-degrees, kind='stable')[:seeds].tolist():
+        candidates = set(G.neighbors(s)) - {s}
+        size = 1
+        while candidates:
+            v = max(candidates, key=lambda x: (degrees[x], -x))
+            size += 1
+            candidates &= set(G.neighbors(v))
+            candidates.discard(v)
+        best = max(best, size)
+    return best
+
+def get_available_datasets(datasets_dir: Optional[Union[str, Path]] = None) -> list:
+    """Get list of available dataset files (``./datasets`` if present, else the bundled ones)"""
+    if datasets_dir is None:
+        datasets_dir = Path("datasets") if Path("datasets").exists() else DATASETS_DIR
+    datasets_dir = Path(datasets_dir)
     if not datasets_dir.exists():
         return []
-    return [f for f in datasets_dir.glob("*") if f.is_file() and f.suffix in ['.col', '.edgelist']]
\ No newline at end of file
+    return [f for f in datasets_dir.glob("*") if f.is_file() and is_graph_file(f)]
\ No newline at end of file
@@ -0,0 +1,32 @@
+# log_config.py
+import logging
+import os
+import sys
+from typing import Optional, TextIO, Union
+
+# Environment variable read when no level is passed (DEBUG shows every generation)
+LOG_LEVEL_ENV = "GRAPH_COLORING_LOG_LEVEL"
+DEFAULT_LOG_LEVEL = "INFO"
+
+def configure_logging(level: Optional[Union[int, str]] = None,
+                      stream: Optional[TextIO] = None) -> int:
+    """Send log records to the terminal as plain lines; returns the level in effect
+
+    ``level`` defaults to $GRAPH_COLORING_LOG_LEVEL, else INFO; ``stream``
+    to stdout. Safe to call more than once (the level is updated, no handler
+    is added twice).
+    """
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, DEFAULT_LOG_LEVEL)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.getLevelName(DEFAULT_LOG_LEVEL)
+    root = logging.getLogger()
+    if not any(getattr(h, '_graph_coloring', False) for h in root.handlers):
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler._graph_coloring = True
+        root.addHandler(handler)
+    root.setLevel(level)
+    return level
@@ -0,0 +1,289 @@
+# profiling.py
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# JSON-lines file that every process of a run appends its phase events to
+TRACE_ENV = "GRAPH_COLORING_TRACE"
+# Directory where each process writes <role>-<pid>.prof (cProfile stats)
+PROFILE_ENV = "GRAPH_COLORING_PROFILE"
+# Stack depth for tracemalloc in solver runs (unset or 0: RSS figures only)
+TRACEMALLOC_ENV = "GRAPH_COLORING_TRACEMALLOC"
+
+_MB = 1 << 20
+# A high-water snapshot is taken when traced memory grows by this factor
+SNAPSHOT_GROWTH = 1.25
+# Allocation sites kept from the high-water snapshot
+TOP_ALLOCATIONS = 10
+
+Sink = Callable[[Dict[str, Any]], None]
+
+_sinks: List[Sink] = []
+_NO_PHASE = contextlib.nullcontext()
+_local = threading.local()
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / _MB if sys.platform == 'darwin' else peak / 1024  # bytes vs KiB
+
+def _peak_stack() -> List[int]:
+    """Per-thread tracemalloc peaks of the open phases, innermost last"""
+    stack = getattr(_local, 'peaks', None)
+    if stack is None:
+        stack = _local.peaks = []
+    return stack
+
+class MemorySink:
+    """Keeps the events in a list (``events``)"""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]):
+        with self._lock:
+            self.events.append(event)
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds spent per phase name"""
+        totals: Dict[str, float] = {}
+        for event in self.events:
+            totals[event['phase']] = totals.get(event['phase'], 0.0) + event['duration']
+        return totals
+
+class PhaseSummary:
+    """Aggregates events per phase name instead of keeping them
+
+    ``phases[name]`` holds the count, total seconds, the largest RSS
+    high-water mark at the end of the phase, how far the phases raised that
+    mark, and (with tracemalloc on) the largest Python heap peak and peak
+    growth above the heap at the start of the phase. With
+    ``snapshots`` a tracemalloc snapshot is taken at the end of a phase
+    whenever traced memory grew by SNAPSHOT_GROWTH; ``top_allocations``
+    lists the biggest allocation sites of the largest one.
+    """
+
+    def __init__(self, snapshots: bool = True):
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.snapshots = snapshots
+        self._snapshot = None
+        self._snapshot_size = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]):
+        with self._lock:
+            totals = self.phases.setdefault(event['phase'], {'count': 0, 'time': 0.0})
+            totals['count'] += 1
+            totals['time'] += event['duration']
+            for key in ('rss_peak_mb', 'py_peak_mb', 'py_growth_mb'):
+                if event.get(key) is not None:
+                    totals[key] = max(totals.get(key, 0.0), event[key])
+            if event.get('rss_growth_mb') is not None:
+                totals['rss_growth_mb'] = totals.get('rss_growth_mb', 0.0) + event['rss_growth_mb']
+            if self.snapshots and tracemalloc.is_tracing():
+                current = tracemalloc.get_traced_memory()[0]
+                if current > self._snapshot_size * SNAPSHOT_GROWTH:
+                    self._snapshot = tracemalloc.take_snapshot()
+                    self._snapshot_size = current
+
+    def top_allocations(self, limit: int = TOP_ALLOCATIONS) -> List[Dict[str, Any]]:
+        """[{'where': 'file.py:line', 'size_mb', 'blocks'}] at the traced high-water mark"""
+        if self._snapshot is None:
+            return []
+        snapshot = self._snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        return [{'where': f"{Path(stat.traceback[0].filename).name}:{stat.traceback[0].lineno}",
+                 'size_mb': stat.size / _MB, 'blocks': stat.count}
+                for stat in snapshot.statistics('lineno')[:limit]]
+
+    def report(self) -> Dict[str, Any]:
+        """JSON-ready summary; the 'run' phase (see record_run) gives the totals"""
+        run = self.phases.get('run', {})
+        return {
+            'peak_rss_mb': run.get('rss_peak_mb', peak_rss_mb()),
+            'python_peak_mb': run.get('py_peak_mb'),
+            'phases': {name: dict(totals) for name, totals in self.phases.items() if name != 'run'},
+            'top_allocations': self.top_allocations(),
+        }
+
+class JsonLinesSink:
+    """Appends one JSON object per event to a file (safe to share between processes)"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+
+    def __call__(self, event: Dict[str, Any]):
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        self._file.close()
+
+def add_sink(sink: Sink) -> Sink:
+    if sink not in _sinks:
+        _sinks.append(sink)
+    return sink
+
+def remove_sink(sink: Sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+def tracing() -> bool:
+    """True while at least one sink is installed"""
+    return bool(_sinks)
+
+class _Phase:
+    __slots__ = ('name', 'fields', 'sinks', '_start', '_wall', '_rss', '_traced')
+
+    def __init__(self, name: str, fields: Dict[str, Any], sinks: Optional[List[Sink]] = None):
+        self.name = name
+        self.fields = fields
+        self.sinks = sinks  # None: the installed sinks
+
+    def __enter__(self):
+        self._rss = peak_rss_mb()
+        self._traced = None
+        if tracemalloc.is_tracing():
+            # tracemalloc has one global peak: fold it into the enclosing
+            # phase, then restart it so this phase measures its own
+            current, peak = tracemalloc.get_traced_memory()
+            stack = _peak_stack()
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+            tracemalloc.reset_peak()
+            stack.append(current)
+            self._traced = current
+        self._wall = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        event = {'phase': self.name, 'start': self._wall, 'duration': duration,
+                 'pid': os.getpid(), **self.fields}
+        if self._rss is not None:
+            rss = peak_rss_mb()
+            event['rss_peak_mb'] = rss
+            event['rss_growth_mb'] = rss - self._rss
+        if self._traced is not None:
+            stack = _peak_stack()
+            own = stack.pop()
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                own = max(own, peak)
+                event['py_peak_mb'] = own / _MB
+                event['py_growth_mb'] = (own - self._traced) / _MB
+                event['py_delta_mb'] = (current - self._traced) / _MB
+            if stack:
+                stack[-1] = max(stack[-1], own)
+        if exc_type is not None:
+            event['error'] = exc_type.__name__
+        for sink in list(_sinks if self.sinks is None else self.sinks):
+            sink(event)
+        return False
+
+def phase(name: str, **fields):
+    """Context manager timing one named phase; extra fields go into its event
+
+    Events look like ``{'phase': 'search', 'start': epoch seconds,
+    'duration': seconds, 'pid': ..., 'k': 3}``. Without a sink this returns
+    a shared no-op context, so instrumented code costs one call when off.
+
+    Memory fields: ``rss_peak_mb`` is the process's RSS high-water mark when
+    the phase ends and ``rss_growth_mb`` how much the phase raised it. While
+    tracemalloc is tracing, ``py_peak_mb`` is the largest traced Python heap
+    during the phase (nested phases included), ``py_growth_mb`` how far that
+    peak rose above the heap at the start, and ``py_delta_mb`` what the
+    phase left allocated. Phases running on several threads at once share
+    tracemalloc's single peak, so their Python figures are approximate.
+    """
+    if not _sinks:
+        return _NO_PHASE
+    return _Phase(name, fields)
+
+@contextlib.contextmanager
+def profiled(role: str, directory: Optional[Union[str, Path]] = None):
+    """Run the block under cProfile, writing ``<directory>/<role>-<pid>.prof``
+
+    ``directory`` defaults to $GRAPH_COLORING_PROFILE; with neither the
+    block runs unprofiled. Read the output with ``python -m pstats``.
+    """
+    directory = directory or os.environ.get(PROFILE_ENV)
+    if not directory:
+        yield None
+        return
+    import cProfile
+
+    path = Path(directory) / f"{role}-{os.getpid()}.prof"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+@contextlib.contextmanager
+def record_run(tracemalloc_frames: Optional[int] = None, **fields):
+    """Collect the time and memory per phase of one run into a PhaseSummary
+
+    The block itself is timed as phase 'run'. Per-phase figures are only
+    collected while tracing (some sink is installed) or tracemalloc is on;
+    otherwise phases stay no-ops and the summary holds just the run. With ``tracemalloc_frames``
+    (default $GRAPH_COLORING_TRACEMALLOC) tracemalloc traces the block with
+    that stack depth; it slows Python-heavy code down severalfold and its
+    snapshots add to the RSS, so leave it off when the times or RSS figures
+    matter. Use ``summary.report()`` afterwards.
+    """
+    if tracemalloc_frames is None:
+        tracemalloc_frames = int(os.environ.get(TRACEMALLOC_ENV) or 0)
+    started = tracemalloc_frames > 0 and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(tracemalloc_frames)
+    summary = PhaseSummary()
+    detailed = tracing() or tracemalloc.is_tracing()
+    if detailed:
+        add_sink(summary)
+    try:
+        with _Phase('run', fields, sinks=None if detailed else [summary]):
+            yield summary
+    finally:
+        if detailed:
+            remove_sink(summary)
+        if started:
+            tracemalloc.stop()  # the summary's snapshot stays readable
+
+def configure_tracing(path: Optional[Union[str, Path]] = None) -> Optional[JsonLinesSink]:
+    """Install a JsonLinesSink for ``path`` (default $GRAPH_COLORING_TRACE)
+
+    Spawned worker processes call this too and, through the environment,
+    append to the same file. Returns the sink, or None when tracing is off.
+    """
+    path = path or os.environ.get(TRACE_ENV)
+    if not path:
+        return None
+    for sink in _sinks:
+        if isinstance(sink, JsonLinesSink) and sink.path == Path(path):
+            return sink
+    return add_sink(JsonLinesSink(path))
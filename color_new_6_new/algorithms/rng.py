@@ -0,0 +1,19 @@
+# rng.py
+from typing import List, Optional, Union
+import numpy as np
+
+SeedLike = Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+
+def make_rng(seed: SeedLike = None) -> np.random.Generator:
+    """Create a private random generator for one run (reuses a Generator if given)"""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+def spawn_rngs(seed: SeedLike, n: int) -> List[np.random.Generator]:
+    """Create n statistically independent generators for parallel workers"""
+    if isinstance(seed, np.random.Generator):
+        return list(seed.spawn(n))
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(n)]
@@ -0,0 +1,258 @@
+# solution_cache.py
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+import numpy as np
+from .cancellation import CancelToken, is_cancelled
+from .graph_cache import DEFAULT_CACHE_DIR
+from .graph_utils import GraphLike, as_csr, calculate_conflicts, greedy_clique_size
+
+DEFAULT_DB_PATH = DEFAULT_CACHE_DIR.parent / "solutions.sqlite"
+DEFAULT_MAX_ROWS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    labeled_hash TEXT NOT NULL,
+    canonical_hash TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    params TEXT NOT NULL,
+    k INTEGER,
+    coloring TEXT NOT NULL,
+    time REAL NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    canonical_coloring TEXT,
+    PRIMARY KEY (labeled_hash, algorithm, params)
+);
+CREATE INDEX IF NOT EXISTS solutions_lru ON solutions (last_used);
+CREATE INDEX IF NOT EXISTS solutions_canonical ON solutions (canonical_hash, algorithm, params);
+CREATE TABLE IF NOT EXISTS chromatic_bounds (
+    labeled_hash TEXT PRIMARY KEY,
+    lower INTEGER NOT NULL,
+    upper INTEGER,
+    proven INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Algorithms whose result depends on the RNG; only cached for an explicit seed
+STOCHASTIC_ALGORITHMS = frozenset({'cultural'})
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def _wl_labels(G: GraphLike, iterations: int = 4) -> np.ndarray:
+    """Per-vertex Weisfeiler-Lehman labels after ``iterations`` refinement rounds"""
+    csr = as_csr(G)
+    offsets = csr.offsets
+    label = _splitmix64(csr.degrees.astype(np.uint64))
+    with np.errstate(over='ignore'):
+        for _ in range(iterations):
+            mixed = _splitmix64(label)[csr.neighbors_array]
+            prefix = np.concatenate((np.zeros(1, dtype=np.uint64), np.cumsum(mixed, dtype=np.uint64)))
+            neighbourhood = prefix[offsets[1:]] - prefix[offsets[:-1]]
+            label = _splitmix64(label * np.uint64(0x100000001B3) + neighbourhood)
+    return label
+
+def canonical_hash(G: GraphLike, iterations: int = 4) -> str:
+    """Weisfeiler-Lehman style fingerprint, identical for isomorphic graphs.
+
+    Not collision-free (all regular graphs of one size and degree share a
+    hash), so it is only a lookup hint and never proves anything. Neighbour
+    labels are combined by a wrapping sum of mixed 64-bit values, so each
+    refinement round is a few vectorised passes over the CSR arrays.
+    """
+    csr = as_csr(G)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{csr.n}:{csr.number_of_edges()}".encode())
+    h.update(np.sort(_wl_labels(csr, iterations)).tobytes())
+    return h.hexdigest()
+
+def canonical_order(G: GraphLike) -> np.ndarray:
+    """Vertex indices sorted by WL label; ties keep their index order.
+
+    Isomorphic graphs whose WL labels are all distinct get corresponding
+    vertices at the same positions, so a coloring listed in this order can be
+    carried over to a relabelled copy (and must be checked there).
+    """
+    return np.argsort(_wl_labels(G), kind='stable')
+
+def labeled_hash(G: GraphLike) -> str:
+    """Exact fingerprint of the labelled graph (colorings are only valid for this)"""
+    csr = as_csr(G)
+    u, v = csr.edge_arrays()
+    h = hashlib.blake2b(digest_size=20)
+    h.update(json.dumps(list(csr.labels)).encode())
+    h.update(np.asarray(u, dtype=np.int64).tobytes())
+    h.update(np.asarray(v, dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+class CachedSolution(NamedTuple):
+    k: Optional[int]
+    coloring: Dict[Any, int]
+    time: float
+    algorithm: str
+    proven_optimal: bool
+
+class SolutionCache:
+    """SQLite store of colorings keyed by graph fingerprint, algorithm and parameters.
+
+    Colorings and chromatic bounds are kept per labelled hash, and a coloring
+    found by any algorithm is returned for every algorithm once it is proven
+    optimal. Each coloring is also listed in canonical (WL label) order, so a
+    relabelled copy of a cached graph - same canonical hash - reuses it after
+    mapping vertices by position; the mapped coloring is validated before it
+    is returned. Failed runs (``k is None``) are never stored. A fresh
+    connection is opened per call, so the cache is safe to use from worker
+    threads; rows beyond ``max_rows`` are evicted least recently used first.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, max_rows: int = DEFAULT_MAX_ROWS):
+        self.db_path = Path(db_path) if db_path is not None else DEFAULT_DB_PATH
+        self.max_rows = max_rows
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.executescript(_SCHEMA)
+            columns = {row[1] for row in db.execute("PRAGMA table_info(solutions)")}
+            if "canonical_coloring" not in columns:  # database from before the fallback
+                db.execute("ALTER TABLE solutions ADD COLUMN canonical_coloring TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def _params_key(params: dict) -> str:
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def fingerprints(self, G: GraphLike) -> Tuple[str, str]:
+        csr = as_csr(G)
+        return labeled_hash(csr), canonical_hash(csr)
+
+    def bounds(self, labeled: str) -> Tuple[int, Optional[int], bool]:
+        with closing(self._connect()) as db:
+            row = db.execute("SELECT lower, upper, proven FROM chromatic_bounds WHERE labeled_hash = ?",
+                             (labeled,)).fetchone()
+        return (row[0], row[1], bool(row[2])) if row else (0, None, False)
+
+    def lookup(self, G: GraphLike, algorithm: str, params: dict,
+               keys: Optional[Tuple[str, str]] = None) -> Optional[CachedSolution]:
+        """Exact (graph, algorithm, params) hit, else any proven-optimal coloring of this
+        graph, else the same run on a relabelled copy (same canonical hash)"""
+        labeled, canonical = keys or self.fingerprints(G)
+        _, upper, proven = self.bounds(labeled)
+        params_key = self._params_key(params)
+        with closing(self._connect()) as db, db:
+            row = db.execute(
+                "SELECT k, coloring, time, algorithm, rowid FROM solutions "
+                "WHERE labeled_hash = ? AND algorithm = ? AND params = ? AND k IS NOT NULL",
+                (labeled, algorithm, params_key)).fetchone()
+            if row is None and proven:
+                row = db.execute(
+                    "SELECT k, coloring, time, algorithm, rowid FROM solutions "
+                    "WHERE labeled_hash = ? AND k = ? ORDER BY time LIMIT 1",
+                    (labeled, upper)).fetchone()
+            if row is not None:
+                db.execute("UPDATE solutions SET last_used = ? WHERE rowid = ?", (time.time(), row[4]))
+        if row is None:
+            return self._lookup_relabelled(G, canonical, labeled, algorithm, params_key, upper, proven)
+        coloring = {label: color for label, color in json.loads(row[1])}
+        if calculate_conflicts(G, coloring) != 0:
+            return None  # stale or corrupt entry
+        return CachedSolution(row[0], coloring, row[2], row[3], proven and row[0] == upper)
+
+    def _lookup_relabelled(self, G: GraphLike, canonical: str, labeled: str, algorithm: str,
+                           params_key: str, upper: Optional[int], proven: bool
+                           ) -> Optional[CachedSolution]:
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT k, canonical_coloring, time, algorithm, rowid FROM solutions "
+                "WHERE canonical_hash = ? AND algorithm = ? AND params = ? AND labeled_hash != ? "
+                "AND canonical_coloring IS NOT NULL ORDER BY k", (canonical, algorithm, params_key, labeled)
+            ).fetchall()
+        if not rows:
+            return None
+        csr = as_csr(G)
+        labels = csr.labels
+        order = canonical_order(csr)
+        for k, colors, elapsed, algo, rowid in rows:
+            coloring = {labels[i]: color for i, color in zip(order.tolist(), json.loads(colors))}
+            if calculate_conflicts(csr, coloring) == 0:  # WL ties or a hash collision fail here
+                with closing(self._connect()) as db, db:
+                    db.execute("UPDATE solutions SET last_used = ? WHERE rowid = ?", (time.time(), rowid))
+                return CachedSolution(k, coloring, elapsed, algo, proven and k == upper)
+        return None
+
+    def store(self, G: GraphLike, algorithm: str, params: dict, k: Optional[int],
+              coloring: Dict[Any, int], elapsed: float, lower_bound: int = 0,
+              keys: Optional[Tuple[str, str]] = None):
+        """Record a successful run and tighten the chromatic bounds of the graph"""
+        if k is None:
+            return  # a failed or time-limited run says nothing worth replaying
+        labeled, canonical = keys or self.fingerprints(G)
+        csr = as_csr(G)
+        canonical_colors = [int(coloring[csr.labels[i]]) for i in canonical_order(csr).tolist()]
+        now = time.time()
+        lower, upper, _ = self.bounds(labeled)
+        lower = max(lower, lower_bound)
+        upper = k if upper is None else min(upper, k)
+        proven = upper is not None and upper <= lower
+        with closing(self._connect()) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO solutions (labeled_hash, canonical_hash, algorithm, params, k, "
+                "coloring, time, created, last_used, canonical_coloring) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (labeled, canonical, algorithm, self._params_key(params), k,
+                 json.dumps([[label, int(color)] for label, color in coloring.items()]),
+                 elapsed, now, now, json.dumps(canonical_colors)))
+            db.execute("INSERT OR REPLACE INTO chromatic_bounds VALUES (?, ?, ?, ?)",
+                       (labeled, lower, upper, int(proven)))
+            db.execute(
+                "DELETE FROM solutions WHERE rowid IN (SELECT rowid FROM solutions "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_rows,))
+
+    def clear(self):
+        with closing(self._connect()) as db, db:
+            db.execute("DELETE FROM solutions")
+            db.execute("DELETE FROM chromatic_bounds")
+
+def cached_solve(cache: Optional[SolutionCache], G: GraphLike, algorithm: str, params: dict,
+                 run: Callable[[], Tuple[Optional[int], Dict[Any, int], float]],
+                 cancel_token: Optional[CancelToken] = None
+                 ) -> Tuple[Optional[int], Dict[Any, int], float, bool]:
+    """Return ``run()``'s (k, coloring, time) from the cache when possible.
+
+    The fourth value tells whether the result came from the cache. Without a
+    cache this is just ``run()``. A run stopped through ``cancel_token``, or
+    one that found no coloring, is returned but not stored; a stochastic
+    algorithm without an explicit seed bypasses the cache entirely.
+    """
+    if cache is None or (algorithm in STOCHASTIC_ALGORITHMS and params.get('seed') is None):
+        return (*run(), False)
+    csr = as_csr(G)
+    keys = cache.fingerprints(csr)
+    hit = cache.lookup(csr, algorithm, params, keys=keys)
+    if hit is not None:
+        return hit.k, hit.coloring, hit.time, True
+    k, coloring, elapsed = run()
+    if k is None or is_cancelled(cancel_token):
+        return k, coloring, elapsed, False
+    lower = greedy_clique_size(csr)
+    if algorithm == 'backtracking' and params.get('time_limit') is None and k is not None:
+        lower = max(lower, k)  # every smaller k was refuted exhaustively
+    cache.store(csr, algorithm, params, k, coloring, elapsed, lower_bound=lower, keys=keys)
+    return k, coloring, elapsed, False
+
+_default_cache = None
+
+def default_solution_cache() -> SolutionCache:
+    """Process-wide solution cache next to the graph cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SolutionCache()
+    return _default_cache
@@ -0,0 +1,108 @@
+# trials.py
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from .cancellation import CancelToken, is_cancelled
+from .graph_utils import CSRGraph, GraphLike, as_csr
+from .rng import SeedLike, spawn_rngs
+from .solution_cache import STOCHASTIC_ALGORITHMS
+from .worker import SOLVERS
+
+# Per-process state set up once by the pool initializer
+_graphs: Dict[str, CSRGraph] = {}
+_stop_event = None
+
+def _init_worker(graphs: Dict[str, tuple], stop_event):
+    """Pool initializer: rebuild every graph once per worker process"""
+    global _graphs, _stop_event
+    _graphs = {name: CSRGraph(*arrays) for name, arrays in graphs.items()}
+    _stop_event = stop_event
+
+def _run_trial(dataset: str, algorithm: str, params: dict, run: int,
+               rng: np.random.Generator) -> dict:
+    """One solver run inside a pool worker"""
+    G = _graphs[dataset]
+    start = time.time()
+    k, _, _ = SOLVERS[algorithm](G, dict(params, seed=rng), None, None, _stop_event)
+    return {
+        'dataset': dataset,
+        'algorithm': algorithm,
+        'run': run,
+        'k': k,
+        'success': k is not None,
+        'time': time.time() - start,
+        'stopped': k is None and _stop_event.is_set(),
+    }
+
+def run_trials(graphs: Dict[str, GraphLike], algorithms: Dict[str, dict], runs: int,
+               seed: SeedLike = None, workers: Optional[int] = None,
+               on_result: Optional[Callable[[dict, int, int], None]] = None,
+               cancel_token: Optional[CancelToken] = None) -> List[dict]:
+    """Run every algorithm ``runs`` times on every graph in a process pool
+
+    ``algorithms`` maps a SOLVERS name to its parameters. Each (graph,
+    algorithm) pair gets its own child of ``seed``, split into one generator
+    per run, so no two runs share a stream and a comparison is reproducible
+    no matter how the runs are scheduled. Deterministic algorithms (not in
+    STOCHASTIC_ALGORITHMS) run once per graph, as repeats would only
+    reproduce the same result.
+    ``on_result(trial, done, total)`` is called in this process as runs
+    finish. Setting ``cancel_token`` stops the running solvers and drops the
+    queued ones; the trials finished so far are returned.
+    """
+    csr = {name: as_csr(G) for name, G in graphs.items()}
+    arrays = {name: (G.offsets, G.neighbors_array, G.labels) for name, G in csr.items()}
+    pairs = [(dataset, algorithm) for dataset in csr for algorithm in algorithms]
+    tasks = []
+    for (dataset, algorithm), pair_rng in zip(pairs, spawn_rngs(seed, len(pairs))):
+        repeats = runs if algorithm in STOCHASTIC_ALGORITHMS else 1
+        for run, rng in enumerate(spawn_rngs(pair_rng, repeats)):
+            tasks.append((dataset, algorithm, algorithms[algorithm], run, rng))
+    workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+
+    ctx = mp.get_context('spawn')  # workers never inherit Tk or the GUI's threads
+    stop_event = ctx.Event()
+    trials = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(arrays, stop_event)) as pool:
+        pending = {pool.submit(_run_trial, *task) for task in tasks}
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                trial = future.result()
+                if trial['stopped']:
+                    continue  # cut short by cancel_token, not a sample of the algorithm
+                trials.append(trial)
+                if on_result is not None:
+                    on_result(trials[-1], len(trials), len(tasks))
+            if is_cancelled(cancel_token) and not stop_event.is_set():
+                stop_event.set()
+                for future in pending:
+                    future.cancel()
+    return trials
+
+def summarize_trials(trials: List[dict]) -> Dict[Tuple[str, str], dict]:
+    """Per (dataset, algorithm) statistics over the finished runs"""
+    groups: Dict[Tuple[str, str], List[dict]] = {}
+    for trial in trials:
+        groups.setdefault((trial['dataset'], trial['algorithm']), []).append(trial)
+    summary = {}
+    for key, group in groups.items():
+        times = np.array([t['time'] for t in group])
+        colors = [t['k'] for t in group if t['success']]
+        summary[key] = {
+            'runs': len(group),
+            'success_rate': len(colors) / len(group),
+            'time_mean': float(times.mean()),
+            'time_median': float(np.median(times)),
+            'time_std': float(times.std(ddof=1)) if len(times) > 1 else 0.0,
+            'times': times.tolist(),
+            'colors': colors,
+            'colors_median': float(np.median(colors)) if colors else None,
+        }
+    return summary
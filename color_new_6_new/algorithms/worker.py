@@ -0,0 +1,168 @@
+# worker.py
+import logging
+import multiprocessing as mp
+import queue
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+import numpy as np
+from .backtracking import try_min_colors
+from .cultural import find_chromatic_number
+from .graph_store import open_csr
+from .graph_utils import CSRGraph, GraphLike, as_csr
+from .log_config import configure_logging
+from .profiling import configure_tracing, phase, profiled, record_run
+from .solution_cache import SolutionCache, cached_solve
+
+# Minimum seconds between two coloring snapshots sent to the parent
+SNAPSHOT_INTERVAL = 0.1
+# Events handed back by one SolverProcess.poll() call
+MAX_EVENTS_PER_POLL = 500
+
+def _dense_coloring(coloring, n: int) -> np.ndarray:
+    """Coloring list, or partial {vertex index: color} dict, as an int32 array (-1 = uncolored)"""
+    if isinstance(coloring, dict):
+        dense = np.full(n, -1, dtype=np.int32)
+        if coloring:
+            index = np.fromiter(coloring.keys(), dtype=np.int64, count=len(coloring))
+            dense[index] = np.fromiter(coloring.values(), dtype=np.int32, count=len(coloring))
+        return dense
+    return np.asarray(coloring, dtype=np.int32)
+
+def _run_backtracking(G: CSRGraph, params: dict, progress, snapshot, cancel_token):
+    return try_min_colors(G, max_try=params['max_colors'], use_mrv=params['use_mrv'],
+                          time_limit=params['time_limit'], snapshot_callback=snapshot,
+                          cancel_token=cancel_token)
+
+def _run_cultural(G: CSRGraph, params: dict, progress, snapshot, cancel_token):
+    return find_chromatic_number(G, pop_size=params['population_size'],
+                                 max_gen=params['max_generations'],
+                                 mutation_rate=params['mutation_rate'], max_k=params['max_k'],
+                                 progress_callback=progress, seed=params['seed'],
+                                 snapshot_callback=snapshot, cancel_token=cancel_token)
+
+SOLVERS = {
+    'backtracking': _run_backtracking,
+    'cultural': _run_cultural,
+}
+
+def _solve(algorithm: str, graph: Union[str, Tuple[np.ndarray, np.ndarray, Any]], params: dict,
+           cache_path: Optional[str], events, stop_event, log_level: int = logging.INFO):
+    """Worker process entry point; everything it reports goes through ``events``"""
+    configure_logging(log_level)  # a spawned child starts with bare logging
+    configure_tracing()  # $GRAPH_COLORING_TRACE is inherited through the environment
+    try:
+        with profiled('solver'), record_run(algorithm=algorithm) as memory:
+            k, coloring, elapsed, from_cache = _run(algorithm, graph, params, cache_path,
+                                                    events, stop_event)
+        # A run that finished anyway (or came from the cache) is a normal result
+        stopped = stop_event.is_set() and k is None and not from_cache
+        events.put(('result', k, coloring, elapsed, from_cache, stopped, memory.report()))
+    except Exception as e:
+        events.put(('error', f"{type(e).__name__}: {e}"))
+
+def _run(algorithm: str, graph: Union[str, Tuple[np.ndarray, np.ndarray, Any]], params: dict,
+         cache_path: Optional[str], events, stop_event):
+    """Rebuild (or map) the graph and solve it through the cache, streaming progress"""
+    with phase('preprocess', algorithm=algorithm):
+        G = open_csr(graph) if isinstance(graph, str) else CSRGraph(*graph)
+    cache = SolutionCache(cache_path) if cache_path is not None else None
+    last_snapshot = 0.0
+
+    def progress(gen, conflicts, colors_used):
+        events.put(('progress', gen, conflicts, colors_used))
+
+    def snapshot(labels, coloring):
+        nonlocal last_snapshot
+        now = time.monotonic()
+        if now - last_snapshot >= SNAPSHOT_INTERVAL:
+            last_snapshot = now
+            events.put(('snapshot', _dense_coloring(coloring, G.n)))
+
+    run = SOLVERS[algorithm]
+    return cached_solve(cache, G, algorithm, params,
+                        lambda: run(G, params, progress, snapshot, stop_event),
+                        cancel_token=stop_event)
+
+class SolverProcess:
+    """One solver run in a separate process
+
+    The graph is sent once as CSR arrays; a graph mapped from a graph_store
+    directory is passed as that path and the worker maps it too. Progress, throttled coloring
+    snapshots and the final result come back as event tuples:
+
+    - ``('progress', generation, conflicts, colors_used)``
+    - ``('snapshot', colors)``: int32 array in ``labels`` order, -1 = uncolored
+    - ``('result', k, coloring, time, from_cache, stopped, memory)``: ``memory``
+      is the run's PhaseSummary report (peak RSS and time/memory per phase;
+      Python heap figures when $GRAPH_COLORING_TRACEMALLOC is set)
+    - ``('error', message)``
+
+    ``poll()`` never blocks, so a GUI can call it from a timer. ``stop()``
+    asks the solver to finish early; its result then has ``stopped`` set, k
+    None and the best partial coloring. ``cancel()`` terminates the worker.
+    """
+
+    def __init__(self, algorithm: str, G: GraphLike, params: dict,
+                 cache: Optional[Union[SolutionCache, str, Path]] = None):
+        if algorithm not in SOLVERS:
+            raise ValueError(f"unknown algorithm: {algorithm}")
+        csr = as_csr(G)
+        self.labels = csr.labels
+        if csr.store is not None and Path(csr.store).is_dir():
+            graph = csr.store
+        else:
+            graph = (csr.offsets, csr.neighbors_array, csr.labels)
+        self.finished = False
+        cache_path = getattr(cache, 'db_path', cache)
+        # spawn: the child never inherits Tk or the GUI's threads
+        ctx = mp.get_context('spawn')
+        self._events = ctx.Queue()
+        self._stop_event = ctx.Event()
+        self._process = ctx.Process(
+            target=_solve,
+            args=(algorithm, graph, params,
+                  str(cache_path) if cache_path is not None else None, self._events,
+                  self._stop_event, logging.getLogger().getEffectiveLevel()),
+            daemon=True)
+        self._process.start()
+
+    @property
+    def running(self) -> bool:
+        return not self.finished and self._process.is_alive()
+
+    def poll(self, max_events: int = MAX_EVENTS_PER_POLL) -> List[tuple]:
+        """Events received since the last call (at most ``max_events``)"""
+        events = []
+        while len(events) < max_events:
+            try:
+                # A worker that already exited may still have events in the pipe
+                event = self._events.get(timeout=0.1) if not self._process.is_alive() \
+                    else self._events.get_nowait()
+            except queue.Empty:
+                break
+            events.append(event)
+            if event[0] in ('result', 'error'):
+                self.finished = True
+                break
+        if not events and not self.finished and not self._process.is_alive():
+            # Died without reporting (killed, crashed interpreter, ...)
+            self.finished = True
+            events.append(('error', f"solver process exited with code {self._process.exitcode}"))
+        return events
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop_event.is_set()
+
+    def stop(self):
+        """Ask the solver to stop; it still reports a (partial) result"""
+        self._stop_event.set()
+
+    def cancel(self):
+        """Stop the worker now; no further events are delivered"""
+        self.finished = True
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join(timeout=1)
+        self._events.cancel_join_thread()
@@ -0,0 +1,299 @@
+# benchmark.py
+"""Benchmark the solvers over a dataset directory and compare with a baseline
+
+    python benchmark.py datasets --repeat 5 --out results.json
+    python benchmark.py datasets --baseline baseline.json --tolerance 0.2
+    python benchmark.py datasets --max-nodes 500 --known-chromatic
+
+Every run happens in a fresh (spawned) process, so caches and memory from
+one run never leak into the next, and a run that exceeds --timeout is killed
+and recorded as a timeout. A run records the solve time (perf_counter),
+the k found, the search nodes (backtracking) or generations (cultural),
+the process's peak RSS and, with --trace or --tracemalloc, the time and
+memory per phase (load, preprocess, search, ...); untraced runs skip the
+per-phase bookkeeping. Cultural runs use the repetition number as seed.
+
+--trace, --profile and --tracemalloc are passed to the runs through the
+environment: every run appends its phase timings to the --trace JSON-lines
+file, writes its cProfile stats to the --profile directory, and with
+--tracemalloc also records Python heap peaks per phase and its biggest
+allocation sites (the times are then inflated; compare them only with
+runs measured the same way).
+
+With --baseline, the medians are compared per dataset and algorithm. A run
+set is flagged when it is slower than the baseline by more than --tolerance
+(and --min-seconds), finds a larger k, times out more often, or needs more
+peak RSS by more than --tolerance (and --min-mb). The exit status is then 1.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from algorithms.profiling import (PROFILE_ENV, TRACE_ENV, TRACEMALLOC_ENV, configure_tracing,
+                                  peak_rss_mb, phase, profiled, record_run)
+
+ALGORITHMS = ('backtracking', 'cultural')
+# Same parameters as the GUI's defaults
+DEFAULT_PARAMS = {
+    'backtracking': {'max_colors': 10, 'time_limit': 30.0, 'use_mrv': True},
+    'cultural': {'population_size': 50, 'max_generations': 10, 'mutation_rate': 0.1, 'max_k': 10},
+}
+DEFAULT_TIMEOUT = 300.0
+DEFAULT_TOLERANCE = 0.2
+# Differences below this many seconds are noise, whatever the ratio
+DEFAULT_MIN_SECONDS = 0.05
+# Peak RSS differences below this many MiB are noise
+DEFAULT_MIN_MB = 10.0
+
+def _run_once(path: str, algorithm: str, params: dict, seed: int, conn):
+    """Child process: load the graph, solve once, send the measurements"""
+    configure_tracing()  # $GRAPH_COLORING_TRACE, set by --trace
+    with profiled(f"{Path(path).stem}-{algorithm}"), record_run(algorithm=algorithm) as memory:
+        result = _measure(path, algorithm, params, seed)
+    if result['status'] == 'ok':
+        result['memory'] = memory.report()
+    # Sent after the profile is written: the parent may terminate us right away
+    conn.send(result)
+    conn.close()
+
+def _measure(path: str, algorithm: str, params: dict, seed: int) -> dict:
+    try:
+        from algorithms.graph_utils import load_csr
+
+        start = time.perf_counter()
+        with phase('load', path=path):
+            G = load_csr(path)
+        load_time = time.perf_counter() - start
+        stats = {}
+        if algorithm == 'backtracking':
+            from algorithms.backtracking import try_min_colors
+            start = time.perf_counter()
+            k, _, _ = try_min_colors(G, max_try=params['max_colors'], use_mrv=params['use_mrv'],
+                                     time_limit=params['time_limit'], stats=stats)
+        else:
+            from algorithms.cultural import find_chromatic_number
+            start = time.perf_counter()
+            k, _, _ = find_chromatic_number(G, pop_size=params['population_size'],
+                                            max_gen=params['max_generations'],
+                                            mutation_rate=params['mutation_rate'],
+                                            max_k=params['max_k'], seed=seed, stats=stats)
+        return {
+            'status': 'ok',
+            'time': time.perf_counter() - start,
+            'load_time': load_time,
+            'k': k,
+            'search_nodes': stats.get('search_nodes'),
+            'generations': stats.get('generations'),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+    except Exception as e:
+        return {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+
+def run_isolated(path: Path, algorithm: str, params: dict, seed: int = 0,
+                 timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """One measured run in its own process; killed after ``timeout`` seconds"""
+    ctx = mp.get_context('spawn')
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_run_once, args=(str(path), algorithm, params, seed, sender),
+                          daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if receiver.poll(timeout):
+            result = receiver.recv()
+        else:
+            result = {'status': 'timeout'}
+    except EOFError:  # the child died without reporting
+        result = {'status': 'error', 'error': "benchmark process exited unexpectedly"}
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+    return result
+
+def _median(values: list) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+def _max(values: list) -> Optional[float]:
+    return max((value for value in values if value is not None), default=None)
+
+def _summarize_phases(runs: List[dict]) -> Dict[str, dict]:
+    """Per phase: median total seconds per run, largest RSS growth and heap growth"""
+    names = {name for run in runs for name in run.get('memory', {}).get('phases', {})}
+    phases = {}
+    for name in sorted(names):
+        totals = [run['memory']['phases'][name] for run in runs
+                  if name in run.get('memory', {}).get('phases', {})]
+        phases[name] = {
+            'time_median': _median([total['time'] for total in totals]),
+            'rss_growth_mb_max': _max([total.get('rss_growth_mb') for total in totals]),
+            'py_peak_mb_max': _max([total.get('py_peak_mb') for total in totals]),
+            'py_growth_mb_max': _max([total.get('py_growth_mb') for total in totals]),
+        }
+    return phases
+
+def summarize(runs: List[dict]) -> Dict[str, dict]:
+    """Per "dataset/algorithm" medians over the repetitions"""
+    groups: Dict[str, List[dict]] = {}
+    for run in runs:
+        groups.setdefault(f"{run['dataset']}/{run['algorithm']}", []).append(run)
+    summary = {}
+    for key, group in groups.items():
+        ok = [run for run in group if run['status'] == 'ok']
+        times = [run['time'] for run in ok]
+        found = [run['k'] for run in ok if run['k'] is not None]
+        summary[key] = {
+            'runs': len(group),
+            'ok': len(ok),
+            'timeouts': sum(run['status'] == 'timeout' for run in group),
+            'errors': sum(run['status'] == 'error' for run in group),
+            'time_median': _median(times),
+            'time_min': min(times) if times else None,
+            'time_max': max(times) if times else None,
+            'k_median': _median(found),
+            'search_nodes_median': _median([run['search_nodes'] for run in ok]),
+            'generations_median': _median([run['generations'] for run in ok]),
+            'peak_rss_mb_max': _max([run['peak_rss_mb'] for run in ok]),
+            'python_peak_mb_max': _max([run.get('memory', {}).get('python_peak_mb') for run in ok]),
+            'phases': _summarize_phases(ok),
+        }
+    return summary
+
+def compare(summary: Dict[str, dict], baseline: Dict[str, dict],
+            tolerance: float = DEFAULT_TOLERANCE,
+            min_seconds: float = DEFAULT_MIN_SECONDS,
+            min_mb: float = DEFAULT_MIN_MB) -> List[str]:
+    """Print current vs baseline medians; returns the regressions found"""
+    regressions = []
+    print(f"{'dataset/algorithm':<32} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for key in sorted(baseline):
+        base, current = baseline[key], summary.get(key)
+        if current is None:
+            continue
+        problems = []
+        before, after = base['time_median'], current['time_median']
+        ratio = after / before if before and after is not None else None
+        if ratio is not None and after > before * (1 + tolerance) and after - before > min_seconds:
+            problems.append(f"{ratio:.2f}x slower")
+        if base['k_median'] is not None and (current['k_median'] is None or
+                                             current['k_median'] > base['k_median']):
+            problems.append(f"k {base['k_median']} -> {current['k_median']}")
+        if current['timeouts'] > base['timeouts']:
+            problems.append(f"timeouts {base['timeouts']} -> {current['timeouts']}")
+        rss_before, rss_after = base.get('peak_rss_mb_max'), current['peak_rss_mb_max']
+        if (rss_before is not None and rss_after is not None and
+                rss_after > rss_before * (1 + tolerance) and rss_after - rss_before > min_mb):
+            problems.append(f"peak RSS {rss_before:.0f} -> {rss_after:.0f} MB")
+        cells = [f"{value:.3f}s" if value is not None else "-" for value in (before, after)]
+        print(f"{key:<32} {cells[0]:>10} {cells[1]:>10} "
+              f"{f'{ratio:.2f}' if ratio is not None else '-':>7}  {'; '.join(problems) or 'ok'}")
+        regressions += [f"{key}: {problem}" for problem in problems]
+    return regressions
+
+def benchmark(paths: List[Path], algorithms: List[str], repeat: int,
+              timeout: float = DEFAULT_TIMEOUT) -> List[dict]:
+    """Run every algorithm ``repeat`` times on every graph file"""
+    runs = []
+    for path in paths:
+        for algorithm in algorithms:
+            for rep in range(repeat):
+                params = DEFAULT_PARAMS[algorithm]
+                result = run_isolated(path, algorithm, params, seed=rep, timeout=timeout)
+                run = {'dataset': path.name, 'algorithm': algorithm, 'repetition': rep, **result}
+                runs.append(run)
+                detail = (f"k={run['k']} {run['time']:.3f}s" if run['status'] == 'ok'
+                          else run.get('error', run['status']))
+                print(f"{path.name} {algorithm} #{rep + 1}: {detail}")
+    return runs
+
+def _graph_files(sources: List[str], **filters) -> List[Path]:
+    """Files named directly, plus the datasets of each directory that pass
+    the DatasetRegistry ``filters`` (see DatasetRegistry.select)"""
+    from algorithms.dataset_registry import DatasetRegistry
+
+    paths = []
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            registry = DatasetRegistry(source)
+            registry.refresh()
+            paths += [Path(entry['path']) for entry in registry.select(**filters)]
+        else:
+            paths.append(source)
+    return paths
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the solvers over graph files.")
+    parser.add_argument("datasets", nargs="*", default=["datasets"],
+                        help="graph files or directories (default: datasets)")
+    parser.add_argument("-a", "--algorithm", dest="algorithms", action="append", choices=ALGORITHMS,
+                        help="algorithm to run (repeatable; default: all)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="runs per dataset and algorithm")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per run")
+    parser.add_argument("-o", "--out", default="benchmark_results.json", help="results file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction of the baseline median")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="ignore slowdowns smaller than this")
+    parser.add_argument("--min-mb", type=float, default=DEFAULT_MIN_MB,
+                        help="ignore peak RSS increases smaller than this many MiB")
+    parser.add_argument("--trace", help="append the runs' phase timings as JSON lines to this file")
+    parser.add_argument("--profile", metavar="DIR", help="write each run's cProfile stats to DIR")
+    parser.add_argument("--tracemalloc", type=int, default=0, metavar="FRAMES",
+                        help="trace Python allocations with this stack depth (slows the runs)")
+    parser.add_argument("--max-nodes", type=int, help="skip directory datasets with more vertices")
+    parser.add_argument("--max-edges", type=int, help="skip directory datasets with more edges")
+    parser.add_argument("--known-chromatic", action="store_true",
+                        help="only directory datasets whose header states the chromatic number")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        os.environ[TRACE_ENV] = str(Path(args.trace).resolve())  # read by the spawned runs
+    if args.profile:
+        os.environ[PROFILE_ENV] = str(Path(args.profile).resolve())
+    if args.tracemalloc:
+        os.environ[TRACEMALLOC_ENV] = str(args.tracemalloc)
+
+    paths = _graph_files(args.datasets, max_nodes=args.max_nodes, max_edges=args.max_edges,
+                         known_chromatic=True if args.known_chromatic else None)
+    if not paths:
+        parser.error("no graph files found")
+    algorithms = args.algorithms or list(ALGORITHMS)
+    runs = benchmark(paths, algorithms, args.repeat, args.timeout)
+    summary = summarize(runs)
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'repeat': args.repeat, 'timeout': args.timeout, 'tracemalloc': args.tracemalloc,
+                     'parameters': {algorithm: DEFAULT_PARAMS[algorithm] for algorithm in algorithms}},
+        'runs': runs,
+        'summary': summary,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['summary']
+        print()
+        regressions = compare(summary, baseline, args.tolerance, args.min_seconds, args.min_mb)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,26 @@
 # compare_window.py
 import tkinter as tk
-from tkinter import ttk
-import matplotlib.pyplot as plt
+from tkinter import ttk, filedialog, messagebox
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+import logging
 import threading
 import time
-from algorithms.backtracking import try_min_colors
-from algorithms.cultural import find_chromatic_number
-from algorithms.graph_utils import load_edgelist
+from pathlib import Path
+from algorithms.graph_cache import load_cached_csr
+from algorithms.graph_utils import GRAPH_FILETYPES
+from algorithms.trials import run_trials, summarize_trials
+from ui_pump import UpdatePump
+
+logger = logging.getLogger(__name__)
+
+# Solver settings used by the comparison (same as the single-run defaults)
+COMPARE_ALGORITHMS = {
+    'backtracking': {'max_colors': 10, 'time_limit': 60, 'use_mrv': True},
+    'cultural': {'population_size': 50, 'max_generations': 10, 'mutation_rate': 0.1, 'max_k': 10},
+}
+METHOD_NAMES = {'backtracking': 'Backtracking Search', 'cultural': 'Cultural Algorithm'}
+DEFAULT_RUNS = 10
 
 class CompareWindow:
     def __init__(self, parent, graph, last_results=None):
@@ -16,6 +28,9 @@ class CompareWindow:
         self.graph = graph
         self.last_results = last_results or {}
         self.results = {}
+        self.extra_datasets = []  # paths compared alongside the current graph
+        self.cancel_event = threading.Event()
+        self.running = False
         self.setup_window()
         
     def setup_window(self):
@@ -23,6 +38,7 @@ class CompareWindow:
         self.window.title("Algorithm Comparison")
         self.window.geometry("900x700")
         self.window.configure(bg='#141e30')
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         # Configure style for dark theme
         style = ttk.Style()
@@ -53,11 +69,23 @@ class CompareWindow:
         control_frame = ttk.Frame(main_frame)
         control_frame.pack(fill=tk.X, pady=5)
         
-        # إزالة زر Compare Algorithms والإبقاء على Use Existing Results فقط
         if self.last_results:
             ttk.Button(control_frame, text="Use Existing Results", 
                       command=self.use_existing_results).pack(side=tk.LEFT, padx=5)
         
+        # مقارنة إحصائية: عدة تشغيلات لكل خوارزمية بالتوازي
+        ttk.Label(control_frame, text="Runs:").pack(side=tk.LEFT)
+        self.runs_entry = ttk.Entry(control_frame, width=5)
+        self.runs_entry.insert(0, str(DEFAULT_RUNS))
+        self.runs_entry.pack(side=tk.LEFT, padx=2)
+        
+        ttk.Button(control_frame, text="Add Datasets", 
+                  command=self.add_datasets).pack(side=tk.LEFT, padx=5)
+        
+        self.run_btn = ttk.Button(control_frame, text="Run Comparison", 
+                                 command=self.run_comparison)
+        self.run_btn.pack(side=tk.LEFT, padx=5)
+        
         self.progress = ttk.Progressbar(control_frame, mode='indeterminate')
         self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
@@ -74,6 +102,9 @@ class CompareWindow:
                                    bg='#2a3f5f', fg='white',
                                    insertbackground='white')
         self.results_text.pack(fill=tk.BOTH, pady=5)
+        # The comparison thread reports through the pump, never through Tk directly
+        self.pump = UpdatePump(self.window, self.results_text)
+        self.pump.start()
         
         # Plot frame
         plot_frame = ttk.Frame(results_frame)
@@ -101,23 +132,56 @@ class CompareWindow:
         self.canvas = FigureCanvasTkAgg(self.fig, parent)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
+    def add_datasets(self):
+        """Pick more graph files to compare on, next to the current graph"""
+        paths = filedialog.askopenfilenames(parent=self.window, initialdir="datasets",
+                                            title="Select Graph Files",
+                                            filetypes=GRAPH_FILETYPES)
+        for path in paths:
+            if path not in self.extra_datasets:
+                self.extra_datasets.append(path)
+        if paths:
+            names = ", ".join(Path(path).stem for path in self.extra_datasets)
+            self.results_text.insert(tk.END, f"Extra datasets: {names}\n")
+    
     def run_comparison(self):
-        """Run both algorithms for comparison"""
+        """Run every algorithm several times (and on every dataset) in parallel"""
+        if self.running:
+            return
+        try:
+            runs = int(self.runs_entry.get())
+            if runs < 1:
+                raise ValueError("runs per algorithm must be at least 1")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid number of runs: {e}", parent=self.window)
+            print(f"ERROR: invalid number of runs: {e}")
+            return
+        self.running = True
+        self.run_btn.config(state=tk.DISABLED)
         self.progress.start()
+        self.pump.discard()
         self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(tk.END, "Running algorithm comparison...\n")
+        self.results_text.insert(tk.END, f"Running algorithm comparison ({runs} runs per algorithm)...\n")
         self.status_label.config(text="Running...")
         
         # طباعة في الـ Terminal
         print("\n" + "=" * 60)
         print("STARTING ALGORITHM COMPARISON...")
         print(f"Graph: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges")
+        print(f"Runs per algorithm: {runs}, extra datasets: {len(self.extra_datasets)}")
         print("=" * 60 + "\n")
         
-        thread = threading.Thread(target=self._run_all_algorithms)
+        # The thread only coordinates; the solvers run in a process pool
+        thread = threading.Thread(target=self._run_all_algorithms, args=(runs,))
         thread.daemon = True
         thread.start()
         
+    def close(self):
+        """Stop a running comparison and close the window"""
+        self.cancel_event.set()
+        self.pump.stop()
+        self.window.destroy()
+        
     def use_existing_results(self):
         """Use results that are already available from main window"""
         self.results_text.delete(1.0, tk.END)
@@ -138,102 +202,88 @@ class CompareWindow:
                 'colors': result['colors'],
                 'time': result['time'],
                 'conflicts': result.get('conflicts', 0),
-                'method': 'Backtracking Search' if algo == 'backtracking' else 'Cultural Algorithm'
+                'method': METHOD_NAMES[algo],
+                # a single run, in the same shape as a statistical comparison
+                'runs': 1,
+                'success_rate': 1.0 if result['success'] else 0.0,
+                'time_median': result['time'],
+                'time_std': 0.0,
+                'times': [result['time']],
+                'color_samples': [result['colors']] if result['success'] else [],
             }
             
         self._update_display()
         self.status_label.config(text="Using existing results")
         print("Existing results loaded successfully.")
     
-    def _run_all_algorithms(self):
+    def _run_all_algorithms(self, runs):
         try:
-            G = self.graph
-            self.results_text.insert(tk.END, f"Loaded graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges\n\n")
+            graphs = {"current graph": self.graph}
+            for path in self.extra_datasets:
+                graphs[Path(path).stem] = load_cached_csr(path)
+            for name, G in graphs.items():
+                self.pump.log(f"Loaded {name}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
+            self.pump.log("")
             
-            # Run Backtracking
-            self._run_backtracking(G)
-
-           
+            start_time = time.time()
+            trials = run_trials(graphs, COMPARE_ALGORITHMS, runs,
+                                on_result=self._on_trial, cancel_token=self.cancel_event)
+            wall_time = time.time() - start_time
+            if self.cancel_event.is_set():
+                return
             
-            # Run Cultural Algorithm  
-            self._run_cultural(G)
+            self.results = self._results_from_trials(trials, multi_dataset=len(graphs) > 1)
+            cpu_time = sum(trial['time'] for trial in trials)
+            self.pump.log(f"\n{len(trials)} runs in {wall_time:.2f}s wall time "
+                          f"({cpu_time:.2f}s of solver time)")
+            print(f"{len(trials)} runs in {wall_time:.2f}s wall time ({cpu_time:.2f}s of solver time)")
             
             # Update GUI in main thread
-            self.window.after(0, self._update_display)
+            self.pump.post('display', self._update_display)
             
         except Exception as e: 
-            error_msg = f"Error: {e}"
-            self.window.after(0, lambda: self.results_text.insert(tk.END, f"{error_msg}\n"))
+            self.pump.log(f"Error: {e}")
             print(f"COMPARISON ERROR: {e}")
         finally:
-            self.window.after(0, lambda: self.progress.stop())
-            self.window.after(0, lambda: self.status_label.config(text="Completed"))
+            self.running = False
+            self.pump.post('progress', self.progress.stop)
+            self.pump.post('run_btn', self.run_btn.config, state=tk.NORMAL)
+            self.pump.post('status', self.status_label.config, text="Completed")
             print("Algorithm comparison completed.")
     
-    def _run_backtracking(self, G):
-        """Run backtracking algorithm"""
-        self.window.after(0, lambda: self.results_text.insert(tk.END, "=== RUNNING BACKTRACKING ===\n"))
-        print("Running Backtracking algorithm...")
-        
-        start_time = time.time()
-        k_bt, colors_bt, t_bt = try_min_colors(G, max_try=10, use_mrv=True, time_limit=60)
-        bt_time = time.time() - start_time
-        
-        bt_success = k_bt is not None
-        bt_conflicts = 0 if bt_success else "N/A"
-        
-        self.results['backtracking'] = {
-            'success': bt_success,
-            'colors': k_bt if bt_success else "Failed",
-            'time': bt_time,
-            'conflicts': bt_conflicts,
-            'method': 'Backtracking Search'
-        }
-        
-        self.window.after(0, lambda: self.results_text.insert(
-            tk.END, f"Backtracking completed: {k_bt} colors, {bt_time:.2f}s\n\n"
-        ))
-        print(f"Backtracking completed: {k_bt} colors, {bt_time:.2f}s")
+    def _on_trial(self, trial, done, total):
+        """Called on the comparison thread as each pooled run finishes"""
+        colors = trial['k'] if trial['success'] else "Failed"
+        line = (f"{trial['dataset']} | {METHOD_NAMES[trial['algorithm']]} run {trial['run'] + 1}: "
+                f"{colors} colors, {trial['time']:.2f}s")
+        self.pump.log(line)
+        logger.debug(line)
+        self.pump.post('status', self.status_label.config, text=f"{done}/{total} runs")
     
-    def _run_cultural(self, G):
-        """Run cultural algorithm"""
-        self.window.after(0, lambda: self.results_text.insert(tk.END, "=== RUNNING CULTURAL ALGORITHM ===\n"))
-        print("Running Cultural Algorithm...")
-        
-        cultural_log = []
-        
-        def progress_callback(gen, conflicts, colors_used):
-            log_msg = f"Gen {gen}: Conflicts={conflicts}, Colors={colors_used}\n"
-            cultural_log.append(log_msg)
-            # عرض آخر 15 رسالة فقط لتجنب ازدحام النص
-            if len(cultural_log) <= 15:
-                self.window.after(0, lambda: self.results_text.insert(tk.END, log_msg))
-            # طباعة في الـ Terminal
-            print(f"Cultural Algorithm - Gen {gen}: Conflicts={conflicts}, Colors={colors_used}")
-        
-        start_time = time.time()
-        k_ca, coloring_ca, total_time = find_chromatic_number(
-            G, pop_size=50, max_gen=10, mutation_rate=0.1,  # Changed from 200 to 10
-            max_k=10, progress_callback=progress_callback
-        )
-        ca_time = time.time() - start_time
-        
-        success_ca = k_ca is not None
-        conflicts_ca = 0 if success_ca else "N/A"
-        
-        self.results['cultural'] = {
-            'success': success_ca,
-            'colors': k_ca if success_ca else "Failed", 
-            'time': ca_time,
-            'conflicts': conflicts_ca,
-            'method': 'Cultural Algorithm',
-            'log': cultural_log
-        }
-        
-        self.window.after(0, lambda: self.results_text.insert(
-            tk.END, f"Cultural Algorithm completed: {k_ca} colors, {ca_time:.2f}s\n\n"
-        ))
-        print(f"Cultural Algorithm completed: {k_ca} colors, {ca_time:.2f}s")
+    @staticmethod
+    def _results_from_trials(trials, multi_dataset=False):
+        """self.results entries (one per dataset and algorithm) from pooled runs"""
+        results = {}
+        for (dataset, algo), stats in summarize_trials(trials).items():
+            method = METHOD_NAMES[algo]
+            key = algo
+            if multi_dataset:
+                key = f"{dataset}/{algo}"
+                method = f"{method}\n({dataset})"
+            median = stats['colors_median']
+            results[key] = {
+                'success': stats['success_rate'] > 0,
+                'colors': "Failed" if median is None else (int(median) if median.is_integer() else median),
+                'time': stats['time_mean'],
+                'method': method,
+                'runs': stats['runs'],
+                'success_rate': stats['success_rate'],
+                'time_median': stats['time_median'],
+                'time_std': stats['time_std'],
+                'times': stats['times'],
+                'color_samples': stats['colors'],
+            }
+        return results
     
     def _update_display(self):
         """Update the display with current results"""
@@ -248,27 +298,23 @@ class CompareWindow:
         print("=" * 60)
         
         for algo, result in self.results.items():
-            self.results_text.insert(tk.END, f"{result['method']}:\n")
-            self.results_text.insert(tk.END, f"  Success: {result['success']}\n")
-            self.results_text.insert(tk.END, f"  Colors: {result['colors']}\n")
-            self.results_text.insert(tk.END, f"  Time: {result['time']:.2f}s\n")
+            samples = result['color_samples']
+            lines = [
+                f"{result['method']}:".replace("\n", " "),
+                f"  Runs: {result['runs']}",
+                f"  Success rate: {result['success_rate']:.0%}",
+                f"  Colors (median): {result['colors']}"
+                + (f"  [min {min(samples)}, max {max(samples)}]" if samples else ""),
+                f"  Time: mean {result['time']:.2f}s, median {result['time_median']:.2f}s, "
+                f"std {result['time_std']:.2f}s",
+            ]
             if 'conflicts' in result:
-                self.results_text.insert(tk.END, f"  Conflicts: {result['conflicts']}\n")
-            
-            # طباعة في الـ Terminal
-            print(f"\n{result['method']}:")
-            print(f"  Success: {result['success']}")
-            print(f"  Colors: {result['colors']}")
-            print(f"  Time: {result['time']:.2f}s")
-            if 'conflicts' in result:
-                print(f"  Conflicts: {result['conflicts']}")
-            
-            # Show cultural algorithm log
-            if algo == 'cultural' and 'log' in result and result['log']:
-                self.results_text.insert(tk.END, f"  Progress Log (last 15 generations):\n")
-                for log_msg in result['log'][-15:]:
-                    self.results_text.insert(tk.END, f"    {log_msg}")
+                lines.append(f"  Conflicts: {result['conflicts']}")
             
+            for line in lines:
+                self.results_text.insert(tk.END, line + "\n")
+                # طباعة في الـ Terminal
+                print(line)
             self.results_text.insert(tk.END, "\n")
         
         print("=" * 60)
@@ -293,61 +339,44 @@ class CompareWindow:
         
         if not self.results:
             return
-            
-        # Plot 1: Time comparison
+        
         algorithms = [self.results[algo]['method'] for algo in self.results]
-        times = [self.results[algo]['time'] for algo in self.results]
+        palette = ['#3f5e96' if algo.endswith('backtracking') else '#14a37f' for algo in self.results]
         
-        bars1 = self.ax1.bar(algorithms, times, color=['#3f5e96', '#14a37f'], alpha=0.7)
-        self.ax1.set_title('Computation Time Comparison')
+        # Plot 1: Time distribution over the runs
+        self._box_plot(self.ax1, [self.results[algo]['times'] for algo in self.results],
+                       algorithms, palette)
+        self.ax1.set_title('Computation Time per Run')
         self.ax1.set_ylabel('Time (seconds)')
         
-        # Add value labels on bars
-        for bar, time_val in zip(bars1, times):
-            height = bar.get_height()
-            self.ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                         f'{time_val:.2f}s', ha='center', va='bottom', color='white')
-        
-        # Plot 2: Colors comparison (only for successful runs)
-        colors_data = []
-        valid_algorithms = []
-        for algo in self.results:
-            if self.results[algo]['success'] and isinstance(self.results[algo]['colors'], int):
-                colors_data.append(self.results[algo]['colors'])
-                valid_algorithms.append(self.results[algo]['method'])
-        
-        if colors_data:
-            bars2 = self.ax2.bar(valid_algorithms, colors_data, color=['#3f5e96', '#14a37f'], alpha=0.7)
+        # Plot 2: Colors distribution (only for successful runs)
+        solved = [algo for algo in self.results if self.results[algo]['color_samples']]
+        if solved:
+            self._box_plot(self.ax2, [self.results[algo]['color_samples'] for algo in solved],
+                           [self.results[algo]['method'] for algo in solved],
+                           [color for algo, color in zip(self.results, palette) if algo in solved])
             self.ax2.set_title('Solution Quality (Colors Used)')
             self.ax2.set_ylabel('Number of Colors')
-            
-            # Add value labels on bars
-            for bar, color_val in zip(bars2, colors_data):
-                height = bar.get_height()
-                self.ax2.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                             f'{color_val}', ha='center', va='bottom', color='white')
         else:
             self.ax2.text(0.5, 0.5, 'No successful runs', 
                          ha='center', va='center', transform=self.ax2.transAxes, color='white')
             self.ax2.set_title('Solution Quality (Colors Used)')
         
-        # Plot 3: Success comparison
-        success_rates = [1 if self.results[algo]['success'] else 0 for algo in self.results]
-        algorithms_names = [self.results[algo]['method'] for algo in self.results]
+        # Plot 3: Success rate
+        success_rates = [self.results[algo]['success_rate'] for algo in self.results]
         
-        bars3 = self.ax3.bar(algorithms_names, success_rates, 
+        bars3 = self.ax3.bar(algorithms, success_rates, 
                             color=['#14a37f' if rate else '#e74c3c' for rate in success_rates],
                             alpha=0.7)
-        self.ax3.set_title('Solution Found')
-        self.ax3.set_ylabel('Success (1=Yes, 0=No)')
+        self.ax3.set_title('Success Rate')
+        self.ax3.set_ylabel('Runs with a valid coloring')
         self.ax3.set_ylim(0, 1.2)
         
         # Add value labels on bars
-        for bar, success in zip(bars3, success_rates):
+        for bar, rate in zip(bars3, success_rates):
             height = bar.get_height()
-            status = "SUCCESS" if success else "FAILED"
             self.ax3.text(bar.get_x() + bar.get_width()/2., height + 0.05,
-                         status, ha='center', va='bottom', fontweight='bold', color='white')
+                         f"{rate:.0%}", ha='center', va='bottom', fontweight='bold', color='white')
         
         # Plot 4: Performance summary
         self.ax4.axis('off')
@@ -355,14 +384,29 @@ class CompareWindow:
         for algo in self.results:
             result = self.results[algo]
             status = "✓ SUCCESS" if result['success'] else "✗ FAILED"
-            color = "#14a37f" if result['success'] else "#e74c3c"
-            summary_text += f"{result['method']}:\n"
-            summary_text += f"  Status: {status}\n"
+            summary_text += f"{result['method']}:\n".replace("\n(", " (")
+            summary_text += f"  Status: {status} ({result['success_rate']:.0%} of {result['runs']})\n"
             summary_text += f"  Colors: {result['colors']}\n"
-            summary_text += f"  Time: {result['time']:.2f}s\n\n"
+            summary_text += f"  Time: {result['time']:.2f}s ± {result['time_std']:.2f}s\n\n"
         
         self.ax4.text(0.1, 0.9, summary_text, transform=self.ax4.transAxes,
                      fontfamily='monospace', fontsize=10, va='top', color='white')
         
         self.fig.tight_layout()
-        self.canvas.draw()
\ No newline at end of file
+        self.canvas.draw()
+    
+    @staticmethod
+    def _box_plot(ax, samples, labels, colors):
+        """Dark-theme box plot with the individual runs drawn over each box"""
+        boxes = ax.boxplot(samples, patch_artist=True, widths=0.5,
+                           medianprops={'color': 'white'},
+                           whiskerprops={'color': 'white'}, capprops={'color': 'white'},
+                           flierprops={'markeredgecolor': 'white'})
+        for patch, color in zip(boxes['boxes'], colors):
+            patch.set_facecolor(color)
+            patch.set_alpha(0.7)
+            patch.set_edgecolor('white')
+        for position, values in enumerate(samples, start=1):
+            ax.scatter([position] * len(values), values, s=10, color='white', alpha=0.6, zorder=3)
+        ax.set_xticks(range(1, len(labels) + 1))
+        ax.set_xticklabels(labels)
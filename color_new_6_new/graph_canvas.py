@@ -1,14 +1,50 @@
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
+from matplotlib import colormaps
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-import networkx as nx
+import numpy as np
+from algorithms.graph_utils import CSRGraph, conflict_report, edge_index
+from algorithms.profiling import phase
+from layout import LayoutCache, LayoutJob
+
+# Above these sizes the canvas switches to the large-graph renderer
+LARGE_GRAPH_NODES = 300
+LARGE_GRAPH_EDGES = 3000
+# Level of detail: at most this many non-conflict edges are drawn
+MAX_DRAWN_EDGES = 20000
+# Live solver view: minimum seconds between two blitted frames
+LIVE_INTERVAL = 0.1
+NODE_COLOR = '#3f5e96'
+COLORMAP = colormaps['tab20']
+# How often a background layout is checked for a newer picture
+LAYOUT_POLL_MS = 100
 
 class GraphCanvas:
     def __init__(self, parent):
         self.parent = parent
+        self.layout_cache = LayoutCache()
+        self._drawn_key = None  # layout key of the graph currently on screen
+        self._node_artist = None
+        self._edge_artist = None
+        self._conflict_artist = None  # large mode: red conflict edges only
+        self._large = None  # large mode: (labels, coords, u, v) of the drawn graph
+        self._drawn_graph = None  # (graph object, nodes, edges) of the drawn graph
+        self._label_artists = []
+        self._conflict_edges = None  # large mode: mask of the conflict edges shown
+        self._layout_job = None  # (LayoutJob, key, graph, labels) while a layout is computed
+        # Live view state; snapshots arrive from the solver thread under _live_lock
+        self._live_lock = threading.Lock()
+        self._live_edges = None  # (labels, u, v) in drawing order while live
+        self._live_perm = None  # (solver labels, index of each in drawing order)
+        self._live_pending = None
+        self._live_last = 0.0
+        self._live_job = None
+        self._live_background = None
         self.setup_canvas()
+        self.canvas.mpl_connect('draw_event', self._on_draw)
         
     def setup_canvas(self):
         # Create matplotlib figure with dark theme
@@ -21,67 +57,375 @@ class GraphCanvas:
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-    def draw_graph(self, G, coloring_dict=None, title="Graph", conflicts=0):
-        """Draw graph with optional coloring"""
+    def draw_graph(self, G, coloring_dict=None, title="Graph", conflicts=0, report=None):
+        """Draw graph with optional coloring
+
+        ``report`` is an optional ConflictReport for ``coloring_dict``; it is
+        computed here when not supplied. Node positions come from the layout
+        cache, and when the same graph is already on screen only the node and
+        edge colors are updated.
+        """
+        with phase('render', nodes=G.number_of_nodes(), colored=bool(coloring_dict)):
+            self._draw_graph(G, coloring_dict, title, conflicts, report)
+    
+    def _draw_graph(self, G, coloring_dict, title, conflicts, report):
+        self.stop_live()
+        signature = (G, G.number_of_nodes(), G.number_of_edges())
+        if self._drawn_graph is not None and self._drawn_graph[0] is G and self._drawn_graph == signature:
+            key = self._drawn_key  # same graph object, skip re-hashing it
+        else:
+            key = self.layout_cache.key(G)
+        colored = bool(coloring_dict) and len(coloring_dict) == G.number_of_nodes()
+        
+        if key == self._drawn_key and self._node_artist is not None:
+            self._recolor(G, coloring_dict if colored else None, report)
+        else:
+            self._draw_full(G, key, coloring_dict if colored else None, report)
+        self._drawn_graph = signature
+        
+        # Set title with white color
+        title_text = f"{title}\n"
+        if coloring_dict:
+            colors_used = len(set(coloring_dict.values()))
+            title_text += f"Colors: {colors_used}, Conflicts: {conflicts}"
+        self.ax.set_title(title_text, fontsize=12, fontweight='bold', color='white')
+        self.canvas.draw()
+    
+    def graph_edited(self):
+        """Forget the drawn graph's layout key after it was edited in place
+
+        An edit can keep the node and edge counts, so the next draw_graph()
+        must hash the graph again instead of reusing the drawn artists.
+        """
+        self._drawn_graph = None
+        self._drawn_key = None
+    
+    @staticmethod
+    def _compute_layout(G):
+        import networkx as nx  # only small graphs use networkx layouts
+        # Choose layout based on graph size
+        with phase('layout', nodes=G.number_of_nodes()):
+            if G.number_of_nodes() <= 20:
+                return nx.spring_layout(G, seed=42, k=1.5, iterations=50)
+            # Graphs above LARGE_GRAPH_NODES never get here; _draw_full uses LayoutJob
+            return nx.spring_layout(G, seed=42)
+    
+    def _draw_full(self, G, key, coloring_dict, report):
         self.ax.clear()
         self.ax.set_facecolor('#141e30')
+        self._drawn_key = key
+        self._conflict_artist = None
+        self._large = None
+        self._label_artists = []
         
-        # Choose layout based on graph size
-        if G.number_of_nodes() <= 20:
-            pos = nx.spring_layout(G, seed=42, k=1.5, iterations=50)
-        else:
-            pos = nx.spring_layout(G, seed=42)
+        if G.number_of_nodes() > LARGE_GRAPH_NODES or G.number_of_edges() > LARGE_GRAPH_EDGES:
+            edges = edge_index(G)
+            pos = self.layout_cache.peek(G, key)
+            if pos is None:
+                # Lay out off the GUI thread; _poll_layout moves the nodes as levels finish
+                labels, u, v = edges
+                job = LayoutJob(lambda: CSRGraph.from_edges(u, v, len(labels)))
+                self._layout_job = (job, key, G, labels)
+                self.canvas_widget.after(LAYOUT_POLL_MS, self._poll_layout, job)
+            self._draw_large(G, edges, pos, coloring_dict, report)
+            return
         
-        # Prepare node colors
-        if coloring_dict and len(coloring_dict) == G.number_of_nodes():
+        import networkx as nx  # networkx drawing is only used for small graphs
+        pos = self.layout_cache.get(G, self._compute_layout, key=key)
+        if coloring_dict:
+            if report is None:
+                report = conflict_report(G, coloring_dict)
             nodes = list(G.nodes())
             node_colors = [coloring_dict.get(node, 0) for node in nodes]
             
-            # Use a colormap
-            cmap = plt.cm.tab20
-            unique_colors = len(set(node_colors))
-            
-            # Draw colored graph
-            nx.draw_networkx_nodes(G, pos, ax=self.ax, node_size=500,
-                                 node_color=node_colors, cmap=cmap, 
+            # Draw colored graph with a colormap
+            self._node_artist = nx.draw_networkx_nodes(G, pos, ax=self.ax, node_size=500,
+                                 node_color=node_colors, cmap=COLORMAP, 
                                  edgecolors='white', linewidths=1)
             
             # Highlight conflicting edges
-            edge_colors = []
-            for edge in G.edges():
-                if coloring_dict.get(edge[0]) == coloring_dict.get(edge[1]):
-                    edge_colors.append('red')  # Conflict
-                else:
-                    edge_colors.append('white')
-            
-            nx.draw_networkx_edges(G, pos, ax=self.ax, edge_color=edge_colors, 
+            edge_colors = ['red' if bad else 'white' for bad in report.edge_mask.tolist()]
+            self._edge_artist = nx.draw_networkx_edges(G, pos, ax=self.ax, edge_color=edge_colors, 
                                  width=2, alpha=0.7)
             
         else:
             # Draw uncolored graph
-            nx.draw_networkx_nodes(G, pos, ax=self.ax, node_size=500,
-                                 node_color='#3f5e96', edgecolors='white', 
+            self._node_artist = nx.draw_networkx_nodes(G, pos, ax=self.ax, node_size=500,
+                                 node_color=NODE_COLOR, edgecolors='white', 
                                  linewidths=1)
-            nx.draw_networkx_edges(G, pos, ax=self.ax, edge_color='white', 
+            self._edge_artist = nx.draw_networkx_edges(G, pos, ax=self.ax, edge_color='white', 
                                  width=1, alpha=0.7)
         
         # Draw labels with white color
-        nx.draw_networkx_labels(G, pos, ax=self.ax, font_size=10, 
-                              font_weight='bold', font_color='white')
+        self._label_artists = list(nx.draw_networkx_labels(G, pos, ax=self.ax, font_size=10, 
+                              font_weight='bold', font_color='white').values())
         
-        # Set title with white color
-        title_text = f"{title}\n"
+        self.ax.axis('off')
+        self.figure.tight_layout()
+    
+    @staticmethod
+    def _polyline(coords, u, v):
+        """x/y arrays drawing every (u, v) segment as one NaN-separated line"""
+        xs = np.full(3 * len(u), np.nan)
+        ys = np.full(3 * len(u), np.nan)
+        xs[0::3], xs[1::3] = coords[u, 0], coords[v, 0]
+        ys[0::3], ys[1::3] = coords[u, 1], coords[v, 1]
+        return xs, ys
+    
+    @staticmethod
+    def _level_of_detail(count):
+        """Indices of at most MAX_DRAWN_EDGES evenly spaced items"""
+        if count <= MAX_DRAWN_EDGES:
+            return np.arange(count)
+        return np.linspace(0, count - 1, MAX_DRAWN_EDGES).astype(np.int64)
+    
+    def _draw_large(self, G, edges, pos, coloring_dict, report):
+        """Large-graph mode: one scatter for the nodes, one NaN-separated line for a
+        level-of-detail sample of the edges and one for the conflict edges; no labels
+
+        With ``pos`` None the layout is still being computed: nodes start at
+        the origin and the edges stay hidden until the first picture arrives.
+        """
+        labels, u, v = edges
+        if pos is None:
+            coords = np.zeros((len(labels), 2))
+        else:
+            coords = np.array([pos[label] for label in labels], dtype=float).reshape(len(labels), 2)
+        self._large = (labels, coords, u, v)
+        self._conflict_edges = None
+        
+        shown = self._level_of_detail(len(u))
+        xs, ys = self._polyline(coords, u[shown], v[shown])
+        self._edge_artist, = self.ax.plot(xs, ys, color='white', linewidth=0.3, alpha=0.25,
+                                          antialiased=False, zorder=1)
+        self._conflict_artist, = self.ax.plot([], [], color='red', linewidth=1.0, alpha=0.9, zorder=2)
+        
+        size = float(np.clip(20000.0 / max(len(labels), 1), 2.0, 40.0))
+        self._node_artist = self.ax.scatter(coords[:, 0], coords[:, 1], s=size, c=NODE_COLOR,
+                                            linewidths=0, zorder=3)
         if coloring_dict:
-            colors_used = len(set(coloring_dict.values()))
-            title_text += f"Colors: {colors_used}, Conflicts: {conflicts}"
-        self.ax.set_title(title_text, fontsize=12, fontweight='bold', color='white')
+            self._recolor_large(G, coloring_dict, report)
         
+        if pos is None:
+            self._edge_artist.set_visible(False)
+            self.ax.set_xlim(-1.05, 1.05)
+            self.ax.set_ylim(-1.05, 1.05)
+        else:
+            self.ax.update_datalim(coords)
+            self.ax.autoscale_view()
         self.ax.axis('off')
         self.figure.tight_layout()
-        self.canvas.draw()
+    
+    def _poll_layout(self, job):
+        """Show the newest picture of the background layout; cache the final one"""
+        if self._layout_job is None or self._layout_job[0] is not job:
+            return  # superseded by another graph's layout
+        _, key, G, labels = self._layout_job
+        finished = job.done
+        coords = job.poll()
+        current = key == self._drawn_key and self._large is not None
+        if coords is not None and current:
+            self._move_nodes(coords)
+        if not finished:
+            self.canvas_widget.after(LAYOUT_POLL_MS, self._poll_layout, job)
+            return
+        self._layout_job = None
+        if job.error is not None:
+            print(f"WARNING: background layout failed: {job.error}")
+        elif job.result is not None:
+            # The final picture may have been shown by an earlier poll
+            self.layout_cache.put(G, key, dict(zip(labels, job.result)))
+    
+    def _move_nodes(self, coords):
+        """Large mode: put the drawn nodes and edges at new positions"""
+        labels, _, u, v = self._large
+        self._large = (labels, coords, u, v)
+        self._node_artist.set_offsets(coords)
+        shown = self._level_of_detail(len(u))
+        self._edge_artist.set_data(*self._polyline(coords, u[shown], v[shown]))
+        self._edge_artist.set_visible(True)
+        if self._conflict_edges is not None:
+            self._set_conflict_edges(self._conflict_edges)
+        self.ax.ignore_existing_data_limits = True
+        self.ax.update_datalim(coords)
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+    
+    def _recolor(self, G, coloring_dict, report):
+        """Restyle the existing node/edge artists for a new coloring"""
+        if self._large is not None:
+            self._recolor_large(G, coloring_dict, report)
+            return
+        if coloring_dict:
+            if report is None:
+                report = conflict_report(G, coloring_dict)
+            values = np.array([coloring_dict.get(node, 0) for node in G.nodes()], dtype=float)
+            self._node_artist.set_cmap(COLORMAP)
+            self._node_artist.set_array(values)
+            self._node_artist.set_clim(values.min(), values.max())
+            edge_colors = ['red' if bad else 'white' for bad in report.edge_mask.tolist()]
+            width = 2
+        else:
+            self._node_artist.set_array(None)
+            self._node_artist.set_facecolor(NODE_COLOR)
+            edge_colors = 'white'
+            width = 1
+        if self._edge_artist is not None:
+            self._edge_artist.set_color(edge_colors)
+            self._edge_artist.set_linewidth(width)
+    
+    def _recolor_large(self, G, coloring_dict, report):
+        labels, coords, u, v = self._large
+        if coloring_dict:
+            values = np.fromiter((coloring_dict.get(label, -1) for label in labels),
+                                 dtype=float, count=len(labels))
+            self._set_node_values(values)
+            # Conflicts straight from the cached edge arrays (same order as a report's mask)
+            bad = report.edge_mask if report is not None else self._conflict_mask(values, u, v)
+            self._set_conflict_edges(bad)
+        else:
+            self._node_artist.set_array(None)
+            self._node_artist.set_facecolor(NODE_COLOR)
+            self._conflict_artist.set_data([], [])
+            self._conflict_edges = None
+    
+    def _set_node_values(self, values):
+        """Color nodes by value; negative values (uncolored) keep the default color"""
+        self._node_artist.set_cmap(COLORMAP.with_extremes(bad=NODE_COLOR))
+        self._node_artist.set_array(np.ma.masked_less(values, 0))
+        colored = values[values >= 0]
+        if colored.size:
+            self._node_artist.set_clim(colored.min(), colored.max())
+    
+    @staticmethod
+    def _conflict_mask(values, u, v):
+        return (values[u] == values[v]) & (values[u] >= 0)
+    
+    def _set_conflict_edges(self, bad):
+        self._conflict_edges = bad
+        labels, coords, u, v = self._large
+        bad_u, bad_v = u[bad], v[bad]
+        shown = self._level_of_detail(len(bad_u))
+        self._conflict_artist.set_data(*self._polyline(coords, bad_u[shown], bad_v[shown]))
+    
+    # ---- live solver view ----
+    
+    def start_live(self, G, title="Solving..."):
+        """Show solver snapshots on the drawn graph until stop_live()
+
+        The solver thread hands colorings to offer_snapshot(); only the latest
+        one is kept, and the Tk thread blits it at most every LIVE_INTERVAL
+        seconds by redrawing just the node and conflict-edge artists over a
+        saved background, so rendering never holds up the solver.
+        """
+        self.draw_graph(G, None, title)
+        if self._large is not None:
+            labels, coords, u, v = self._large
+            animated = [self._node_artist, self._conflict_artist]
+        else:
+            labels, u, v = edge_index(G)
+            animated = [self._edge_artist, self._node_artist] + self._label_artists
+        self._live_edges = (labels, u, v)
+        self._live_perm = None
+        self._live_pending = None
+        self._live_last = 0.0
+        for artist in animated:
+            if hasattr(artist, 'set_animated'):
+                artist.set_animated(True)
+        self.canvas.draw()  # the draw event stores the background without the animated artists
+        self._live_job = self.canvas_widget.after(int(LIVE_INTERVAL * 1000), self._live_tick)
+    
+    def offer_snapshot(self, labels, coloring):
+        """Solver-side hook, safe to call from any thread and cheap when throttled
+
+        ``labels`` are the solver's vertex labels and ``coloring`` is either a
+        sequence of colors indexed like ``labels`` or a dict of vertex index to
+        color for a partial assignment.
+        """
+        now = time.monotonic()
+        if self._live_edges is None or now - self._live_last < LIVE_INTERVAL:
+            return
+        self._live_last = now
+        if isinstance(coloring, dict):
+            index = np.fromiter(coloring.keys(), dtype=np.int64, count=len(coloring))
+            colors = np.fromiter(coloring.values(), dtype=float, count=len(coloring))
+        else:
+            index, colors = None, np.asarray(coloring, dtype=float).copy()
+        with self._live_lock:
+            self._live_pending = (labels, index, colors)
+    
+    def stop_live(self):
+        """Leave live mode; the next draw_graph() shows the final result"""
+        if self._live_edges is None:
+            return
+        if self._live_job is not None:
+            self.canvas_widget.after_cancel(self._live_job)
+        self._live_job = None
+        self._live_edges = None
+        self._live_perm = None
+        self._live_background = None
+        with self._live_lock:
+            self._live_pending = None
+        for artist in self._animated_artists():
+            artist.set_animated(False)
+        self.canvas.draw_idle()
+    
+    def _animated_artists(self):
+        artists = [artist for artist in self.ax.get_children() if artist.get_animated()]
+        return sorted(artists, key=lambda artist: artist.get_zorder())
+    
+    def _on_draw(self, event):
+        if self._live_edges is None:
+            return
+        self._live_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._animated_artists():
+            self.ax.draw_artist(artist)
+    
+    def _live_tick(self):
+        self._live_job = None
+        with self._live_lock:
+            snapshot, self._live_pending = self._live_pending, None
+        if snapshot is not None and self._live_background is not None:
+            self._apply_snapshot(*snapshot)
+            self.canvas.restore_region(self._live_background)
+            for artist in self._animated_artists():
+                self.ax.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+        if self._live_edges is not None:
+            self._live_job = self.canvas_widget.after(int(LIVE_INTERVAL * 1000), self._live_tick)
+    
+    def _apply_snapshot(self, labels, index, colors):
+        drawn_labels, u, v = self._live_edges
+        if self._live_perm is None or self._live_perm[0] is not labels:
+            position = {label: i for i, label in enumerate(drawn_labels)}
+            perm = np.fromiter((position[label] for label in labels), dtype=np.int64, count=len(labels))
+            self._live_perm = (labels, perm)
+        perm = self._live_perm[1]
+        values = np.full(len(drawn_labels), -1.0)
+        if index is None:
+            values[perm] = colors
+        else:
+            values[perm[index]] = colors
         
+        self._set_node_values(values)
+        bad = self._conflict_mask(values, u, v)
+        if self._large is not None:
+            self._set_conflict_edges(bad)
+        elif self._edge_artist is not None:
+            self._edge_artist.set_color(['red' if b else 'white' for b in bad.tolist()])
+    
     def clear(self):
         """Clear the canvas"""
+        self.stop_live()
+        self._drawn_key = None
+        self._node_artist = None
+        self._edge_artist = None
+        self._conflict_artist = None
+        self._large = None
+        self._drawn_graph = None
+        self._label_artists = []
+        self._conflict_edges = None
+        self._layout_job = None
         self.ax.clear()
         self.ax.set_facecolor('#141e30')
         self.ax.set_title("Graph will be displayed here", color='white')
@@ -0,0 +1,70 @@
+# import_times.py
+"""Start-up import cost of the entry points, and a check that it stays low
+
+    python import_times.py                  # main (the GUI) and solve
+    python import_times.py main --top 20 --budget 400
+
+Each module is imported in a fresh interpreter with ``-X importtime``. The
+report lists the slowest imports (cumulative milliseconds). The exit status
+is 1 when a module in DEFERRED shows up at start-up, or when an import takes
+longer than --budget milliseconds, so a regression is caught before it
+reaches a slow machine.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Loaded on first use by the feature that needs them, never at start-up
+DEFERRED = {
+    'main': ('compare_window', 'matplotlib.pyplot', 'networkx', 'concurrent.futures'),
+    'solve': ('tkinter', 'matplotlib', 'networkx', 'multiprocessing'),
+}
+
+def import_times(module: str) -> Dict[str, Tuple[float, float]]:
+    """{imported module: (self ms, cumulative ms)} for importing ``module``"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=Path(__file__).resolve().parent, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # the header line
+        times[name.strip()] = (int(own) / 1000, int(cumulative) / 1000)
+    return times
+
+def check(module: str, top: int = 10, budget: Optional[float] = None) -> List[str]:
+    """Print the report for one module; returns the problems found"""
+    times = import_times(module)
+    total = times[module][1]
+    print(f"import {module}: {total:.1f} ms, {len(times)} modules")
+    for name, (_, cumulative) in sorted(times.items(), key=lambda item: -item[1][1])[1:top + 1]:
+        print(f"  {cumulative:8.1f} ms  {name}")
+    problems = [f"{module} imports {name} at start-up"
+                for name in DEFERRED.get(module, ()) if name in times]
+    if budget is not None and total > budget:
+        problems.append(f"import {module} took {total:.1f} ms (budget {budget:.0f} ms)")
+    return problems
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report and check start-up import times.")
+    parser.add_argument("modules", nargs="*", default=list(DEFERRED))
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--budget", type=float, default=None, help="maximum milliseconds per module")
+    args = parser.parse_args(argv)
+
+    problems = []
+    for module in args.modules:
+        problems += check(module, args.top, args.budget)
+        print()
+    for problem in problems:
+        print(f"REGRESSION: {problem}")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
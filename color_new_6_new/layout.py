@@ -0,0 +1,323 @@
+# layout.py
+from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+from algorithms.graph_cache import DEFAULT_CACHE_DIR
+from algorithms.graph_utils import CSRGraph, GraphLike, as_csr
+from algorithms.profiling import phase
+from algorithms.solution_cache import labeled_hash
+
+if TYPE_CHECKING:
+    import networkx as nx  # annotations only
+
+DEFAULT_LAYOUT_DIR = DEFAULT_CACHE_DIR.parent / "layouts"
+
+class LayoutCache:
+    """Node positions keyed by the labelled graph hash.
+
+    Positions are kept in a small in-memory LRU and, with ``persist``,
+    saved as .npz files so the same graph is never laid out twice.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, persist: bool = True,
+                 max_entries: int = 16):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_LAYOUT_DIR
+        self.persist = persist
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Dict[Any, np.ndarray]]" = OrderedDict()
+
+    @staticmethod
+    def key(G: nx.Graph, variant: str = "spring") -> str:
+        return f"{labeled_hash(G)}-{variant}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, G: nx.Graph, compute: Callable[[nx.Graph], Dict[Any, np.ndarray]],
+            variant: str = "spring", key: Optional[str] = None) -> Dict[Any, np.ndarray]:
+        """Cached positions for G, computing (and storing) them on a miss"""
+        key = key or self.key(G, variant)
+        pos = self.peek(G, key)
+        if pos is None:
+            pos = compute(G)
+            self.put(G, key, pos)
+        return pos
+
+    def peek(self, G: nx.Graph, key: str) -> Optional[Dict[Any, np.ndarray]]:
+        """Cached positions for G, or None without computing anything"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        pos = self._load(G, key) if self.persist else None
+        if pos is not None:
+            self._remember(key, pos)
+        return pos
+
+    def put(self, G: nx.Graph, key: str, pos: Dict[Any, np.ndarray]):
+        """Store positions computed elsewhere (e.g. by a LayoutJob)"""
+        if self.persist:
+            self._save(G, key, pos)
+        self._remember(key, pos)
+
+    def _remember(self, key: str, pos: Dict[Any, np.ndarray]):
+        self._memory[key] = pos
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, G: nx.Graph, key: str) -> Optional[Dict[Any, np.ndarray]]:
+        try:
+            with np.load(self._path(key)) as data:
+                coords = data["coords"]
+        except (OSError, KeyError, ValueError):
+            return None
+        labels = as_csr(G).labels
+        if len(coords) != len(labels):
+            return None
+        return dict(zip(labels, coords))
+
+    def _save(self, G: nx.Graph, key: str, pos: Dict[Any, np.ndarray]):
+        labels = as_csr(G).labels
+        coords = np.array([pos[label] for label in labels], dtype=np.float64).reshape(len(labels), 2)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(f".{os.getpid()}.tmp.npz")
+            np.savez(tmp, coords=coords)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            print(f"WARNING: could not save layout cache: {e}")
+
+    def clear(self):
+        self._memory.clear()
+        if self.cache_dir.exists():
+            for f in self.cache_dir.glob("*.npz"):
+                f.unlink()
+
+
+# ---- multilevel force-directed layout ----
+
+COARSEST_NODES = 100  # coarsening stops once the graph is this small
+EXACT_REPULSION_NODES = 1000  # all-pairs repulsion up to here, grid-local above
+_REPULSION_BLOCK = 512
+_REPULSION = 0.2  # relative strength of repulsion vs. the d^2 springs
+_COOLING = 0.9
+
+def _coarsen(offsets: np.ndarray, nbrs: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Cluster index of every vertex for one coarsening step
+
+    Vertices whose random priority beats all their neighbours lead a
+    cluster and every other vertex joins its highest-priority leader
+    neighbour, or failing that its highest-priority neighbour's cluster;
+    isolated vertices are grouped in fours.
+    """
+    n = len(offsets) - 1
+    deg = np.diff(offsets)
+    rows = np.repeat(np.arange(n), deg)
+    prio = rng.random(n)
+    nbr_prio = prio[nbrs]
+    has_nbrs = deg > 0
+    starts = offsets[:-1][has_nbrs]
+
+    best_nbr = np.full(n, -1.0)
+    if len(nbrs):
+        best_nbr[has_nbrs] = np.maximum.reduceat(nbr_prio, starts)
+    leader = prio > best_nbr
+
+    cluster = np.arange(n)
+    score = np.where(leader[nbrs], nbr_prio, -1.0)
+    best_leader = np.full(n, -1.0)
+    if len(nbrs):
+        best_leader[has_nbrs] = np.maximum.reduceat(score, starts)
+    join = np.flatnonzero((score >= 0) & (score == best_leader[rows]) & ~leader[rows])
+    cluster[rows[join]] = nbrs[join]
+    # Vertices with no leader next to them follow their best neighbour instead
+    alone = np.zeros(n, dtype=bool)
+    alone[has_nbrs] = ~leader[has_nbrs]
+    alone[rows[join]] = False
+    follow = np.flatnonzero(alone[rows] & (nbr_prio == best_nbr[rows]))
+    cluster[rows[follow]] = cluster[nbrs[follow]]
+
+    isolated = np.flatnonzero(~has_nbrs)
+    cluster[isolated] = isolated[np.arange(len(isolated)) // 4 * 4]
+    return np.unique(cluster, return_inverse=True)[1]
+
+def _repulsion_exact(pos: np.ndarray) -> np.ndarray:
+    """All-pairs repulsion (x_i - x_j) / |x_i - x_j|^2, in row blocks"""
+    x, y = pos[:, 0], pos[:, 1]
+    force = np.empty_like(pos)
+    for start in range(0, len(pos), _REPULSION_BLOCK):
+        stop = start + _REPULSION_BLOCK
+        dx = x[start:stop, None] - x
+        dy = y[start:stop, None] - y
+        weight = 1.0 / (dx * dx + dy * dy + 1e-4)
+        force[start:stop, 0] = (dx * weight).sum(axis=1)
+        force[start:stop, 1] = (dy * weight).sum(axis=1)
+    return force
+
+def _repulsion_grid(pos: np.ndarray, rng: np.random.Generator, cell: float = 2.0) -> np.ndarray:
+    """Local repulsion: each vertex is pushed by the centroids of its own and
+    the eight surrounding grid cells, weighted by their vertex counts (the far
+    field is left to the coarser levels); the grid is shifted on every call
+    (by ``rng``) so no lattice builds up"""
+    origin = pos.min(axis=0) - rng.random(2) * cell
+    ij = np.floor((pos - origin) / cell).astype(np.int64) + 1
+    width = int(ij[:, 1].max()) + 2
+    cells = ij[:, 0] * width + ij[:, 1]
+    size = (int(ij[:, 0].max()) + 2) * width
+    cell_count = np.bincount(cells, minlength=size).astype(float)
+    cell_x = np.bincount(cells, pos[:, 0], size)
+    cell_y = np.bincount(cells, pos[:, 1], size)
+
+    force = np.zeros_like(pos)
+    for di in (-1, 0, 1):
+        for dj in (-1, 0, 1):
+            other = cells + di * width + dj
+            m, sx, sy = cell_count[other], cell_x[other], cell_y[other]
+            if di == 0 and dj == 0:  # the vertex's own cell, minus itself
+                m, sx, sy = m - 1, sx - pos[:, 0], sy - pos[:, 1]
+            present = m > 0
+            safe = np.where(present, m, 1.0)
+            delta = pos - np.column_stack([sx / safe, sy / safe])
+            d2 = (delta ** 2).sum(axis=1) + 1e-4
+            force += delta * np.where(present, m / d2, 0.0)[:, None]
+    return force
+
+def _refine(pos: np.ndarray, u: np.ndarray, v: np.ndarray, iterations: int, step: float,
+            rng: np.random.Generator):
+    """Spring-electrical iterations in place (ideal edge length ~1) with the
+    adaptive step length of Hu's multilevel layout"""
+    n = len(pos)
+    if n <= EXACT_REPULSION_NODES:
+        repulsion = _repulsion_exact
+    else:
+        repulsion = lambda p: _repulsion_grid(p, rng)
+    energy, progress = np.inf, 0
+    for _ in range(iterations):
+        force = _REPULSION * repulsion(pos)
+        delta = pos[u] - pos[v]
+        pull = delta * np.sqrt((delta ** 2).sum(axis=1))[:, None]  # |d|^2 along d
+        for axis in (0, 1):
+            force[:, axis] += np.bincount(v, pull[:, axis], n) - np.bincount(u, pull[:, axis], n)
+        length = np.sqrt((force ** 2).sum(axis=1)) + 1e-9
+        pos += force * (step / length)[:, None]
+
+        previous, energy = energy, float((length ** 2).sum())
+        if energy < previous:
+            progress += 1
+            if progress >= 5:
+                progress, step = 0, step / _COOLING
+        else:
+            progress, step = 0, step * _COOLING
+
+def _normalize(coords: np.ndarray) -> np.ndarray:
+    """Center at the origin and scale into the unit disc; the few stragglers
+    (isolated vertices drift far out) are pulled in to the rim"""
+    coords = coords - np.median(coords, axis=0)
+    radius = np.sqrt((coords ** 2).sum(axis=1))
+    extent = np.percentile(radius, 99.5) if len(coords) else 0.0
+    if extent <= 0:
+        return coords
+    far = radius > extent
+    coords[far] *= (extent / radius[far])[:, None]
+    return coords / extent
+
+def multilevel_coords(G: GraphLike, seed: int = 42,
+                      progress: Optional[Callable[[np.ndarray], None]] = None) -> np.ndarray:
+    """Multilevel force-directed layout, one (x, y) row per CSR vertex index
+
+    The graph is coarsened until it is small, the coarsest graph gets a full
+    layout, and each finer level starts from its clusters' positions and is
+    refined with grid-local repulsion. ``progress`` receives the current
+    picture (normalised, in the input graph's vertex order) after each level.
+    """
+    G = as_csr(G)
+    rng = np.random.default_rng(seed)
+    offsets, nbrs = G.offsets, np.asarray(G.neighbors_array, dtype=np.int64)
+    u, v = (np.asarray(a, dtype=np.int64) for a in G.edge_arrays())
+    keep = u != v
+    u, v = u[keep], v[keep]
+    n = G.number_of_nodes()
+    levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []  # (u, v, cluster) per finer level
+    projections = [np.arange(n)]  # input vertex -> vertex of each level
+
+    while n > COARSEST_NODES:
+        cluster = _coarsen(offsets, nbrs, rng)
+        coarse_n = int(cluster.max()) + 1
+        if coarse_n > 0.8 * n:
+            break
+        levels.append((u, v, cluster))
+        cu, cv = cluster[u], cluster[v]
+        keep = cu != cv
+        coarse = CSRGraph.from_edges(cu[keep], cv[keep], coarse_n)
+        offsets, nbrs = coarse.offsets, np.asarray(coarse.neighbors_array, dtype=np.int64)
+        u, v = (np.asarray(a, dtype=np.int64) for a in coarse.edge_arrays())
+        projections.append(cluster[projections[-1]])
+        n = coarse_n
+
+    pos = rng.random((n, 2)) * max(np.sqrt(n), 1.0)
+    _refine(pos, u, v, iterations=300, step=max(np.sqrt(n) / 4, 1.0), rng=rng)
+    if progress is not None and levels:
+        progress(_normalize(pos[projections[-1]]))
+
+    while levels:
+        u, v, cluster = levels.pop()
+        # Clusters of ~s vertices need ~sqrt(s) edge lengths between them once expanded
+        spread = cluster[u] != cluster[v]
+        if spread.any():
+            target = np.sqrt(len(cluster) / len(pos))
+            pos *= target / np.sqrt(((pos[cluster[u[spread]]] - pos[cluster[v[spread]]]) ** 2).sum(axis=1)).mean()
+        pos = pos[cluster] + rng.normal(scale=0.3, size=(len(cluster), 2))
+        work = len(pos) + len(u)
+        _refine(pos, u, v, iterations=int(np.clip(2e7 / work, 15, 60)), step=0.5, rng=rng)
+        if progress is not None and levels:
+            progress(_normalize(pos[projections[len(levels)]]))
+    return _normalize(pos)
+
+def multilevel_layout(G: GraphLike, seed: int = 42) -> Dict[Any, np.ndarray]:
+    """multilevel_coords as a {label: (x, y)} dict, like nx.spring_layout"""
+    csr = as_csr(G)
+    return dict(zip(csr.labels, multilevel_coords(csr, seed)))
+
+class LayoutJob:
+    """multilevel_coords on a background thread
+
+    ``build`` returns the graph to lay out and also runs on the worker, so
+    converting a big graph does not block the caller either. Poll from the
+    GUI thread: ``poll()`` hands back the newest picture not seen yet (or
+    None), and ``done``/``error`` report how the run ended; ``result`` holds
+    the final coordinates once ``done`` is set.
+    """
+
+    def __init__(self, build: Callable[[], GraphLike], seed: int = 42):
+        self.seed = seed
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.result: Optional[np.ndarray] = None
+        self._build = build
+        self._lock = threading.Lock()
+        self._latest: Optional[np.ndarray] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _publish(self, coords: np.ndarray):
+        with self._lock:
+            self._latest = coords
+
+    def _run(self):
+        try:
+            with phase('layout', background=True):
+                self.result = multilevel_coords(self._build(), self.seed, progress=self._publish)
+            self._publish(self.result)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def poll(self) -> Optional[np.ndarray]:
+        with self._lock:
+            coords, self._latest = self._latest, None
+        return coords
@@ -1,20 +1,33 @@
 # main.py
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import threading
+import logging
 import time
 from pathlib import Path
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import networkx as nx
+import matplotlib
 import os
 from datetime import datetime
 
-from algorithms.backtracking import try_min_colors
-from algorithms.cultural import find_chromatic_number
-from algorithms.graph_utils import load_edgelist, create_custom_graph
+from algorithms.graph_utils import (GRAPH_FILETYPES, as_csr, calculate_conflicts, load_edgelist,
+                                    create_custom_graph)
+from algorithms.graph_cache import load_cached_csr
+from algorithms.dataset_registry import DatasetRegistry
+from algorithms.solution_cache import default_solution_cache
+from algorithms.dynamic import apply_edge_delta, update_coloring
+from algorithms.worker import SolverProcess
+from algorithms.log_config import configure_logging
+from algorithms.profiling import configure_tracing, phase, profiled
 from graph_canvas import GraphCanvas
-from compare_window import CompareWindow
+from ui_pump import UpdatePump
+
+logger = logging.getLogger(__name__)
+
+# How often the Tk loop drains the solver process's event queue
+SOLVER_POLL_MS = 50
+# Time limit per k of the backtracking solve an edge edit falls back to
+REPAIR_SOLVE_TIME_LIMIT = 5.0
+# How long STOP waits for the solver's partial result before terminating it
+STOP_GRACE_MS = 3000
 
 class GraphColoringApp:
     def __init__(self, root):
@@ -29,10 +42,22 @@ class GraphColoringApp:
         self.last_algorithm_run = None  # لتخزين معلومات التشغيل الأخير
         self.last_algorithm_name = None
         self.performance_history = []  # لتخزين تاريخ الأداء
+        self.solver_process = None  # SolverProcess of the run in progress
+        self._on_solver_progress = None
+        self._on_solver_result = None
+        self._solver_csr = None  # (graph, CSRGraph) so repeated runs convert once
+        try:
+            self.solution_cache = default_solution_cache()
+        except Exception as e:
+            self.solution_cache = None
+            print(f"WARNING: solution cache disabled: {e}")
         
         # Set theme and colors
         self.setup_theme()
         self.create_widgets()
+        # Solver progress reaches results_text through the pump, a frame at a time
+        self.ui_pump = UpdatePump(self.root, self.results_text)
+        self.ui_pump.start()
         
     def setup_theme(self):
         style = ttk.Style()
@@ -101,9 +126,15 @@ class GraphColoringApp:
         ttk.Button(input_frame, text="Load Dataset", 
                   command=self.load_dataset).pack(fill=tk.X, pady=2)
         
+        ttk.Button(input_frame, text="Browse Datasets", 
+                  command=self.browse_datasets).pack(fill=tk.X, pady=2)
+        
         ttk.Button(input_frame, text="Create Custom Graph", 
                   command=self.create_custom_graph).pack(fill=tk.X, pady=2)
         
+        ttk.Button(input_frame, text="Edit Edges", 
+                  command=self.edit_edges).pack(fill=tk.X, pady=2)
+        
         self.graph_info = ttk.Label(input_frame, text="No graph loaded")
         self.graph_info.pack(pady=5)
         
@@ -132,6 +163,12 @@ class GraphColoringApp:
         ttk.Button(action_frame, text="RUN SOLVER", 
                   command=self.run_solver).pack(fill=tk.X, pady=2)
         
+        # زر الإيقاف (مفعل فقط أثناء التشغيل)
+        self.stop_btn = ttk.Button(action_frame, text="STOP", 
+                                  command=self.stop_solver,
+                                  state=tk.DISABLED)
+        self.stop_btn.pack(fill=tk.X, pady=2)
+        
         ttk.Button(action_frame, text="COMPARE ALGORITHMS", 
                   command=self.compare_algorithms).pack(fill=tk.X, pady=2)
         
@@ -174,6 +211,10 @@ class GraphColoringApp:
             self.max_k = ttk.Entry(self.params_frame)
             self.max_k.insert(0, "10")
             self.max_k.pack(fill=tk.X, pady=2)
+            
+            ttk.Label(self.params_frame, text="Random Seed (blank = random):").pack(anchor=tk.W)
+            self.seed = ttk.Entry(self.params_frame)
+            self.seed.pack(fill=tk.X, pady=2)
         else:
             # Backtracking parameters
             ttk.Label(self.params_frame, text="Max Colors to Try:").pack(anchor=tk.W)
@@ -213,31 +254,97 @@ class GraphColoringApp:
         file_path = filedialog.askopenfilename(
             initialdir="datasets",
             title="Select Graph File",
-            filetypes=[("Graph files", "*.col *.edgelist"), ("All files", "*.*")]
+            filetypes=GRAPH_FILETYPES
         )
         
         if file_path:
+            self._load_graph_file(file_path)
+    
+    def _load_graph_file(self, file_path):
+        try:
+            # Parsed once, then served from the binary graph cache
+            with phase('load', path=file_path):
+                csr = load_cached_csr(file_path)
+                self.current_graph = csr.to_networkx()  # for drawing and editing
+            # Solvers work on the mapped store, not on a copy of the nx graph
+            self._solver_csr = (self.current_graph, csr)
+            self.current_coloring = None
+            self.update_graph_info()
+            self.graph_canvas.draw_graph(self.current_graph, title="Loaded Graph")
+            self.results_text.delete(1.0, tk.END)
+            message = f"Loaded graph from: {file_path}\n"
+            message += f"Nodes: {self.current_graph.number_of_nodes()}, "
+            message += f"Edges: {self.current_graph.number_of_edges()}\n"
+            self.results_text.insert(tk.END, message)
+            # طباعة نفس الرسالة في الـ Terminal
+            print("=" * 60)
+            print("LOADED GRAPH INFORMATION:")
+            print(f"File: {file_path}")
+            print(f"Number of nodes: {self.current_graph.number_of_nodes()}")
+            print(f"Number of edges: {self.current_graph.number_of_edges()}")
+            print("=" * 60)
+        except Exception as e:
+            error_msg = f"Failed to load graph: {e}"
+            messagebox.showerror("Error", error_msg)
+            print(f"ERROR: {error_msg}")
+    
+    def browse_datasets(self):
+        """List the datasets directory through the DatasetRegistry, filtered by size"""
+        try:
+            registry = DatasetRegistry()
+            registry.refresh()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to index datasets: {e}")
+            print(f"ERROR indexing datasets: {e}")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Browse Datasets")
+        dialog.geometry("560x420")
+        dialog.configure(bg='#141e30')
+        
+        filter_frame = ttk.Frame(dialog)
+        filter_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(filter_frame, text="Max nodes:").pack(side=tk.LEFT)
+        max_nodes_entry = ttk.Entry(filter_frame, width=8)
+        max_nodes_entry.pack(side=tk.LEFT, padx=5)
+        known_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="Known chromatic number only",
+                        variable=known_var).pack(side=tk.LEFT, padx=5)
+        
+        columns = ("name", "n", "m", "density", "chromatic")
+        tree = ttk.Treeview(dialog, columns=columns, show="headings")
+        for column, heading, width in zip(columns, ("Dataset", "Nodes", "Edges", "Density", "Known χ"),
+                                          (200, 70, 80, 80, 70)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, anchor=tk.W if column == "name" else tk.E)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        def apply_filter(*_):
+            text = max_nodes_entry.get().strip()
             try:
-                self.current_graph = load_edgelist(file_path)
-                self.current_coloring = None
-                self.update_graph_info()
-                self.graph_canvas.draw_graph(self.current_graph, title="Loaded Graph")
-                self.results_text.delete(1.0, tk.END)
-                message = f"Loaded graph from: {file_path}\n"
-                message += f"Nodes: {self.current_graph.number_of_nodes()}, "
-                message += f"Edges: {self.current_graph.number_of_edges()}\n"
-                self.results_text.insert(tk.END, message)
-                # طباعة نفس الرسالة في الـ Terminal
-                print("=" * 60)
-                print("LOADED GRAPH INFORMATION:")
-                print(f"File: {file_path}")
-                print(f"Number of nodes: {self.current_graph.number_of_nodes()}")
-                print(f"Number of edges: {self.current_graph.number_of_edges()}")
-                print("=" * 60)
-            except Exception as e:
-                error_msg = f"Failed to load graph: {e}"
-                messagebox.showerror("Error", error_msg)
-                print(f"ERROR: {error_msg}")
+                max_nodes = int(text) if text else None
+            except ValueError:
+                messagebox.showerror("Error", f"Invalid input: max nodes must be an integer, not {text!r}")
+                return
+            tree.delete(*tree.get_children())
+            for entry in registry.select(max_nodes=max_nodes, known_chromatic=True if known_var.get() else None):
+                chromatic = entry["known_chromatic"]
+                tree.insert("", tk.END, iid=entry["path"], values=(
+                    entry["name"], entry["n"], entry["m"], f"{entry['density']:.3f}",
+                    "" if chromatic is None else chromatic))
+        
+        def load_selected(*_):
+            selection = tree.selection()
+            if selection:
+                dialog.destroy()
+                self._load_graph_file(selection[0])
+        
+        max_nodes_entry.bind("<Return>", apply_filter)
+        known_var.trace_add("write", apply_filter)
+        tree.bind("<Double-1>", load_selected)
+        ttk.Button(dialog, text="Load", command=load_selected).pack(pady=10)
+        apply_filter()
     
     def create_custom_graph(self):
         # Create a dialog for custom graph input
@@ -308,6 +415,115 @@ class GraphColoringApp:
         
         ttk.Button(dialog, text="Create Graph", command=create_graph).pack(pady=10)
     
+    def edit_edges(self):
+        """Add or remove edges of the current graph, repairing its coloring locally"""
+        if not self.current_graph:
+            messagebox.showwarning("Warning", "Please load a graph first!")
+            return
+        if self.solver_process is not None:
+            messagebox.showwarning("Warning", "Wait for the running solver to finish!")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Edit Edges")
+        dialog.geometry("400x400")
+        dialog.configure(bg='#141e30')
+        
+        ttk.Label(dialog, text="Edges to add (one per line, format: u v):").pack(pady=5)
+        added_text = scrolledtext.ScrolledText(dialog, height=6, bg='#2a3f5f', fg='white')
+        added_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        ttk.Label(dialog, text="Edges to remove (one per line, format: u v):").pack(pady=5)
+        removed_text = scrolledtext.ScrolledText(dialog, height=6, bg='#2a3f5f', fg='white')
+        removed_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        def parse_edges(text):
+            G = self.current_graph
+            edges = []
+            for line in text.get(1.0, tk.END).strip().split('\n'):
+                line = line.strip()
+                if line:
+                    u, v = map(int, line.split())
+                    if u not in G or v not in G:
+                        raise ValueError(f"Edge {u} {v} is not between vertices of the current graph")
+                    if u == v:
+                        raise ValueError(f"Self-loop {u} {v} cannot be colored")
+                    edges.append((u, v))
+            return edges
+        
+        def apply_edit():
+            try:
+                added = parse_edges(added_text)
+                removed = parse_edges(removed_text)
+                missing = [e for e in removed if not self.current_graph.has_edge(*e)]
+                if missing:
+                    raise ValueError(f"Edge {missing[0][0]} {missing[0][1]} is not in the graph")
+                self._apply_edge_edit(added, removed)
+                dialog.destroy()
+            except ValueError as ve:
+                messagebox.showerror("Error", f"Invalid input: {ve}")
+                print(f"ERROR editing edges: {ve}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to edit graph: {e}")
+                print(f"ERROR editing edges: {e}")
+        
+        ttk.Button(dialog, text="Apply", command=apply_edit).pack(pady=10)
+    
+    def _apply_edge_edit(self, added, removed):
+        """Edit the current graph in place and repair the last coloring for it"""
+        G = self.current_graph
+        self._solver_csr = None  # the cached CSR describes the graph before the edit
+        self.graph_canvas.graph_edited()
+        if not self.current_coloring:
+            apply_edge_delta(G, added, removed)
+            self.update_graph_info()
+            self.graph_canvas.draw_graph(G, title="Edited Graph")
+            return
+        
+        # The last run's report keeps the coloring it found
+        coloring = dict(self.current_coloring)
+        k = max(coloring.values()) + 1
+        result = update_coloring(G, coloring, added, removed, k=k)
+        self.update_graph_info()
+        self._show_edited_coloring(result.coloring, f"+{len(added)}/-{len(removed)} edges, "
+                                                    f"{len(result.changed)} vertices recolored")
+        if result.k > k:
+            # The color count had to grow: a bounded full solve in the worker
+            # may still find k colors; until then the local repair is shown
+            self._start_repair_solve(G, k)
+    
+    def _show_edited_coloring(self, coloring, how):
+        G = self.current_graph
+        colors_used = len(set(coloring.values()))
+        self.current_coloring = coloring
+        self.graph_canvas.draw_graph(G, coloring, f"Edited Graph (recolored, k={colors_used})",
+                                     calculate_conflicts(G, coloring))
+        message = f"Coloring repaired after edit: {how}, k={colors_used}\n"
+        self.results_text.insert(tk.END, message)
+        print(message.strip())
+    
+    def _start_repair_solve(self, G, k):
+        """Full backtracking solve after an edit the local repair could not absorb"""
+        params = {'max_colors': k, 'time_limit': REPAIR_SOLVE_TIME_LIMIT, 'use_mrv': True}
+        
+        def on_result(new_k, colors, t, from_cache, stopped=False, memory=None):
+            if self.current_graph is not G:
+                return  # another graph was loaded meanwhile
+            if new_k is not None:
+                self._show_edited_coloring(colors, f"full solve in {t:.2f} seconds")
+            else:
+                message = f"Full solve found no {k}-coloring; keeping the local repair\n"
+                self.results_text.insert(tk.END, message)
+                print(message.strip())
+        
+        self.results_text.insert(tk.END, f"Trying a full solve with at most {k} colors...\n")
+        self.progress.start()
+        try:
+            self._start_solver('backtracking', params, on_result)
+        except Exception as e:
+            self._solver_finished()
+            print(f"ERROR starting the full solve: {e}")
+    
     def update_graph_info(self):
         if self.current_graph:
             info = f"Graph: {self.current_graph.number_of_nodes()} nodes, "
@@ -321,12 +537,16 @@ class GraphColoringApp:
             messagebox.showwarning("Warning", "Please load a graph first!")
             print("WARNING: Please load a graph first!")
             return
+        if self.solver_process is not None:
+            messagebox.showwarning("Warning", "A solver is already running!")
+            return
         
         # إخفاء زر التحميل أثناء التشغيل
         self.download_btn.config(state=tk.DISABLED)
         self.performance_history = []  # مسح تاريخ الأداء السابق
         
         self.progress.start()
+        self.ui_pump.discard()
         self.results_text.delete(1.0, tk.END)
         self.results_text.insert(tk.END, "Running solver...\n")
         
@@ -340,22 +560,83 @@ class GraphColoringApp:
         # تخزين اسم الخوارزمية الحالية
         self.last_algorithm_name = self.algo_var.get()
         
-        # Run in separate thread to keep GUI responsive
-        thread = threading.Thread(target=self._run_solver_thread)
-        thread.daemon = True
-        thread.start()
-    
-    def _run_solver_thread(self):
+        # Live view of the solver's current coloring while it runs
+        self.graph_canvas.start_live(self.current_graph, f"Solving ({self.last_algorithm_name})...")
+        
+        # The solver runs in a worker process so it never holds this process's GIL
         try:
             if self.algo_var.get() == "backtracking":
                 self._run_backtracking()
             else:
                 self._run_cultural()
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
+            messagebox.showerror("Error", str(e))
             print(f"ERROR during solver execution: {e}")
-        finally:
-            self.root.after(0, lambda: self.progress.stop())
+            self._solver_finished()
+    
+    def _start_solver(self, algorithm, params, on_result, on_progress=None):
+        """Start a SolverProcess; _poll_solver feeds its events to the callbacks"""
+        if self._solver_csr is None or self._solver_csr[0] is not self.current_graph:
+            self._solver_csr = (self.current_graph, as_csr(self.current_graph))
+        self.solver_process = SolverProcess(algorithm, self._solver_csr[1], params, self.solution_cache)
+        self._on_solver_result = on_result
+        self._on_solver_progress = on_progress
+        self.stop_btn.config(state=tk.NORMAL)
+        self.root.after(SOLVER_POLL_MS, self._poll_solver)
+    
+    def stop_solver(self):
+        """Ask the running solver to stop and report the best coloring it has"""
+        process = self.solver_process
+        if process is None or process.stopping:
+            return
+        process.stop()
+        self.stop_btn.config(state=tk.DISABLED)
+        self.ui_pump.log("Stopping solver...")
+        print("Stopping solver...")
+        # A solver that is not inside its search loop yet (e.g. building the
+        # graph) cannot see the request; it is terminated after a grace period
+        self.root.after(STOP_GRACE_MS, self._force_stop, process)
+    
+    def _force_stop(self, process):
+        if self.solver_process is not process:
+            return  # the partial result already arrived
+        self._solver_finished()
+        self.ui_pump.flush()
+        self.results_text.insert(tk.END, "STOPPED: solver terminated, no partial result\n")
+        print("STOPPED: solver terminated, no partial result")
+    
+    def _poll_solver(self):
+        process = self.solver_process
+        if process is None:
+            return
+        for event in process.poll():
+            kind = event[0]
+            if kind == 'progress' and self._on_solver_progress:
+                self._on_solver_progress(*event[1:])
+            elif kind == 'snapshot':
+                self.graph_canvas.offer_snapshot(process.labels, event[1])
+            elif kind == 'result':
+                on_result = self._on_solver_result
+                self._solver_finished()
+                self.ui_pump.flush()  # progress lines before the results
+                on_result(*event[1:])
+            elif kind == 'error':
+                self._solver_finished()
+                self.ui_pump.flush()
+                messagebox.showerror("Error", event[1])
+                print(f"ERROR during solver execution: {event[1]}")
+        if self.solver_process is process:
+            self.root.after(SOLVER_POLL_MS, self._poll_solver)
+    
+    def _solver_finished(self):
+        if self.solver_process is not None:
+            self.solver_process.cancel()
+        self.solver_process = None
+        self._on_solver_result = None
+        self._on_solver_progress = None
+        self.stop_btn.config(state=tk.DISABLED)
+        self.progress.stop()
+        self.graph_canvas.stop_live()
     
     def _run_backtracking(self):
         max_try = int(self.max_colors.get())
@@ -369,35 +650,43 @@ class GraphColoringApp:
         print(f"  Use MRV heuristic: {use_mrv}")
         print("-" * 40)
         
-        k, colors, t = try_min_colors(
-            self.current_graph, 
-            max_try=max_try, 
-            use_mrv=use_mrv, 
-            time_limit=time_limit
-        )
+        params = {'max_colors': max_try, 'time_limit': time_limit, 'use_mrv': use_mrv}
+        self._start_solver('backtracking', params,
+                           lambda *result: self._finish_backtracking(params, *result))
+    
+    def _finish_backtracking(self, params, k, colors, t, from_cache, stopped=False, memory=None):
+        if from_cache:
+            print("Result loaded from the solution cache")
+        self._print_memory(memory)
         
         # تخزين نتائج التشغيل الأخير للتقرير
         self.last_algorithm_run = {
             'algorithm': 'Backtracking Search',
             'parameters': {
-                'max_colors': max_try,
-                'time_limit': time_limit,
-                'use_mrv': use_mrv
+                'max_colors': params['max_colors'],
+                'time_limit': params['time_limit'],
+                'use_mrv': params['use_mrv']
             },
             'result': {
                 'k': k,
                 'colors': colors,
                 'time': t,
-                'success': k is not None
+                'success': k is not None,
+                'from_cache': from_cache,
+                'stopped': stopped
             },
             'graph_info': {
                 'nodes': self.current_graph.number_of_nodes(),
                 'edges': self.current_graph.number_of_edges()
             },
-            'performance_history': []  # Backtracking لا يحتوي على تاريخ أداء
+            'performance_history': [],  # Backtracking لا يحتوي على تاريخ أداء
+            'memory': memory  # peak RSS / Python heap of the solver process, per phase
         }
         
-        self.root.after(0, lambda: self._display_backtracking_results(k, colors, t))
+        if stopped:
+            self._display_stopped_results('backtracking', colors, t)
+        else:
+            self._display_backtracking_results(k, colors, t)
     
     def _display_backtracking_results(self, k, colors, t):
         self.results_text.delete(1.0, tk.END)
@@ -465,6 +754,8 @@ class GraphColoringApp:
         max_gen = int(self.max_gen.get())
         mutation_rate = float(self.mutation_rate.get())
         max_k = int(self.max_k.get())
+        seed_text = self.seed.get().strip()
+        seed = int(seed_text) if seed_text else None
         
         # طباعة المعلمات في الـ Terminal
         print("CULTURAL ALGORITHM PARAMETERS:")
@@ -472,82 +763,146 @@ class GraphColoringApp:
         print(f"  Max generations: {max_gen}")
         print(f"  Mutation rate: {mutation_rate}")
         print(f"  Max colors to try: {max_k}")
+        print(f"  Random seed: {seed if seed is not None else 'random'}")
         print("-" * 40)
         
         # إعادة تهيئة تاريخ الأداء
         self.performance_history = []
         
-        def progress_callback(gen, conflicts, colors_used):
-            # حساب الـ Fitness (سالب عدد النزاعات لأننا نريد تقليل النزاعات)
-            fitness = -conflicts
-            
-            # تخزين بيانات الأداء
-            self.performance_history.append({
-                'generation': gen,
-                'conflicts': conflicts,
-                'colors_used': colors_used,
-                'fitness': fitness
-            })
-            
-            # تحديث الـ GUI
-            self.root.after(0, lambda: self.results_text.insert(
-                tk.END, f"Generation {gen}: Conflicts={conflicts}, Colors={colors_used}, Fitness={fitness}\n"
-            ))
-            self.results_text.see(tk.END)
-            
-            # طباعة في الـ Terminal
-            print(f"Generation {gen}: Conflicts={conflicts}, Colors={colors_used}, Fitness={fitness}")
-        
         # Use find_chromatic_number like the old version
-        k, coloring_dict, total_time = find_chromatic_number(
-            self.current_graph,
-            pop_size=pop_size,
-            max_gen=max_gen,
-            mutation_rate=mutation_rate,
-            max_k=max_k,
-            progress_callback=progress_callback
-        )
+        params = {'population_size': pop_size, 'max_generations': max_gen,
+                  'mutation_rate': mutation_rate, 'max_k': max_k, 'seed': seed}
+        self._start_solver('cultural', params,
+                           lambda *result: self._finish_cultural(params, *result),
+                           on_progress=self._on_cultural_progress)
+    
+    def _on_cultural_progress(self, gen, conflicts, colors_used):
+        # حساب الـ Fitness (سالب عدد النزاعات لأننا نريد تقليل النزاعات)
+        fitness = -conflicts
+        
+        # تخزين بيانات الأداء
+        self.performance_history.append({
+            'generation': gen,
+            'conflicts': conflicts,
+            'colors_used': colors_used,
+            'fitness': fitness
+        })
+        
+        # تحديث الـ GUI
+        line = f"Generation {gen}: Conflicts={conflicts}, Colors={colors_used}, Fitness={fitness}"
+        self.ui_pump.log(line)
+        
+        # طباعة في الـ Terminal
+        logger.debug(line)
+    
+    def _finish_cultural(self, params, k, coloring_dict, total_time, from_cache, stopped=False,
+                         memory=None):
+        if from_cache:
+            print("Result loaded from the solution cache")
+        self._print_memory(memory)
         
         success = (k is not None)
-        coloring_list = [coloring_dict[i] for i in range(len(coloring_dict))] if success else []
+        # coloring_dict is keyed by the graph's own vertex labels
+        coloring_list = [coloring_dict[node] for node in self.current_graph.nodes()] if success else []
         
         # تخزين نتائج التشغيل الأخير للتقرير
         self.last_algorithm_run = {
             'algorithm': 'Cultural Algorithm',
             'parameters': {
-                'population_size': pop_size,
-                'max_generations': max_gen,
-                'mutation_rate': mutation_rate,
-                'max_k': max_k
+                'population_size': params['population_size'],
+                'max_generations': params['max_generations'],
+                'mutation_rate': params['mutation_rate'],
+                'max_k': params['max_k'],
+                'seed': params['seed']
             },
             'result': {
                 'k': k,
-                'colors': coloring_dict if success else {},  # تخزين القاموس مباشرة
+                'colors': coloring_dict if success or stopped else {},  # تخزين القاموس مباشرة
                 'coloring': coloring_list,  # الاحتفاظ بالقائمة للتوافق
                 'time': total_time,
-                'success': success
+                'success': success,
+                'from_cache': from_cache,
+                'stopped': stopped
             },
             'graph_info': {
                 'nodes': self.current_graph.number_of_nodes(),
                 'edges': self.current_graph.number_of_edges()
             },
-            'performance_history': self.performance_history  # إضافة تاريخ الأداء الكامل
+            'performance_history': self.performance_history,  # إضافة تاريخ الأداء الكامل
+            'memory': memory  # peak RSS / Python heap of the solver process, per phase
         }
         
-        self.root.after(0, lambda: self._display_cultural_results(success, coloring_list, k, 0, total_time))
+        if stopped:
+            self._display_stopped_results('cultural', coloring_dict, total_time)
+        else:
+            self._display_cultural_results(success, coloring_dict, k, 0, total_time)
+    
+    @staticmethod
+    def _print_memory(memory):
+        """Terminal summary of the solver process's memory, per phase"""
+        if not memory or memory.get('peak_rss_mb') is None:
+            return
+        line = f"Solver peak memory: {memory['peak_rss_mb']:.1f} MB RSS"
+        if memory.get('python_peak_mb') is not None:
+            line += f", Python heap {memory['python_peak_mb']:.1f} MB"
+        print(line)
+        for name, totals in memory['phases'].items():
+            detail = f"  {name:<11} x{totals['count']:<5} {totals['time']:8.3f} s"
+            if totals.get('rss_growth_mb') is not None:
+                detail += f"  RSS +{totals['rss_growth_mb']:.1f} MB"
+            if totals.get('py_growth_mb') is not None:
+                detail += f"  heap +{totals['py_growth_mb']:.1f} MB (peak {totals['py_peak_mb']:.1f} MB)"
+            print(detail)
+        for site in memory['top_allocations'][:5]:
+            print(f"  {site['size_mb']:8.1f} MB in {site['blocks']} blocks at {site['where']}")
+    
+    def _display_stopped_results(self, algorithm, colors, t):
+        """Report a run ended with STOP and show its best partial coloring"""
+        G = self.current_graph
+        total = G.number_of_nodes()
+        complete = len(colors) == total
+        # Backtracking's partial colorings are conflict-free by construction
+        conflicts = calculate_conflicts(self._solver_csr[1], colors) if complete and colors else 0
+        title = "BACKTRACKING" if algorithm == 'backtracking' else "CULTURAL ALGORITHM"
+        
+        self.results_text.insert(tk.END, f"\n=== {title} STOPPED ===\n\n")
+        self.results_text.insert(tk.END, f"Best coloring so far: {len(colors)} of {total} nodes colored, "
+                                         f"{len(set(colors.values()))} colors, {conflicts} conflicts\n")
+        self.results_text.insert(tk.END, f"Computation Time: {t:.2f} seconds\n")
+        
+        if complete and colors:
+            if conflicts == 0:
+                self.current_coloring = colors  # only valid colorings are edited later
+            self.graph_canvas.draw_graph(G, colors, "Stopped: best coloring so far", conflicts)
+        # a partial assignment stays on screen as the last live frame
+        
+        self.last_results[algorithm] = {
+            'success': False,
+            'colors': None,
+            'time': t,
+            'conflicts': conflicts
+        }
+        self.download_btn.config(state=tk.NORMAL)
+        
+        # طباعة النتائج في الـ Terminal
+        print("\n" + "=" * 60)
+        print(f"{title} STOPPED:")
+        print(f"Best coloring so far: {len(colors)} of {total} nodes colored, {conflicts} conflicts")
+        print(f"Computation Time: {t:.2f} seconds")
+        print("=" * 60)
     
     def _display_cultural_results(self, success, coloring, k, conflicts, total_time):
         self.results_text.insert(tk.END, "\n=== CULTURAL ALGORITHM RESULTS ===\n\n")
         
         if success:
-            self.current_coloring = {i: coloring[i] for i in range(len(coloring))}
+            self.current_coloring = coloring
             self.results_text.insert(tk.END, f"SUCCESS: Valid coloring found!\n")
             self.results_text.insert(tk.END, f"Chromatic Number: {k}\n")
             self.results_text.insert(tk.END, f"Total Computation Time: {total_time:.2f} seconds\n")
             self.results_text.insert(tk.END, f"\nColoring Assignment:\n")
             
-            for i, color in enumerate(coloring):
-                self.results_text.insert(tk.END, f"  Node {i} → Color {color}\n")
+            for node, color in coloring.items():
+                self.results_text.insert(tk.END, f"  Node {node} → Color {color}\n")
             
             self.graph_canvas.draw_graph(self.current_graph, self.current_coloring,
                                        f"Cultural Algorithm Solution (k={k})", conflicts)
@@ -570,8 +925,8 @@ class GraphColoringApp:
             print(f"Chromatic Number: {k}")
             print(f"Total Computation Time: {total_time:.2f} seconds")
             print("\nColoring Assignment:")
-            for i, color in enumerate(coloring):
-                print(f"  Node {i} → Color {color}")
+            for node, color in coloring.items():
+                print(f"  Node {node} → Color {color}")
             print("=" * 60)
         else:
             self.results_text.insert(tk.END, f"FAILED: No valid coloring found with k ≤ {self.max_k.get()}\n")
@@ -607,6 +962,7 @@ class GraphColoringApp:
         print("=" * 60)
         
         # Pass current graph and results to compare window
+        from compare_window import CompareWindow  # loaded on first use
         CompareWindow(self.root, self.current_graph, self.last_results)
     
     def download_report(self):
@@ -627,7 +983,8 @@ class GraphColoringApp:
         
         if file_path:
             try:
-                self._create_report_image(file_path)
+                with phase('report', algorithm=self.last_algorithm_run['algorithm']):
+                    self._create_report_image(file_path)
                 messagebox.showinfo("Success", f"Report saved successfully!\n{file_path}")
                 print(f"Report saved to: {file_path}")
             except Exception as e:
@@ -636,6 +993,8 @@ class GraphColoringApp:
     
     def _create_report_image(self, file_path):
         """إنشاء صورة التقرير"""
+        import matplotlib.pyplot as plt  # only the report needs pyplot
+        
         # إنشاء شكل مع 4 رسوم بيانية
         fig = plt.figure(figsize=(15, 12), facecolor='#141e30')
         
@@ -907,6 +1266,9 @@ class GraphColoringApp:
                 summary_text += f"Max colors tried: {self.last_algorithm_run['parameters']['max_colors']}\n"
         
         summary_text += f"\nExecution Time: {time_taken:.2f} seconds\n"
+        memory = self.last_algorithm_run.get('memory')
+        if memory and memory.get('peak_rss_mb') is not None:
+            summary_text += f"Peak Memory: {memory['peak_rss_mb']:.1f} MB\n"
         
         # تقييم كفاءة الخوارزمية
         if time_taken < 5:
@@ -934,6 +1296,9 @@ class GraphColoringApp:
         plt.close()
     
     def clear_all(self):
+        if self.solver_process is not None:
+            self._solver_finished()
+        self.ui_pump.discard()
         self.current_graph = None
         self.current_coloring = None
         self.last_results = {}
@@ -952,7 +1317,9 @@ class GraphColoringApp:
         print("=" * 60)
 
 if __name__ == "__main__":
-    plt.rcParams['font.size'] = 9
+    matplotlib.rcParams['font.size'] = 9
+    configure_logging()  # level from $GRAPH_COLORING_LOG_LEVEL, INFO by default
+    configure_tracing()  # phase timings to $GRAPH_COLORING_TRACE, when set
     root = tk.Tk()
     app = GraphColoringApp(root)
     
@@ -969,4 +1336,5 @@ if __name__ == "__main__":
     print("5. All messages will appear both in GUI and Terminal")
     print("=" * 60 + "\n")
     
-    root.mainloop()
\ No newline at end of file
+    with profiled('gui'):  # cProfile into $GRAPH_COLORING_PROFILE, when set
+        root.mainloop()
\ No newline at end of file
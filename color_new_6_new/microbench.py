@@ -0,0 +1,177 @@
+# microbench.py
+"""Microbenchmarks for the solvers' hot primitives
+
+    python microbench.py                          # every primitive, default sizes
+    python microbench.py fitness mrv_order --sizes 1000 4000 16000
+    python microbench.py --json now.json --baseline before.json
+
+Each primitive runs on G(n, p) graphs with a fixed average degree, so the
+edge count grows linearly with n. A call is timed with timeit (automatic
+loop count, best of --repeat) and reported in ns per call. The scaling
+exponent is the slope of log(time) over log(n): 0 means constant cost per
+call, 1 means linear in the graph size. With --baseline, calls slower than
+an earlier --json file by more than --tolerance are reported, and the exit
+status is 1.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import timeit
+from itertools import cycle
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from algorithms.backtracking import (forward_checking_update, mrv_order, restore_domains,
+                                     valid_color)
+from algorithms.cultural import fitness, smart_mutate
+from algorithms.generators import GeneratedGraph, gnp, write_dimacs
+from algorithms.graph_utils import CSRGraph, calculate_conflicts, load_edgelist
+
+DEFAULT_SIZES = (1000, 4000, 16000, 64000)
+AVERAGE_DEGREE = 10
+COLORS = 8
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25
+# Vertices cycled through by the per-vertex primitives
+SAMPLE_VERTICES = 1024
+
+def _partial_state(G: CSRGraph, rng: np.random.Generator):
+    """Half the vertices colored, the other half with partly pruned domains"""
+    colors = rng.integers(0, COLORS, size=G.n).tolist()
+    assigned = {v: colors[v] for v in range(0, G.n, 2)}
+    domains = {v: set(rng.permutation(COLORS)[:rng.integers(1, COLORS + 1)].tolist())
+               for v in range(G.n)}
+    return assigned, domains
+
+def _vertices(rng: np.random.Generator, candidates: np.ndarray):
+    """Endless cycle over a random sample of ``candidates``"""
+    return cycle(rng.choice(candidates, size=SAMPLE_VERTICES).tolist())
+
+def bench_valid_color(G, rng, workdir):
+    assigned, _ = _partial_state(G, rng)
+    vertices = _vertices(rng, np.arange(G.n))
+    return lambda: valid_color(G, next(vertices), 0, assigned)
+
+def bench_mrv_order(G, rng, workdir):
+    assigned, domains = _partial_state(G, rng)
+    return lambda: mrv_order(G, domains, assigned)
+
+def bench_forward_checking_update(G, rng, workdir):
+    assigned, domains = _partial_state(G, rng)
+    vertices = _vertices(rng, np.arange(1, G.n, 2))  # the unassigned half
+
+    def update_and_restore():
+        restore_domains(domains, forward_checking_update(domains, next(vertices), 0, G, assigned))
+    return update_and_restore
+
+def bench_fitness(G, rng, workdir):
+    coloring = rng.integers(0, COLORS, size=G.n).tolist()
+    return lambda: fitness(coloring, G)
+
+def bench_smart_mutate(G, rng, workdir):
+    individual = rng.integers(0, COLORS, size=G.n).tolist()
+    return lambda: smart_mutate(individual, COLORS, G, rng)
+
+def bench_calculate_conflicts(G, rng, workdir):
+    coloring = dict(zip(G.labels, rng.integers(0, COLORS, size=G.n).tolist()))
+    return lambda: calculate_conflicts(G, coloring)
+
+def bench_load_edgelist(G, rng, workdir):
+    path = Path(workdir) / f"bench_{G.n}.col"
+    if not path.exists():
+        write_dimacs(GeneratedGraph(G, path.stem, None), path)
+    return lambda: load_edgelist(str(path))
+
+# name -> (setup(G, rng, workdir) returning a zero-argument call, expected exponent)
+BENCHMARKS: Dict[str, tuple] = {
+    'valid_color': (bench_valid_color, 0),
+    'mrv_order': (bench_mrv_order, 1),
+    'forward_checking_update': (bench_forward_checking_update, 0),
+    'fitness': (bench_fitness, 1),
+    'smart_mutate': (bench_smart_mutate, 1),
+    'calculate_conflicts': (bench_calculate_conflicts, 1),
+    'load_edgelist': (bench_load_edgelist, 1),
+}
+
+def time_call(call: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> float:
+    """Best-of-``repeat`` seconds per call"""
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def scaling_exponent(sizes: List[int], seconds: List[float]) -> float:
+    """Slope of log(seconds) against log(size)"""
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+
+def run(names: List[str], sizes: List[int], repeat: int = DEFAULT_REPEAT,
+        seed: int = 0) -> Dict[str, dict]:
+    """{primitive: {'ns_per_call': {size: ns}, 'exponent': slope}}"""
+    graphs = {n: gnp(n, AVERAGE_DEGREE / (n - 1), seed=seed).graph for n in sizes}
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            setup, expected = BENCHMARKS[name]
+            seconds = []
+            for n in sizes:
+                rng = np.random.default_rng(seed)
+                seconds.append(time_call(setup(graphs[n], rng, workdir), repeat))
+            results[name] = {
+                'ns_per_call': {str(n): s * 1e9 for n, s in zip(sizes, seconds)},
+                'exponent': scaling_exponent(sizes, seconds) if len(sizes) > 1 else None,
+                'expected_exponent': expected,
+            }
+            _print_row(name, results[name])
+    return results
+
+def _print_row(name: str, result: dict):
+    cells = " ".join(f"{ns:>12,.0f}" for ns in result['ns_per_call'].values())
+    exponent = result['exponent']
+    print(f"{name:<24} {cells}   {exponent:5.2f} (expected {result['expected_exponent']})"
+          if exponent is not None else f"{name:<24} {cells}", flush=True)
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Calls slower than the baseline by more than ``tolerance``"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get('ns_per_call', {})
+        for size, ns in result['ns_per_call'].items():
+            if size in before and ns > before[size] * (1 + tolerance):
+                regressions.append(f"{name} n={size}: {before[size]:,.0f} -> {ns:,.0f} ns/call "
+                                   f"({ns / before[size]:.2f}x)")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the solvers' hot primitives.")
+    parser.add_argument("names", nargs="*", metavar="primitive",
+                        help=f"any of {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="vertex counts of the synthetic graphs")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timing repetitions (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="earlier --json file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction of the baseline")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown primitive: {', '.join(unknown)}")
+
+    print(f"{'ns per call, n =':<24} " + " ".join(f"{n:>12,}" for n in args.sizes) + "   exponent")
+    results = run(args.names or list(BENCHMARKS), args.sizes, args.repeat, args.seed)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'sizes': args.sizes, 'average_degree': AVERAGE_DEGREE,
+                       'results': results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
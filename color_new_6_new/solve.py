@@ -0,0 +1,107 @@
+# solve.py
+"""Headless solver: color one graph file and print the result as JSON
+
+    python solve.py datasets/myciel5.col --algorithm cultural --seed 1
+    python -m solve - < graph.col
+
+Parameters and their defaults are the GUI's. Only the modules of the
+chosen algorithm are imported (no tkinter, no matplotlib), so the command
+starts fast and runs on machines without a display. Ctrl-C stops the
+search and prints the best partial coloring with "stopped": true.
+The exit status is 0 when a valid coloring was found, 1 otherwise.
+
+--trace appends one JSON line per timed phase (load, preprocess, search
+per k, mutation/evaluation per generation) to a file; --profile writes
+cProfile stats to a directory. Both default to their environment variables.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+from typing import List, Optional
+from algorithms.log_config import LOG_LEVEL_ENV, configure_logging
+from algorithms.profiling import configure_tracing, phase, profiled
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="solve", description="Color a graph file without the GUI.")
+    parser.add_argument("graph", help="graph file (DIMACS .col or edge list, may be compressed); - for stdin")
+    parser.add_argument("-a", "--algorithm", choices=["backtracking", "cultural"], default="backtracking")
+    parser.add_argument("--coloring", action="store_true", help="include the vertex coloring in the output")
+    parser.add_argument("--indent", type=int, default=None, help="pretty-print the JSON")
+    parser.add_argument("--log-level", default=None,
+                        help="solver log level on stderr (default: $GRAPH_COLORING_LOG_LEVEL, else silent)")
+    parser.add_argument("--trace", default=None,
+                        help="append phase timings as JSON lines to this file (default: $GRAPH_COLORING_TRACE)")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="write cProfile stats to DIR (default: $GRAPH_COLORING_PROFILE)")
+
+    bt = parser.add_argument_group("backtracking")
+    bt.add_argument("--max-colors", type=int, default=10)
+    bt.add_argument("--time-limit", type=float, default=30.0, help="seconds per k; 0 = no limit")
+    bt.add_argument("--no-mrv", dest="use_mrv", action="store_false", help="disable the MRV heuristic")
+
+    ca = parser.add_argument_group("cultural algorithm")
+    ca.add_argument("--population-size", type=int, default=50)
+    ca.add_argument("--max-generations", type=int, default=10)
+    ca.add_argument("--mutation-rate", type=float, default=0.1)
+    ca.add_argument("--max-k", type=int, default=10)
+    ca.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+def solve(args: argparse.Namespace, cancel_token=None) -> dict:
+    """Load the graph, run the algorithm and describe the result as a dict"""
+    from algorithms.graph_utils import load_csr
+
+    with phase('load', path=args.graph):
+        G = load_csr(args.graph)
+    if args.algorithm == "backtracking":
+        from algorithms.backtracking import try_min_colors
+        params = {'max_colors': args.max_colors, 'time_limit': args.time_limit or None,
+                  'use_mrv': args.use_mrv}
+        k, coloring, elapsed = try_min_colors(G, max_try=params['max_colors'],
+                                              use_mrv=params['use_mrv'],
+                                              time_limit=params['time_limit'],
+                                              cancel_token=cancel_token)
+    else:
+        from algorithms.cultural import find_chromatic_number
+        params = {'population_size': args.population_size, 'max_generations': args.max_generations,
+                  'mutation_rate': args.mutation_rate, 'max_k': args.max_k, 'seed': args.seed}
+        k, coloring, elapsed = find_chromatic_number(G, pop_size=params['population_size'],
+                                                     max_gen=params['max_generations'],
+                                                     mutation_rate=params['mutation_rate'],
+                                                     max_k=params['max_k'], seed=params['seed'],
+                                                     cancel_token=cancel_token)
+
+    result = {
+        'graph': args.graph,
+        'nodes': G.number_of_nodes(),
+        'edges': G.number_of_edges(),
+        'algorithm': args.algorithm,
+        'parameters': params,
+        'k': k,
+        'success': k is not None,
+        'stopped': k is None and cancel_token is not None and cancel_token.is_set(),
+        'time': elapsed,
+    }
+    if args.coloring:
+        result['coloring'] = coloring
+    return result
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.log_level is not None or LOG_LEVEL_ENV in os.environ:
+        configure_logging(args.log_level, stream=sys.stderr)  # stdout carries the JSON
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    configure_tracing(args.trace)
+    with profiled('solve', args.profile):
+        result = solve(args, cancel_token=stop)
+    json.dump(result, sys.stdout, indent=args.indent)
+    sys.stdout.write("\n")
+    return 0 if result['success'] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app is run from its own directory, so its packages are top-level imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,114 @@
+# SolutionCache (hits, bounds, eviction) and the GraphCache stat index
+import json
+import random
+import networkx as nx
+from algorithms.graph_cache import GraphCache
+from algorithms.solution_cache import SolutionCache, cached_solve
+
+def proper(G):
+    coloring = nx.greedy_color(G)
+    return max(coloring.values()) + 1, coloring
+
+def counting_run(G, calls):
+    def run():
+        calls.append(1)
+        k, coloring = proper(G)
+        return k, coloring, 0.5
+    return run
+
+def test_exact_hit_skips_the_run(tmp_path):
+    cache = SolutionCache(tmp_path / "s.sqlite")
+    G = nx.petersen_graph()
+    calls = []
+    first = cached_solve(cache, G, 'backtracking', {'max_colors': 5, 'time_limit': 10}, counting_run(G, calls))
+    second = cached_solve(cache, G, 'backtracking', {'max_colors': 5, 'time_limit': 10}, counting_run(G, calls))
+    assert len(calls) == 1
+    assert not first[3] and second[3]
+    assert second[:3] == first[:3]
+    cached_solve(cache, G, 'backtracking', {'max_colors': 6, 'time_limit': 10}, counting_run(G, calls))
+    assert len(calls) == 2  # other params are another key (k is not proven)
+
+def test_failed_and_unseeded_runs_are_not_stored(tmp_path):
+    cache = SolutionCache(tmp_path / "s.sqlite")
+    G = nx.cycle_graph(5)
+    calls = []
+    cached_solve(cache, G, 'backtracking', {}, lambda: (calls.append(1), (None, {}, 1.0))[1])
+    cached_solve(cache, G, 'backtracking', {}, lambda: (calls.append(1), (None, {}, 1.0))[1])
+    assert len(calls) == 2
+    for _ in range(2):
+        assert not cached_solve(cache, G, 'cultural', {}, counting_run(G, calls))[3]
+    assert len(calls) == 4
+    cached_solve(cache, G, 'cultural', {'seed': 1}, counting_run(G, calls))
+    assert cached_solve(cache, G, 'cultural', {'seed': 1}, counting_run(G, calls))[3]
+
+def test_proven_optimum_is_shared_across_algorithms(tmp_path):
+    cache = SolutionCache(tmp_path / "s.sqlite")
+    G = nx.complete_graph(4)
+    cache.store(G, 'backtracking', {}, 4, {v: v for v in G}, 0.1, lower_bound=4)
+    assert cache.bounds(cache.fingerprints(G)[0]) == (4, 4, True)
+    hit = cache.lookup(G, 'cultural', {'seed': 3})
+    assert hit is not None and hit.k == 4 and hit.proven_optimal
+
+def test_bounds_are_not_shared_by_wl_collisions(tmp_path):
+    # C6 and two triangles are both 2-regular on six vertices: same WL hash
+    cache = SolutionCache(tmp_path / "s.sqlite")
+    c6 = nx.cycle_graph(6)
+    triangles = nx.disjoint_union(nx.complete_graph(3), nx.complete_graph(3))
+    assert cache.fingerprints(c6)[1] == cache.fingerprints(triangles)[1]
+    cache.store(c6, 'backtracking', {}, 2, {v: v % 2 for v in c6}, 0.1, lower_bound=2)
+    assert cache.bounds(cache.fingerprints(triangles)[0]) == (0, None, False)
+    assert cache.lookup(triangles, 'backtracking', {}) is None
+
+def test_relabelled_graph_reuses_the_coloring(tmp_path):
+    cache = SolutionCache(tmp_path / "s.sqlite")
+    G = nx.gnp_random_graph(40, 0.2, seed=1)
+    k, coloring = proper(G)
+    cache.store(G, 'backtracking', {}, k, coloring, 0.1)
+    perm = list(G)
+    random.Random(3).shuffle(perm)
+    H = nx.relabel_nodes(G, dict(zip(G, perm)))
+    hit = cache.lookup(H, 'backtracking', {})
+    assert hit is not None and hit.k == k
+    assert all(hit.coloring[u] != hit.coloring[v] for u, v in H.edges())
+
+def test_rows_beyond_max_rows_are_evicted_lru(tmp_path):
+    cache = SolutionCache(tmp_path / "s.sqlite", max_rows=2)
+    graphs = [nx.path_graph(n) for n in (3, 4, 5)]
+    for G in graphs[:2]:
+        cache.store(G, 'backtracking', {}, *proper(G), 0.1)
+    assert cache.lookup(graphs[0], 'backtracking', {}) is not None  # now most recent
+    cache.store(graphs[2], 'backtracking', {}, *proper(graphs[2]), 0.1)
+    assert cache.lookup(graphs[1], 'backtracking', {}) is None
+    assert cache.lookup(graphs[0], 'backtracking', {}) is not None
+    assert cache.lookup(graphs[2], 'backtracking', {}) is not None
+
+def write_graph(path, edges):
+    path.write_text("".join(f"{u} {v}\n" for u, v in edges), encoding='utf-8')
+
+def test_graph_cache_reuses_and_prunes_the_stat_index(tmp_path):
+    a, b = tmp_path / "a.edgelist", tmp_path / "b.edgelist"
+    write_graph(a, [(0, 1), (1, 2)])
+    write_graph(b, [(0, 1), (1, 2), (2, 3), (3, 0)])
+    cache = GraphCache(tmp_path / "cache", max_bytes=1 << 30)
+    assert cache.load(a).number_of_edges() == 2
+    assert cache.load(a).number_of_edges() == 2
+    assert len(cache.entries()) == 1
+    cache.load(b)
+    index = json.loads((tmp_path / "cache" / "index.json").read_text(encoding='utf-8'))
+    assert set(index) == {str(a.resolve()), str(b.resolve())}
+
+    cache.max_bytes = 1  # keeps only the newest entry
+    cache.evict()
+    assert [d.name for d in cache.entries()] == [cache.entry_dir(cache.key_for(b)).name]
+    index = json.loads((tmp_path / "cache" / "index.json").read_text(encoding='utf-8'))
+    assert set(index) == {str(b.resolve())}
+
+def test_graph_cache_sees_edited_files(tmp_path):
+    path = tmp_path / "g.edgelist"
+    write_graph(path, [(0, 1)])
+    cache = GraphCache(tmp_path / "cache")
+    key = cache.key_for(path)
+    assert cache.load(path).number_of_edges() == 1
+    write_graph(path, [(0, 1), (1, 2), (2, 0)])
+    assert cache.key_for(path) != key
+    assert cache.load(path).number_of_edges() == 3
@@ -0,0 +1,53 @@
+# batch_conflicts against the per-graph count_conflicts
+import numpy as np
+import pytest
+from algorithms import graph_utils
+from algorithms.graph_store import build_csr, open_csr
+from algorithms.graph_utils import CSRGraph, batch_conflicts
+
+def random_graph(n, m, seed):
+    rng = np.random.default_rng(seed)
+    u = rng.integers(0, n, m)
+    v = rng.integers(0, n, m)
+    keep = u != v
+    return CSRGraph.from_edges(u[keep], v[keep], n)
+
+def per_vertex_reference(G, coloring):
+    counts = np.zeros(G.n, dtype=np.int64)
+    for a, b in zip(*G.edge_arrays()):
+        if coloring[a] == coloring[b]:
+            counts[a] += 1
+            counts[b] += 1
+    return counts
+
+@pytest.mark.parametrize("block", [1, 7, 64, 1 << 20])
+def test_batch_matches_count_conflicts(block, monkeypatch):
+    monkeypatch.setattr(graph_utils, "_CONFLICT_BLOCK", block)
+    G = random_graph(50, 400, seed=1)
+    colorings = np.random.default_rng(2).integers(0, 4, (6, G.n))
+    u, v = G.edge_arrays()
+    totals, per_vertex = batch_conflicts(colorings, u, v, per_vertex=True)
+    assert totals.tolist() == [G.count_conflicts(c) for c in colorings]
+    for c, counts in zip(colorings, per_vertex):
+        assert counts.tolist() == per_vertex_reference(G, c).tolist()
+    assert batch_conflicts(colorings, u, v).tolist() == totals.tolist()
+
+def test_single_coloring_and_no_edges():
+    G = random_graph(10, 30, seed=3)
+    coloring = np.zeros(G.n, dtype=np.int64)
+    u, v = G.edge_arrays()
+    assert batch_conflicts(coloring, u, v).tolist() == [G.number_of_edges()]
+    empty = np.empty(0, dtype=np.int64)
+    totals, counts = batch_conflicts(coloring, empty, empty, per_vertex=True)
+    assert totals.tolist() == [0] and not counts.any()
+
+def test_memory_mapped_edges(tmp_path, monkeypatch):
+    monkeypatch.setattr(graph_utils, "_CONFLICT_BLOCK", 32)
+    path = tmp_path / "g.edgelist"
+    G = random_graph(40, 300, seed=4)
+    path.write_text("".join(f"{a} {b}\n" for a, b in zip(*G.edge_arrays())), encoding='utf-8')
+    build_csr(path, tmp_path / "store")
+    mapped = open_csr(tmp_path / "store")
+    colorings = np.random.default_rng(5).integers(0, 3, (4, mapped.n))
+    u, v = mapped.edge_arrays()
+    assert batch_conflicts(colorings, u, v).tolist() == [mapped.count_conflicts(c) for c in colorings]
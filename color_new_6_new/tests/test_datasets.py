@@ -0,0 +1,69 @@
+# Generators, dataset header facts and the benchmark's baseline comparison
+import networkx as nx
+import pytest
+from algorithms.dataset_registry import DatasetRegistry, header_facts
+from algorithms.graph_cache import GraphCache
+from algorithms.generators import mycielski, queen
+from algorithms.graph_utils import DATASETS_DIR, load_csr
+from benchmark import compare
+
+def test_mycielski_matches_the_bundled_dataset():
+    generated = mycielski(3)
+    assert generated.name == "myciel3" and generated.chromatic_number == 4
+    expected = load_csr(DATASETS_DIR / "myciel3.col").to_networkx()
+    assert nx.is_isomorphic(generated.graph.to_networkx(), expected)
+
+def test_queen_graph_size():
+    generated = queen(5)
+    assert generated.graph.n == 25
+    assert generated.graph.number_of_edges() == 160  # 50 per row and column set, 30 per diagonal set
+    assert generated.chromatic_number == 5
+    assert queen(6).chromatic_number is None
+
+HEADERS = {
+    "stated": ("c Triangle-free with chromatic number 5\nc clique number = 2\np edge 2 1\ne 1 2\n",
+               {"known_chromatic": 5, "known_clique": 2}),
+    "hash_comments": ("# Chromatic Number: 3\n0 1\n", {"known_chromatic": 3, "known_clique": None}),
+    "after_edges": ("p edge 2 1\nc chromatic number 9\ne 1 2\n", {"known_chromatic": None, "known_clique": None}),
+}
+
+@pytest.mark.parametrize("name", sorted(HEADERS))
+def test_header_facts(name, tmp_path):
+    text, expected = HEADERS[name]
+    path = tmp_path / f"{name}.col"
+    path.write_text(text, encoding='utf-8')
+    assert header_facts(path) == expected
+
+def test_registry_select(tmp_path):
+    (tmp_path / "small.col").write_text("c chromatic number 2\np edge 2 1\ne 1 2\n", encoding='utf-8')
+    (tmp_path / "big.col").write_text("p edge 4 3\ne 1 2\ne 2 3\ne 3 4\n", encoding='utf-8')
+    registry = DatasetRegistry(tmp_path, index_path=tmp_path / "index" / "registry.json",
+                               cache=GraphCache(tmp_path / "cache"))
+    assert sorted(registry.refresh()) == ["big.col", "small.col"]
+    assert registry.refresh() == []  # unchanged files are not re-read
+    assert [e["name"] for e in registry.select(max_nodes=3)] == ["small.col"]
+    assert [e["name"] for e in registry.select(known_chromatic=False)] == ["big.col"]
+    assert registry.get("big.col")["m"] == 3
+
+def summary_row(time_median=1.0, k_median=4, timeouts=0, rss=100.0):
+    return {'time_median': time_median, 'k_median': k_median, 'timeouts': timeouts,
+            'peak_rss_mb_max': rss}
+
+def test_compare_flags_regressions(capsys):
+    baseline = {'g/backtracking': summary_row(), 'g/cultural': summary_row(), 'gone/cultural': summary_row()}
+    current = {
+        'g/backtracking': summary_row(time_median=1.5, timeouts=1),
+        'g/cultural': summary_row(k_median=5, rss=300.0),
+    }
+    regressions = compare(current, baseline, tolerance=0.2, min_seconds=0.1, min_mb=50)
+    assert sorted(regressions) == [
+        "g/backtracking: 1.50x slower",
+        "g/backtracking: timeouts 0 -> 1",
+        "g/cultural: k 4 -> 5",
+        "g/cultural: peak RSS 100 -> 300 MB",
+    ]
+
+def test_compare_ignores_noise():
+    baseline = {'g/backtracking': summary_row(time_median=0.010)}
+    current = {'g/backtracking': summary_row(time_median=0.020, rss=110.0)}
+    assert compare(current, baseline, tolerance=0.2, min_seconds=0.05, min_mb=50) == []
@@ -0,0 +1,97 @@
+# Local repair of a coloring after edge edits (dynamic.py)
+import networkx as nx
+from algorithms.dynamic import _try_kempe, edge_delta, repair_coloring, update_coloring
+from algorithms.graph_utils import calculate_conflicts
+
+def assert_proper(G, coloring, k):
+    assert set(coloring) == set(G.nodes())
+    assert calculate_conflicts(G, coloring) == 0
+    assert max(coloring.values()) < k
+
+def test_kempe_swap_frees_a_color():
+    # x=4 sees 0 (color 0) and 2 (color 1); swapping the separate chain 0-1
+    # moves 0 to color 1, so x can take color 0 without a third color
+    G = nx.Graph([(0, 1), (2, 3), (4, 0), (4, 2)])
+    coloring = {0: 0, 1: 1, 2: 1, 3: 0}
+    swapped = _try_kempe(G, coloring, 4, 2, limit=64)
+    assert swapped is not None and 4 in swapped
+    assert_proper(G, coloring, 2)
+
+def test_kempe_refuses_a_chain_through_both_blockers():
+    # Odd cycle 0-1-2-3-4: the (0, 1) chain from 0 reaches the other blocker 3
+    G = nx.path_graph(4)
+    G.add_edges_from([(4, 0), (4, 3)])
+    coloring = {0: 0, 1: 1, 2: 0, 3: 1}
+    assert _try_kempe(G, coloring, 4, 2, limit=64) is None
+    assert coloring == {0: 0, 1: 1, 2: 0, 3: 1}
+
+def test_kempe_respects_the_chain_limit():
+    # Both blockers of x=5 sit on chains of three or more vertices
+    G = nx.Graph([(0, 1), (1, 2), (2, 3), (10, 11), (11, 12), (5, 0), (5, 10)])
+    coloring = {0: 0, 1: 1, 2: 0, 3: 1, 10: 1, 11: 0, 12: 1}
+    assert _try_kempe(G, dict(coloring), 5, 2, limit=2) is None
+    assert _try_kempe(G, coloring, 5, 2, limit=64) is not None
+    assert_proper(G, coloring, 2)
+
+def test_update_keeps_k_and_touches_only_the_delta():
+    G = nx.cycle_graph(8)
+    coloring = {v: v % 2 for v in G}
+    result = update_coloring(G, coloring, added=[(0, 2)], removed=[(4, 5)], k=3)
+    assert G.has_edge(0, 2) and not G.has_edge(4, 5)
+    assert result.coloring is coloring and not result.full_solve
+    assert result.k == 3
+    assert result.changed <= {0, 2}
+    assert_proper(G, coloring, 3)
+
+def test_growth_without_full_solve_adds_colors():
+    G = nx.complete_graph(3)
+    coloring = {0: 0, 1: 1, 2: 0}
+    G.remove_edge(0, 2)
+    result = update_coloring(G, coloring, added=[(0, 2)], k=2)
+    assert result.k == 3 and not result.full_solve
+    assert_proper(G, coloring, 3)
+
+def test_growth_calls_full_solve():
+    G = nx.complete_graph(4)
+    G.remove_edge(0, 1)
+    coloring = {0: 0, 1: 0, 2: 1, 3: 2}
+    calls = []
+
+    def full_solve(H):
+        calls.append(H)
+        return 4, {v: v for v in H}, 0.0
+
+    result = update_coloring(G, coloring, added=[(0, 1)], k=3, full_solve=full_solve)
+    assert calls == [G]
+    assert result.full_solve and result.k == 4
+    assert result.changed == set(G.nodes())
+    assert_proper(G, coloring, 4)
+
+def test_failed_full_solve_falls_back_to_local_growth():
+    G = nx.complete_graph(4)
+    G.remove_edge(0, 1)
+    coloring = {0: 0, 1: 0, 2: 1, 3: 2}
+    result = update_coloring(G, coloring, added=[(0, 1)], k=3, full_solve=lambda H: (None, {}, 0.0))
+    assert not result.full_solve and result.k == 4
+    assert_proper(G, coloring, 4)
+
+def test_repair_colors_new_vertices():
+    G = nx.petersen_graph()
+    coloring = nx.greedy_color(G)
+    k = max(coloring.values()) + 1
+    G.add_edges_from([(10, 0), (10, 5)])
+    result = repair_coloring(G, coloring, added=[(10, 0), (10, 5)], k=k)
+    assert 10 in result.changed
+    assert_proper(G, coloring, result.k)
+
+def test_random_edits_stay_proper():
+    G = nx.gnp_random_graph(60, 0.1, seed=7)
+    coloring = nx.greedy_color(G)
+    for step in range(20):
+        H = G.copy()
+        H.add_edges_from((u, u + step + 1) for u in range(0, 60 - step - 1, 9))
+        added, removed = edge_delta(G, H)
+        k = max(coloring.values()) + 1
+        result = update_coloring(G, coloring, added, removed, k=k, seed=step)
+        assert {frozenset(e) for e in G.edges()} == {frozenset(e) for e in H.edges()}
+        assert_proper(G, coloring, result.k)
@@ -0,0 +1,69 @@
+# Parity of the vectorised loader with the original line-by-line load_edgelist
+import networkx as nx
+import pytest
+from algorithms.graph_store import build_csr, open_csr
+from algorithms.graph_utils import DATASETS_DIR, load_csr, load_edgelist
+
+def reference_load(path) -> nx.Graph:
+    """The original per-line loader, kept as the behavioural reference"""
+    G = nx.Graph()
+    edges = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('c') or line.startswith('#'):
+                continue
+            parts = line.split()
+            if parts[0] == 'p' and len(parts) >= 3:
+                G.add_nodes_from(range(int(parts[2])))
+                continue
+            elif parts[0] == 'e' and len(parts) >= 3:
+                u, v = int(parts[1]), int(parts[2])
+                u = u - 1 if u > 0 else u
+                v = v - 1 if v > 0 else v
+                edges.append((u, v))
+            elif len(parts) >= 2:
+                try:
+                    u, v = int(parts[0]), int(parts[1])
+                    edges.append((u, v))
+                except ValueError:
+                    continue
+    G.add_edges_from(edges)
+    return G
+
+def as_sets(G):
+    return set(G.nodes()), {frozenset(e) for e in G.edges()}
+
+def assert_same_graph(path, tmp_path):
+    expected = as_sets(reference_load(path))
+    assert as_sets(load_edgelist(path)) == expected
+    assert as_sets(load_csr(path).to_networkx()) == expected
+    build_csr(path, tmp_path / "store")
+    assert as_sets(open_csr(tmp_path / "store").to_networkx()) == expected
+
+@pytest.mark.parametrize("name", sorted(p.name for p in DATASETS_DIR.glob("*.col")))
+def test_bundled_datasets(name, tmp_path):
+    assert_same_graph(DATASETS_DIR / name, tmp_path)
+
+EDGE_CASES = {
+    "negative_ids": "-1 2\n3 -4\n0 5\n",
+    "non_integer_fields": "1.5 2.5\n1 2\nx 3\n3 y\n+4 5\n- 6\n",
+    "dimacs_mixed": "c comment\np edge 6 3\ne 1 2\ne 0 3\n\n   e 5 6  \n# hash comment\n4 5\n",
+    "comment_words_and_extra_fields": "cat 1 2\n1 2 3\n\t7\t8\r\np 4\ne 2\n",
+    "self_loop_and_duplicates": "1 1\n1 2\n2 1\n",
+    "no_trailing_newline": "p edge 3 1\ne 1 3",
+}
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_edge_cases(name, tmp_path):
+    path = tmp_path / f"{name}.edgelist"
+    path.write_text(EDGE_CASES[name], encoding='utf-8')
+    assert_same_graph(path, tmp_path)
+
+def test_malformed_dimacs_record_raises(tmp_path):
+    path = tmp_path / "bad.col"
+    path.write_text("p edge 3 1\ne 1 x\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        reference_load(path)
+    with pytest.raises(ValueError):
+        load_edgelist(path)
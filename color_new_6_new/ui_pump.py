@@ -0,0 +1,94 @@
+# ui_pump.py
+import threading
+from collections import OrderedDict, deque
+import tkinter as tk
+
+# Frame interval of the pump (~20 GUI refreshes per second)
+FRAME_MS = 50
+# Lines kept in a log widget; older lines are dropped from the top
+MAX_LOG_LINES = 2000
+
+class UpdatePump:
+    """Thread-safe buffer of GUI updates, drained by the Tk loop at a fixed frame rate
+
+    Any thread may call log() or post(); they only append to the buffer and
+    never touch Tk. Once start()ed, a Tk timer runs a frame every
+    ``frame_ms``: it inserts all buffered log lines into the text widget in
+    one call, trims the widget to ``max_lines`` and scrolls once, then runs
+    each posted update once - a later post under the same key replaces an
+    earlier one that has not run yet.
+    """
+
+    def __init__(self, widget: tk.Misc, text: tk.Text = None, frame_ms: int = FRAME_MS,
+                 max_lines: int = MAX_LOG_LINES):
+        self.widget = widget
+        self.text = text
+        self.frame_ms = frame_ms
+        self.max_lines = max_lines
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=max_lines)
+        self._dropped = 0
+        self._updates = OrderedDict()
+        self._job = None
+
+    def log(self, line: str):
+        """Queue one line for the log widget"""
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(line)
+
+    def post(self, key, func, *args, **kwargs):
+        """Queue func(*args, **kwargs) for the next frame, replacing a pending one with this key"""
+        with self._lock:
+            self._updates.pop(key, None)
+            self._updates[key] = (func, args, kwargs)
+
+    def discard(self):
+        """Drop everything still pending"""
+        with self._lock:
+            self._lines.clear()
+            self._dropped = 0
+            self._updates.clear()
+
+    def flush(self):
+        """Apply pending updates now (Tk thread only), e.g. before writing results"""
+        with self._lock:
+            lines, self._lines = list(self._lines), deque(maxlen=self.max_lines)
+            dropped, self._dropped = self._dropped, 0
+            updates, self._updates = list(self._updates.values()), OrderedDict()
+        if (lines or dropped) and self.text is not None:
+            if dropped:
+                lines.insert(0, f"... {dropped} earlier lines skipped")
+            self.text.insert(tk.END, "\n".join(lines) + "\n")
+            self._trim()
+            self.text.see(tk.END)
+        for func, args, kwargs in updates:
+            func(*args, **kwargs)
+
+    def start(self):
+        """Begin draining at the frame rate (Tk thread)"""
+        if self._job is None:
+            self._job = self.widget.after(self.frame_ms, self._frame)
+
+    def stop(self):
+        """Stop the frame timer; pending updates are dropped"""
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except tk.TclError:
+                pass
+            self._job = None
+        self.discard()
+
+    def _trim(self):
+        lines = int(self.text.index('end-1c').split('.')[0])
+        if lines > self.max_lines:
+            self.text.delete('1.0', f"{lines - self.max_lines + 1}.0")
+
+    def _frame(self):
+        try:
+            self.flush()
+            self._job = self.widget.after(self.frame_ms, self._frame)
+        except tk.TclError:  # the window was closed
+            self._job = None